@@ -1,5 +1,6 @@
-from tools import Agent_Tools
-from elasticsearch import Elasticsearch
+from tools import Async_Agent_Tools
+from paper_cache import PaperCache
+from elasticsearch import AsyncElasticsearch
 
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.messages import FunctionToolCallEvent
@@ -9,6 +10,8 @@ from toyaikit.chat.runners import PydanticAIRunner
 import asyncio
 
 
+PAPER_CACHE_DIR = ".cache/papers"
+
 
 class NamedCallback:
 
@@ -35,8 +38,9 @@ class NamedCallback:
 
 
 def create_agents():
-    es = Elasticsearch("http://localhost:9200")
-    agent_class = Agent_Tools(es_index=es)
+    # the httpx transport needs no aiohttp, httpx is already installed
+    es = AsyncElasticsearch("http://localhost:9200", node_class="httpxasync")
+    agent_class = Async_Agent_Tools(es_index=es, paper_cache=PaperCache(PAPER_CACHE_DIR))
 
 
     # Summarizing agent
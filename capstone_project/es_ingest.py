@@ -0,0 +1,246 @@
+import threading
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, List
+
+from elasticsearch import AsyncElasticsearch, Elasticsearch, helpers
+
+
+@dataclass
+class BatchReport:
+    batch: int
+    indexed: int
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class BulkReport:
+    batches: List[BatchReport] = field(default_factory=list)
+
+    @property
+    def indexed(self) -> int:
+        return sum(b.indexed for b in self.batches)
+
+    @property
+    def failed(self) -> int:
+        return sum(len(b.errors) for b in self.batches)
+
+
+def _refresh_interval(settings, index_name: str) -> str | None:
+    return (
+        settings.get(index_name, {})
+        .get("settings", {})
+        .get("index", {})
+        .get("refresh_interval")
+    )
+
+
+def get_refresh_interval(es: Elasticsearch, index_name: str) -> str | None:
+    """
+    The index.refresh_interval setting of an index, None if it uses the default.
+    """
+    settings = es.indices.get_settings(index=index_name, name="index.refresh_interval")
+    return _refresh_interval(settings, index_name)
+
+
+def _bulk_actions(index_name: str, batch: List[Dict[str, Any]], id_field: str | None) -> List[Dict[str, Any]]:
+    actions = [{"_index": index_name, "_source": doc} for doc in batch]
+    if id_field is not None:
+        for action, doc in zip(actions, batch):
+            action["_id"] = doc[id_field]
+    return actions
+
+
+def _add_batch(report: BulkReport, batch_size: int, indexed: int, errors: List[Dict[str, Any]]) -> None:
+    batch_report = BatchReport(batch=len(report.batches), indexed=indexed, errors=errors)
+    report.batches.append(batch_report)
+    if errors:
+        print(f"❌ Batch {batch_report.batch}: {len(errors)} of {batch_size} documents failed")
+
+
+# bulk loads in progress per index, and the refresh interval the index had
+# before the first of them, which the last one restores
+_active_loads: Dict[str, int] = {}
+_saved_refresh: Dict[str, str | None] = {}
+_loads_lock = threading.Lock()
+
+
+def _start_load(index_name: str) -> bool:
+    """
+    Count a load, True if no other load into the index is active. That
+    load turns refreshing off.
+    """
+    with _loads_lock:
+        _active_loads[index_name] = _active_loads.get(index_name, 0) + 1
+        return _active_loads[index_name] == 1
+
+
+def _finish_load(index_name: str) -> bool:
+    """
+    Uncount a load, True if it was the last active one. That load
+    restores the saved refresh interval.
+    """
+    with _loads_lock:
+        _active_loads[index_name] -= 1
+        return _active_loads[index_name] == 0 and index_name in _saved_refresh
+
+
+def _forget_refresh(index_name: str) -> None:
+    # a load that started while the interval was restored still needs it
+    with _loads_lock:
+        if _active_loads[index_name] == 0:
+            _saved_refresh.pop(index_name, None)
+
+
+def _restore_settings(index_name: str) -> Dict[str, Any]:
+    # None resets the setting to the Elasticsearch default
+    return {"index": {"refresh_interval": _saved_refresh[index_name]}}
+
+
+REFRESH_OFF = {"index": {"refresh_interval": "-1"}}
+
+
+def bulk_index(
+        es: Elasticsearch,
+        index_name: str,
+        docs: Iterable[Dict[str, Any]],
+        batch_size: int = 500,
+        id_field: str | None = None
+    ) -> BulkReport:
+    """
+    Index documents with the _bulk API, one request per batch.
+
+    Refreshing is turned off while loading and the previous refresh
+    interval is restored afterwards, followed by one refresh so the
+    documents are searchable right away. Concurrent loads into the same
+    index in this process share that: the first one turns refreshing off
+    and the last one restores it. Failed documents do not stop the load,
+    they are reported per batch.
+
+    Args:
+        es: Elasticsearch client
+        index_name: Index to write to, it must exist
+        docs: Documents to index, can be a generator
+        batch_size: Number of documents per _bulk request
+        id_field: Optional document field used as the _id, so indexing the
+                  same document again overwrites it instead of adding a copy
+
+    Returns:
+        BulkReport: Number of indexed documents and the errors of every batch
+    """
+    report = BulkReport()
+
+    try:
+        if _start_load(index_name):
+            if index_name not in _saved_refresh:
+                _saved_refresh[index_name] = get_refresh_interval(es, index_name)
+            es.indices.put_settings(index=index_name, settings=REFRESH_OFF)
+
+        docs = iter(docs)
+        while True:
+            batch = list(islice(docs, batch_size))
+            if not batch:
+                break
+
+            indexed, errors = helpers.bulk(
+                es,
+                _bulk_actions(index_name, batch, id_field),
+                chunk_size=batch_size,
+                raise_on_error=False,
+                raise_on_exception=False,
+            )
+            _add_batch(report, len(batch), indexed, errors)
+    finally:
+        if _finish_load(index_name):
+            es.indices.put_settings(index=index_name, settings=_restore_settings(index_name))
+            _forget_refresh(index_name)
+        es.indices.refresh(index=index_name)
+
+    return report
+
+
+def indexed_values(es: Elasticsearch, index_name: str, field: str, values: List[str]) -> set[str]:
+    """
+    The values of a keyword field that already occur in the index.
+
+    Uses one terms query with a terms aggregation, so no documents are
+    fetched.
+
+    Args:
+        es: Elasticsearch client
+        index_name: Index to look in
+        field: A keyword field
+        values: Values to look for
+
+    Returns:
+        The subset of values that at least one document has
+    """
+    if not values:
+        return set()
+
+    response = es.search(index=index_name, size=0, **_terms_search(field, values))
+    return _found_values(response)
+
+
+def _terms_search(field: str, values: List[str]) -> Dict[str, Any]:
+    return {
+        "query": {"terms": {field: values}},
+        "aggs": {"found": {"terms": {"field": field, "size": len(values)}}},
+    }
+
+
+def _found_values(response) -> set[str]:
+    return {bucket["key"] for bucket in response["aggregations"]["found"]["buckets"]}
+
+
+async def async_bulk_index(
+        es: AsyncElasticsearch,
+        index_name: str,
+        docs: Iterable[Dict[str, Any]],
+        batch_size: int = 500,
+        id_field: str | None = None
+    ) -> BulkReport:
+    """
+    Async version of bulk_index() for an AsyncElasticsearch client.
+    """
+    report = BulkReport()
+
+    try:
+        if _start_load(index_name):
+            if index_name not in _saved_refresh:
+                settings = await es.indices.get_settings(index=index_name, name="index.refresh_interval")
+                _saved_refresh[index_name] = _refresh_interval(settings, index_name)
+            await es.indices.put_settings(index=index_name, settings=REFRESH_OFF)
+
+        docs = iter(docs)
+        while True:
+            batch = list(islice(docs, batch_size))
+            if not batch:
+                break
+
+            indexed, errors = await helpers.async_bulk(
+                es,
+                _bulk_actions(index_name, batch, id_field),
+                chunk_size=batch_size,
+                raise_on_error=False,
+                raise_on_exception=False,
+            )
+            _add_batch(report, len(batch), indexed, errors)
+    finally:
+        if _finish_load(index_name):
+            await es.indices.put_settings(index=index_name, settings=_restore_settings(index_name))
+            _forget_refresh(index_name)
+        await es.indices.refresh(index=index_name)
+
+    return report
+
+
+async def async_indexed_values(es: AsyncElasticsearch, index_name: str, field: str, values: List[str]) -> set[str]:
+    """
+    Async version of indexed_values() for an AsyncElasticsearch client.
+    """
+    if not values:
+        return set()
+
+    response = await es.search(index=index_name, size=0, **_terms_search(field, values))
+    return _found_values(response)
@@ -1,39 +1 @@
-from typing import Any, Dict, Iterable, List
-
-def sliding_window(
-        seq: Iterable[Any],
-        size: int,
-        step: int
-    ) -> List[Dict[str, Any]]:
-    """
-    Create overlapping chunks from a sequence using a sliding window approach.
-
-    Args:
-        seq: The input sequence (string or list) to be chunked.
-        size (int): The size of each chunk/window.
-        step (int): The step size between consecutive windows.
-
-    Returns:
-        list: A list of dictionaries, each containing:
-            - 'start': The starting position of the chunk in the original sequence
-            - 'content': The chunk content
-
-    Raises:
-        ValueError: If size or step are not positive integers.
-
-    Example:
-        >>> sliding_window("hello world", size=5, step=3)
-        [{'start': 0, 'content': 'hello'}, {'start': 3, 'content': 'lo wo'}]
-    """
-    if size <= 0 or step <= 0:
-        raise ValueError("size and step must be positive")
-
-    n = len(seq)
-    result = []
-    for i in range(0, n, step):
-        batch = seq[i:i+size]
-        result.append({'start': i, 'content': batch})
-        if i + size > n:
-            break
-
-    return result
\ No newline at end of file
+from common.chunking import Chunk, chunk_views, iter_chunks, sliding_window
@@ -0,0 +1,189 @@
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+
+# e.g. http://arxiv.org/abs/2106.09685v2 or http://arxiv.org/abs/hep-th/9901001v1
+ARXIV_ID = re.compile(r"/abs/(?P<id>.+?)(?:v(?P<version>\d+))?$")
+
+
+def parse_arxiv_id(entry_id: str) -> tuple[str, int | None]:
+    """
+    Split the id URL of an arXiv feed entry into the arxiv id and the version.
+
+    Example:
+        >>> parse_arxiv_id("http://arxiv.org/abs/2106.09685v2")
+        ('2106.09685', 2)
+    """
+    match = ARXIV_ID.search(entry_id)
+    if match is None:
+        return entry_id.split('/')[-1], None
+
+    version = match.group("version")
+    return match.group("id"), int(version) if version else None
+
+
+def paper_key(entry_id: str) -> str:
+    """
+    Cache key of a paper: arxiv id and version, e.g. '2106.09685v2'.
+    """
+    arxiv_id, version = parse_arxiv_id(entry_id)
+    return arxiv_id if version is None else f"{arxiv_id}v{version}"
+
+
+@dataclass
+class PaperEntry:
+    size: int
+    stored_at: float = 0.0
+    last_used: float = 0.0
+
+
+class PaperCache:
+    """
+    Persistent cache of the text extracted from arXiv PDFs.
+
+    Texts are stored gzip-compressed under their arxiv id and version, so
+    a new version of a paper is downloaded again while the same version
+    never is. When the compressed size goes over max_bytes, the least
+    recently used papers are evicted.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = 512 * 1024**2):
+        """
+        Initialize the paper cache.
+
+        Args:
+            cache_dir: Directory where texts and the index are stored
+            max_bytes: Upper bound for the total compressed size of the texts
+        """
+        self.cache_dir = Path(cache_dir)
+        self.texts_dir = self.cache_dir / "texts"
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+
+        self.texts_dir.mkdir(parents=True, exist_ok=True)
+        self.entries = self._load_index()
+        # the async tools extract papers on worker threads
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        """
+        Text of a cached paper.
+
+        Args:
+            key: Cache key of the paper, see paper_key()
+
+        Returns:
+            The extracted text, or None if the paper is not cached
+        """
+        path = self._text_path(key)
+        with self._lock:
+            if key not in self.entries or not path.exists():
+                self.misses += 1
+                return None
+
+            with gzip.open(path, "rt", encoding="utf-8") as f_in:
+                text = f_in.read()
+
+            self.entries[key].last_used = time.time()
+            self._save_index()
+
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """
+        Store the text of a paper and evict old papers if needed.
+
+        Args:
+            key: Cache key of the paper, see paper_key()
+            text: The extracted text
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=self.texts_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f_raw, gzip.GzipFile(fileobj=f_raw, mode="wb") as f_out:
+                f_out.write(text.encode("utf-8"))
+
+            with self._lock:
+                os.replace(tmp_name, self._text_path(key))
+
+                now = time.time()
+                self.entries[key] = PaperEntry(
+                    size=self._text_path(key).stat().st_size,
+                    stored_at=now,
+                    last_used=now
+                )
+                self._evict(keep=key)
+                self._save_index()
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+    def total_bytes(self) -> int:
+        return sum(entry.size for entry in self.entries.values())
+
+    def stats(self) -> dict[str, float]:
+        """
+        Hit/miss counters of this cache instance.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes(),
+            }
+
+    def _evict(self, keep: str) -> None:
+        """
+        Drop least recently used papers until the cache fits into max_bytes.
+        The paper that was just stored is never evicted.
+        """
+        by_last_used = sorted(self.entries.items(), key=lambda item: item[1].last_used)
+
+        for key, _ in by_last_used:
+            if self.total_bytes() <= self.max_bytes:
+                break
+            if key != keep:
+                del self.entries[key]
+                self._text_path(key).unlink(missing_ok=True)
+
+    def _text_path(self, key: str) -> Path:
+        # old style ids contain a slash, e.g. hep-th/9901001v1
+        return self.texts_dir / f"{key.replace('/', '_')}.txt.gz"
+
+    def _load_index(self) -> dict[str, PaperEntry]:
+        if not self.index_path.exists():
+            return {}
+
+        with open(self.index_path, "r", encoding="utf-8") as f_in:
+            raw = json.load(f_in)
+        return {key: PaperEntry(**value) for key, value in raw.items()}
+
+    def _save_index(self) -> None:
+        # called with the lock held. A new temp file is written first so a
+        # crash never leaves a broken index
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".json.tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f_out:
+                json.dump({key: asdict(entry) for key, entry in self.entries.items()}, f_out)
+            os.replace(tmp_name, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
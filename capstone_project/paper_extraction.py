@@ -0,0 +1,129 @@
+import io
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+from common import http_client
+
+
+def get_pdf_url(entry) -> str:
+    """
+    PDF link of an arXiv feed entry.
+
+    The position of the PDF link in entry.links differs between entries,
+    so it is looked up by its title or type. Falls back to the PDF URL
+    built from the entry id.
+    """
+    for link in entry.get("links", []):
+        if link.get("title") == "pdf" or link.get("type") == "application/pdf":
+            return link["href"]
+    return entry.id.replace("/abs/", "/pdf/")
+
+
+def download_pdf(pdf_url: str, timeout: float = 30) -> bytes:
+    response = http_client.get(pdf_url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def pdf_to_text(data: bytes) -> str:
+    """
+    Text of a PDF, extracted with pdfminer the same way as arxiv2text.arxiv_to_text().
+    """
+    resource_manager = PDFResourceManager()
+    text_stream = io.StringIO()
+
+    device = TextConverter(resource_manager, text_stream, laparams=LAParams())
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    for page in PDFPage.get_pages(io.BytesIO(data)):
+        interpreter.process_page(page)
+
+    return text_stream.getvalue()
+
+
+def new_parse_pool(parse_workers: int = 2) -> ProcessPoolExecutor:
+    # spawn: forking while the download threads run can deadlock
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def extract_papers(
+        pdf_urls: List[str],
+        deadline: float = 120,
+        download_workers: int = 4,
+        parse_workers: int = 2,
+        download: Callable[[str], bytes] = download_pdf,
+        to_text: Callable[[bytes], str] = pdf_to_text,
+        parsing: Executor | None = None
+    ) -> Dict[int, str]:
+    """
+    Download PDFs on a thread pool and extract their text on a process pool.
+
+    A paper is handed to the process pool as soon as its download is done,
+    so downloads and parsing overlap. A paper that fails to download or
+    parse is skipped without affecting the others. When the deadline
+    passes, the papers finished so far are returned and the rest are
+    abandoned.
+
+    Args:
+        pdf_urls: PDF links of the papers
+        deadline: Seconds until the partial results are returned
+        download_workers: Number of concurrent downloads
+        parse_workers: Number of processes extracting text, if no parsing pool is given
+        download: Function that returns the bytes of a PDF link
+        to_text: Function that returns the text of PDF bytes, must be picklable
+        parsing: Process pool to reuse across calls, e.g. Agent_Tools.parse_pool().
+            Without it a pool is created for this call and shut down at the end
+
+    Returns:
+        Dictionary from the position of the paper in pdf_urls to its text
+    """
+    end_time = time.monotonic() + deadline
+    texts = {}
+
+    downloads = ThreadPoolExecutor(max_workers=download_workers)
+    own_pool = parsing is None
+    if own_pool:
+        parsing = new_parse_pool(parse_workers)
+
+    try:
+        pending: Dict[Any, tuple[str, int]] = {
+            downloads.submit(download, url): ("download", i)
+            for i, url in enumerate(pdf_urls)
+        }
+
+        while pending:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                print(f"⏰ Deadline reached, {len(pending)} papers not extracted")
+                break
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, i = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ Failed to {stage} {pdf_urls[i]}: {e}")
+                    continue
+
+                if stage == "download":
+                    pending[parsing.submit(to_text, result)] = ("parse", i)
+                else:
+                    texts[i] = result
+    finally:
+        # running downloads and parses are not waited for
+        downloads.shutdown(wait=False, cancel_futures=True)
+        if own_pool:
+            parsing.shutdown(wait=False, cancel_futures=True)
+        else:
+            # the shared pool stays up, only the parses still queued are dropped
+            for future in pending:
+                future.cancel()
+
+    return texts
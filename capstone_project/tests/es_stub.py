@@ -0,0 +1,147 @@
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# an arXiv API response with one paper
+ARXIV_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>http://arxiv.org/abs/2106.09685v2</id>
+    <published>2021-06-17T17:37:18Z</published>
+    <title>LoRA</title>
+    <summary>Low-rank adaptation.</summary>
+    <author><name>Edward Hu</name></author>
+    <link href="http://arxiv.org/pdf/2106.09685v2" rel="related" type="application/pdf" title="pdf"/>
+  </entry>
+</feed>
+"""
+
+
+class _ElasticsearchHandler(BaseHTTPRequestHandler):
+    """
+    Minimal single-index Elasticsearch API: ping, index exists/create,
+    _mapping, _settings, _bulk, _refresh and a _search with a terms query
+    and terms aggregation, or a multi_match that returns every document.
+
+    Creating the index when it exists fails with a 400
+    resource_already_exists_exception. Documents with "fail": true are
+    rejected by _bulk. Every request is recorded as (method, path,
+    refresh_interval at that time).
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body=None, status=200):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _handle(self):
+        path = self.path.split("?")[0]
+        self.server.requests.append((self.command, path, self.server.refresh_interval))
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        parts = [p for p in path.split("/") if p]
+
+        if not parts:
+            return self._send({"version": {"number": "9.0.0"}})
+        if parts[-1] == "_bulk":
+            return self._bulk(body)
+        if parts[-1] == "_refresh":
+            return self._send({"_shards": {"total": 1, "successful": 1, "failed": 0}})
+        if parts[-1] == "_search":
+            return self._search(json.loads(body))
+
+        index_name = parts[0]
+        if len(parts) == 1:
+            if self.command == "HEAD":
+                return self._send(status=200 if self.server.index_exists else 404)
+            if self.server.index_exists:
+                error = {"type": "resource_already_exists_exception", "reason": f"index [{index_name}] already exists"}
+                return self._send({"error": error, "status": 400}, status=400)
+            self.server.index_exists = True
+            self.server.mappings = json.loads(body or b"{}").get("mappings", {}).get("properties", {})
+            return self._send({"acknowledged": True, "index": index_name})
+        if "_mapping" in parts:
+            if self.command == "PUT":
+                self.server.mappings.update(json.loads(body)["properties"])
+                return self._send({"acknowledged": True})
+            return self._send({index_name: {"mappings": {"properties": self.server.mappings}}})
+        if "_settings" in parts:
+            if self.command == "PUT":
+                self.server.refresh_interval = json.loads(body)["index"]["refresh_interval"]
+                return self._send({"acknowledged": True})
+            settings = {}
+            if self.server.refresh_interval is not None:
+                settings = {"index": {"refresh_interval": self.server.refresh_interval}}
+            return self._send({index_name: {"settings": settings}})
+
+        self._send({"error": "not found"}, status=404)
+
+    do_GET = do_PUT = do_POST = do_HEAD = _handle
+
+    def _bulk(self, body: bytes):
+        lines = [json.loads(line) for line in body.splitlines() if line.strip()]
+        items = []
+        for action, source in zip(lines[::2], lines[1::2]):
+            meta = action["index"]
+            if source.get("fail"):
+                items.append({"index": {**meta, "status": 400, "error": {"type": "mapper_parsing_exception"}}})
+                continue
+
+            doc_id = meta.get("_id", str(len(self.server.docs) + 1))
+            status = 200 if doc_id in self.server.docs else 201
+            self.server.docs[doc_id] = source
+            items.append({"index": {**meta, "_id": doc_id, "status": status}})
+
+        errors = any(item["index"]["status"] >= 300 for item in items)
+        self._send({"took": 1, "errors": errors, "items": items})
+
+    def _search(self, body: dict):
+        if "multi_match" in body["query"]:
+            hits = [{"_id": doc_id, "_source": doc} for doc_id, doc in self.server.docs.items()]
+            return self._send({"hits": {"hits": hits[:body.get("size", 10)]}})
+
+        (field, values), = body["query"]["terms"].items()
+        found = sorted({doc[field] for doc in self.server.docs.values() if doc.get(field) in values})
+        buckets = [{"key": value, "doc_count": 1} for value in found]
+        self._send({"hits": {"hits": []}, "aggregations": {"found": {"buckets": buckets}}})
+
+
+@contextmanager
+def serve_elasticsearch(refresh_interval=None, index_exists=True, mappings=None):
+    """
+    Start a stub Elasticsearch server on a free local port.
+
+    Args:
+        refresh_interval: refresh_interval of the index settings, None if not set
+        index_exists: Whether the index exists already
+        mappings: Field mappings of the existing index
+
+    Yields:
+        The server, with its address in .url, the received requests in
+        .requests, the indexed documents by _id in .docs and the field
+        mappings in .mappings
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ElasticsearchHandler)
+    server.requests = []
+    server.docs = {}
+    server.refresh_interval = refresh_interval
+    server.index_exists = index_exists
+    server.mappings = dict(mappings or {})
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+
+import feedparser
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+
+import tools
+from es_ingest import bulk_index
+from es_stub import ARXIV_FEED, serve_elasticsearch
+from tools import Agent_Tools, Async_Agent_Tools, FetchQuery
+
+
+def test_bulk_index_batches_and_restores_refresh():
+    docs = ({"id": str(i), "content": f"chunk {i}", "fail": i == 7} for i in range(25))
+
+    with serve_elasticsearch(refresh_interval="5s") as server:
+        es = Elasticsearch(server.url)
+        report = bulk_index(es, "arxiv_chunks", docs, batch_size=10)
+
+        bulk_requests = [r for r in server.requests if r[1].endswith("/_bulk")]
+        assert len(bulk_requests) == 3
+        assert all(refresh == "-1" for _, _, refresh in bulk_requests)
+
+        assert server.refresh_interval == "5s"
+        assert server.requests[-1][1] == "/arxiv_chunks/_refresh"
+        assert len(server.docs) == 24
+
+    assert report.indexed == 24
+    assert report.failed == 1
+    assert [len(batch.errors) for batch in report.batches] == [1, 0, 0]
+
+
+def test_overlapping_loads_restore_refresh_once():
+    a_started, b_started, a_done = threading.Event(), threading.Event(), threading.Event()
+
+    def docs_a():
+        yield {"id": "a1"}
+        a_started.set()
+        b_started.wait(5)
+
+    def docs_b():
+        b_started.set()
+        a_done.wait(5)
+        yield {"id": "b1"}
+
+    with serve_elasticsearch(refresh_interval="5s") as server:
+        es = Elasticsearch(server.url)
+
+        def load_b():
+            a_started.wait(5)
+            bulk_index(es, "arxiv_chunks", docs_b())
+
+        # A starts, B starts, A finishes, B finishes
+        thread = threading.Thread(target=load_b)
+        thread.start()
+        bulk_index(es, "arxiv_chunks", docs_a())
+        assert server.refresh_interval == "-1"
+        a_done.set()
+        thread.join()
+
+        assert server.refresh_interval == "5s"
+        assert len(server.docs) == 2
+
+
+def test_repeated_ingestion_skips_indexed_papers(monkeypatch):
+    extracted = []
+
+    def fake_extract_papers(pdf_urls, deadline, parsing=None):
+        extracted.extend(pdf_urls)
+        return {i: "low rank adaptation of large language models. " * 300 for i in range(len(pdf_urls))}
+
+    monkeypatch.setattr(tools, "extract_papers", fake_extract_papers)
+
+    with serve_elasticsearch(index_exists=False) as server:
+        agent_tools = Agent_Tools(es_index=Elasticsearch(server.url))
+        monkeypatch.setattr(agent_tools, "get_metadata", lambda paper_name: feedparser.parse(ARXIV_FEED))
+
+        agent_tools.get_data_to_index(FetchQuery(query="what is LoRA?", paper_name="LoRA"))
+        num_docs = len(server.docs)
+        agent_tools.get_data_to_index(FetchQuery(query="what is LoRA?", paper_name="LoRA"))
+
+        assert extracted == ["http://arxiv.org/pdf/2106.09685v2"]
+        assert num_docs > 1 and len(server.docs) == num_docs
+        assert all(doc_id == doc["chunk_id"] and doc_id.startswith("2106.09685v2:") for doc_id, doc in server.docs.items())
+
+        # indexing the same chunks again overwrites them
+        agent_tools.create_elasticsearch_index(list(server.docs.values()))
+        assert len(server.docs) == num_docs
+
+
+def test_index_is_checked_once_and_only_missing_mappings_are_added(monkeypatch):
+    monkeypatch.setattr(tools, "extract_papers", lambda pdf_urls, deadline, parsing=None: {0: "low rank adaptation. " * 600})
+
+    with serve_elasticsearch(mappings={"paper_key": {"type": "keyword"}}) as server:
+        agent_tools = Agent_Tools(es_index=Elasticsearch(server.url))
+        monkeypatch.setattr(agent_tools, "get_metadata", lambda paper_name: feedparser.parse(ARXIV_FEED))
+
+        agent_tools.get_data_to_index(FetchQuery(query="what is LoRA?", paper_name="LoRA"))
+        agent_tools.get_data_to_index(FetchQuery(query="what is LoRA?", paper_name="LoRA"))
+
+        mapping_requests = [(method, path) for method, path, _ in server.requests if path.endswith("/_mapping")]
+        assert mapping_requests == [("GET", "/arxiv_chunks/_mapping"), ("PUT", "/arxiv_chunks/_mapping")]
+        assert server.mappings["chunk_id"] == {"type": "keyword"}
+        assert len([r for r in server.requests if r[:2] == ("HEAD", "/arxiv_chunks")]) == 1
+
+
+def test_concurrent_loaders_both_creating_the_index(monkeypatch):
+    async def missing(**kwargs):
+        return False
+
+    async def run(url):
+        es = AsyncElasticsearch(url, node_class="httpxasync")
+        # both loaders see no index, one of them creates it first
+        monkeypatch.setattr(es.indices, "exists", missing)
+        await asyncio.gather(Async_Agent_Tools(es_index=es).ensure_index(), Async_Agent_Tools(es_index=es).ensure_index())
+        await es.close()
+
+    with serve_elasticsearch(index_exists=False) as server:
+        asyncio.run(run(server.url))
+        assert len([r for r in server.requests if r[:2] == ("PUT", "/arxiv_chunks")]) == 2
+
+        es = Elasticsearch(server.url)
+        monkeypatch.setattr(es.indices, "exists", lambda **kwargs: False)
+        Agent_Tools(es_index=es).ensure_index()
+        assert server.mappings["chunk_id"] == {"type": "keyword"}
+
+
+def test_async_tools_index_and_search(monkeypatch):
+    monkeypatch.setattr(tools, "extract_papers", lambda pdf_urls, deadline, parsing=None: {0: "low rank adaptation. " * 600})
+
+    async def get_metadata(paper_name):
+        return feedparser.parse(ARXIV_FEED)
+
+    async def run(url):
+        es = AsyncElasticsearch(url, node_class="httpxasync")
+        agent_tools = Async_Agent_Tools(es_index=es)
+        monkeypatch.setattr(agent_tools, "get_metadata", get_metadata)
+
+        param = FetchQuery(query="what is LoRA?", paper_name="LoRA")
+        await asyncio.gather(agent_tools.get_data_to_index(param), agent_tools.search(param))
+        await agent_tools.get_data_to_index(param)
+        await es.close()
+
+    with serve_elasticsearch(index_exists=False) as server:
+        asyncio.run(run(server.url))
+
+        assert len(server.docs) > 1
+        assert all(doc_id.startswith("2106.09685v2:") for doc_id in server.docs)
+        # the second call found the paper in the index and did not bulk again
+        assert len([r for r in server.requests if r[1].endswith("/_bulk")]) == 1
@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import feedparser
+
+import tools
+from paper_cache import PaperCache, paper_key, parse_arxiv_id
+from tools import Agent_Tools
+from es_stub import ARXIV_FEED
+
+
+def test_arxiv_id_and_version():
+    assert parse_arxiv_id("http://arxiv.org/abs/2106.09685v2") == ("2106.09685", 2)
+    assert parse_arxiv_id("http://arxiv.org/abs/hep-th/9901001v1") == ("hep-th/9901001", 1)
+    assert paper_key("http://arxiv.org/abs/2106.09685") == "2106.09685"
+
+
+def test_eviction_keeps_the_newest_papers(tmp_path):
+    cache = PaperCache(tmp_path, max_bytes=1)
+    cache.put("2106.09685v1", "low rank adaptation " * 100)
+    cache.put("hep-th/9901001v1", "strings " * 100)
+
+    assert cache.get("2106.09685v1") is None
+    assert cache.get("hep-th/9901001v1") == "strings " * 100
+    assert len(list((tmp_path / "texts").iterdir())) == 1
+    assert PaperCache(tmp_path).entries.keys() == {"hep-th/9901001v1"}
+
+
+def test_extract_data_uses_the_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_extract_papers(pdf_urls, deadline, parsing=None):
+        calls.append(pdf_urls)
+        return {i: f"text of {url}" for i, url in enumerate(pdf_urls)}
+
+    monkeypatch.setattr(tools, "extract_papers", fake_extract_papers)
+    agent_tools = Agent_Tools(es_index=None, paper_cache=PaperCache(tmp_path))
+    feed = feedparser.parse(ARXIV_FEED)
+
+    first = agent_tools.extract_data(feed)
+    second = agent_tools.extract_data(feed)
+
+    assert calls == [["http://arxiv.org/pdf/2106.09685v2"]]
+    assert first == second
+    assert first[0]["content"] == "text of http://arxiv.org/pdf/2106.09685v2"
+
+
+def test_concurrent_puts_and_gets(tmp_path):
+    cache = PaperCache(tmp_path)
+    start = threading.Barrier(4)
+
+    def worker(n):
+        start.wait()
+        for i in range(20):
+            cache.put(f"{n}.{i}v1", f"paper {n} {i}")
+            assert cache.get(f"{n}.{i}v1") == f"paper {n} {i}"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(worker, range(4)))
+
+    assert len(PaperCache(tmp_path).entries) == 80
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_parse_pool_is_created_once_across_threads():
+    agent_tools = Agent_Tools(es_index=None)
+    start = threading.Barrier(8)
+
+    def get_pool(_):
+        start.wait()
+        return agent_tools.parse_pool()
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            pools = list(executor.map(get_pool, range(8)))
+        assert all(pool is pools[0] for pool in pools)
+    finally:
+        agent_tools.close()
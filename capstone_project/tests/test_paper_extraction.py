@@ -0,0 +1,57 @@
+import time
+
+from paper_extraction import extract_papers, get_pdf_url, new_parse_pool
+
+
+class Entry(dict):
+    __getattr__ = dict.get
+
+
+def fake_download(url):
+    if url == "slow":
+        time.sleep(10)
+    if url == "missing":
+        raise OSError("404")
+    return url.encode("utf-8")
+
+
+def fake_to_text(data):
+    if data == b"broken":
+        raise ValueError("not a PDF")
+    return data.decode("utf-8").upper()
+
+
+def test_failures_are_isolated_and_deadline_returns_partial_results():
+    urls = ["paper a", "missing", "broken", "slow", "paper b"]
+
+    t0 = time.monotonic()
+    texts = extract_papers(urls, deadline=5, download=fake_download, to_text=fake_to_text)
+
+    assert time.monotonic() - t0 < 9
+    assert texts == {0: "PAPER A", 4: "PAPER B"}
+
+
+def test_parse_pool_is_reused_across_calls():
+    parsing = new_parse_pool(1)
+    try:
+        first = extract_papers(["paper a", "broken"], download=fake_download, to_text=fake_to_text, parsing=parsing)
+        second = extract_papers(["paper b"], download=fake_download, to_text=fake_to_text, parsing=parsing)
+
+        assert first == {0: "PAPER A"}
+        assert second == {0: "PAPER B"}
+        # the pool is not shut down by extract_papers
+        assert parsing.submit(fake_to_text, b"paper c").result() == "PAPER C"
+    finally:
+        parsing.shutdown()
+
+
+def test_pdf_url_is_found_by_type():
+    entry = Entry(
+        id="http://arxiv.org/abs/2106.09685v2",
+        links=[
+            {"href": "http://arxiv.org/abs/2106.09685v2", "type": "text/html"},
+            {"href": "http://arxiv.org/pdf/2106.09685v2", "title": "pdf", "type": "application/pdf"},
+        ],
+    )
+    assert get_pdf_url(entry) == "http://arxiv.org/pdf/2106.09685v2"
+    assert get_pdf_url(Entry(id=entry.id, links=[entry["links"][0]])) == "http://arxiv.org/pdf/2106.09685v2"
@@ -2,158 +2,228 @@ import os
 import sys
 import requests
 from typing import Any, Dict, Iterable, List
-from tqdm.auto import tqdm
 import logging
 from pydantic import BaseModel
 
 
 # setting up the arxiv api
 import urllib, urllib.request
+import asyncio
+import threading
 import feedparser
-from arxiv2text import arxiv_to_text
-# from helper_functions import sliding_window
+from common import http_client
+from common.chunking import iter_boundary_chunks
 
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch, BadRequestError, Elasticsearch
+from es_ingest import async_bulk_index, async_indexed_values, bulk_index, indexed_values
+from paper_cache import PaperCache, paper_key
+from paper_extraction import extract_papers, get_pdf_url, new_parse_pool
 
 # Turn off all logging
 logging.disable(logging.CRITICAL)
 
-def sliding_window(
-        seq: Iterable[Any],
-        size: int,
-        step: int
-    ) -> List[Dict[str, Any]]:
-    """
-    Create overlapping chunks from a sequence using a sliding window approach.
 
-    Args:
-        seq: The input sequence (string or list) to be chunked.
-        size (int): The size of each chunk/window.
-        step (int): The step size between consecutive windows.
 
-    Returns:
-        list: A list of dictionaries, each containing:
-            - 'start': The starting position of the chunk in the original sequence
-            - 'content': The chunk content
+class FetchQuery(BaseModel):
+    query: str
+    paper_name: str
 
-    Raises:
-        ValueError: If size or step are not positive integers.
 
-    Example:
-        >>> sliding_window("hello world", size=5, step=3)
-        [{'start': 0, 'content': 'hello'}, {'start': 3, 'content': 'lo wo'}]
-    """
-    if size <= 0 or step <= 0:
-        raise ValueError("size and step must be positive")
-
-    n = len(seq)
-    result = []
-    for i in range(0, n, step):
-        batch = seq[i:i+size]
-        result.append({'start': i, 'content': batch})
-        if i + size > n:
-            break
+INDEX_SETTINGS = {
+    "mappings": {
+        "properties": {
+                "id": {"type": "text"},
+                "paper_key": {"type": "keyword"},
+                "chunk_id": {"type": "keyword"},
+                "title": {"type": "text"},
+                "authors": {"type": "keyword"},
+                "published": {"type": "text"},
+                "summary": {"type": "text"},
+                "content": {"type": "text"},
+        }
+    }
+}
 
-    return result
+# added to indexes created before paper_key existed
+KEY_MAPPINGS = {
+    "paper_key": {"type": "keyword"},
+    "chunk_id": {"type": "keyword"},
+}
 
 
-class FetchQuery(BaseModel):
-    query: str
-    paper_name: str
+def missing_key_mappings(mapping) -> Dict[str, Any]:
+    """
+    The KEY_MAPPINGS fields that are not in the response of indices.get_mapping().
+    """
+    properties = {}
+    for index_mapping in dict(mapping).values():
+        properties.update(index_mapping.get("mappings", {}).get("properties", {}))
+    return {field: spec for field, spec in KEY_MAPPINGS.items() if field not in properties}
 
 
 
 class Agent_Tools():
 
-    def __init__(self, es_index, max_results=None):
+    def __init__(self, es_index, max_results=None, paper_cache: PaperCache | None = None, parse_workers=2):
         self.index_name = "arxiv_chunks"
         if max_results is None:
             self.max_results = 5
         else:
             self.max_results = max_results
         self.index = es_index
+        self.paper_cache = paper_cache
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        # the async tools call extract_data from several threads
+        self._parse_pool_lock = threading.Lock()
+        # set by ensure_index(), the index is checked once per instance
+        self._index_ready = False
 
 
-    def get_metadata(self, paper_name="electron"):
-
+    def metadata_url(self, paper_name):
         paper_name = paper_name.replace(" ", "+")
+        return f'http://export.arxiv.org/api/query?search_query=all:{paper_name}&max_results={self.max_results}'
 
-        url = f'http://export.arxiv.org/api/query?search_query=all:{paper_name}&max_results={self.max_results}'
-        data = urllib.request.urlopen(url).read()
-        feed = feedparser.parse(data)
+
+    def get_metadata(self, paper_name="electron"):
+
+        response = http_client.get(self.metadata_url(paper_name))
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
 
         return feed
 
 
-    def extract_data(self, feed):
+    def parse_pool(self):
+        # created once and reused by every extraction of this instance
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                self._parse_pool = new_parse_pool(self.parse_workers)
+            return self._parse_pool
+
+
+    def close(self):
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=False, cancel_futures=True)
+                self._parse_pool = None
+
+
+    def extract_data(self, feed, deadline=120):
         doc = []
-        
-        for entry in feed.entries:
+
+        # papers of the same arxiv id and version are extracted only once
+        texts = {}
+        if self.paper_cache is not None:
+            for i, entry in enumerate(feed.entries):
+                cached = self.paper_cache.get(paper_key(entry.id))
+                if cached is not None:
+                    texts[i] = cached
+
+        # the other papers are downloaded and parsed concurrently, papers that
+        # fail or are not done before the deadline are left out
+        missing = [i for i in range(len(feed.entries)) if i not in texts]
+        pdf_urls = [get_pdf_url(feed.entries[i]) for i in missing]
+        extracted = extract_papers(pdf_urls, deadline=deadline, parsing=self.parse_pool()) if missing else {}
+
+        for position, text in extracted.items():
+            i = missing[position]
+            texts[i] = text
+            if self.paper_cache is not None:
+                self.paper_cache.put(paper_key(feed.entries[i].id), text)
+
+        for i, entry in enumerate(feed.entries):
             entry_id_url = entry.id
             arxiv_id = entry_id_url.split('/')[-1]
+            key = paper_key(entry_id_url)
 
-            #TODO: this pdf_url is not always yielding correct links.
-            # it breaks the tool call. fix it.
-            pdf_url = entry["links"][1]["href"]
-            paper_data = arxiv_to_text(pdf_url)
+            paper_data = texts.get(i)
 
             if paper_data is not None:
-                chunks = sliding_window(paper_data, 5000, 1000)
-                for chunk in chunks:
+                for chunk in iter_boundary_chunks(paper_data, 5000, 1000):
                     entry_dict = { 
                         "id": arxiv_id,
+                        "paper_key": key,
+                        "chunk_id": f"{key}:{chunk.start}",
                         "title": entry.title,
                         "authors": [auth['name'] for auth in entry.authors],
                         "published": entry.published,
                         "summary": entry.summary,
-                        "content": chunk["content"],
+                        "content": chunk.content,
 
                     }
                     doc.append(entry_dict)
-                # print(f"successfully extracted the pdf {pdf_url}")
+                # print(f"successfully extracted the paper {arxiv_id}")
             else:
-                # print(f"pdf not found for {pdf_url}")
+                # print(f"pdf not found for {arxiv_id}")
                 continue
         
         return doc
 
 
-    def create_elasticsearch_index(self, doc):
+    def ensure_index(self):
+        if self._index_ready:
+            return
+
         if self.index.ping():
             print("✅ Connected to Elasticsearch")
         else:
             print("❌ Connection failed")
 
-        index_settings = {
-            "mappings": {
-                "properties": {
-                        "id": {"type": "text"},
-                        "title": {"type": "text"},
-                        "authors": {"type": "keyword"},
-                        "published": {"type": "text"},
-                        "summary": {"type": "text"},
-                        "content": {"type": "text"},
-                }
-            }
-        }
-
         if not self.index.indices.exists(index=self.index_name):
-            self.index.indices.create(index=self.index_name, body=index_settings)
-            print(f"✅ Created index: {self.index_name}")
+            try:
+                self.index.indices.create(index=self.index_name, body=INDEX_SETTINGS)
+                print(f"✅ Created index: {self.index_name}")
+            except BadRequestError as e:
+                # another loader created it after the exists() check
+                if e.error != "resource_already_exists_exception":
+                    raise
+        else:
+            # indexes created before paper_key and chunk_id get the two fields
+            missing = missing_key_mappings(self.index.indices.get_mapping(index=self.index_name))
+            if missing:
+                self.index.indices.put_mapping(index=self.index_name, properties=missing)
+
+        self._index_ready = True
+
 
-        for chunks in tqdm(doc):        
-            self.index.index(index=self.index_name, document=chunks)
+    def create_elasticsearch_index(self, doc, batch_size=500):
+        self.ensure_index()
+
+        # one _bulk request per batch instead of one request per chunk. The
+        # chunk_id is the _id, so a chunk indexed twice is overwritten
+        report = bulk_index(self.index, self.index_name, doc, batch_size=batch_size, id_field="chunk_id")
+        print(f"✅ Indexed {report.indexed} chunks, {report.failed} failed")
    
 
     def get_data_to_index(self, param: FetchQuery):
         feed = self.get_metadata(param.paper_name)
-        doc = self.extract_data(feed)
+
+        # papers already in the index are not downloaded again
+        self.ensure_index()
+        keys = [paper_key(entry.id) for entry in feed.entries]
+        indexed = indexed_values(self.index, self.index_name, "paper_key", keys)
+
+        new_feed = self.new_papers(feed, keys, indexed)
+        if new_feed is None:
+            return
+
+        doc = self.extract_data(new_feed)
         self.create_elasticsearch_index(doc)
 
 
-    def search(self, param: FetchQuery):
+    def new_papers(self, feed, keys, indexed):
+        if indexed:
+            print(f"✅ {len(indexed)} of {len(keys)} papers are already indexed")
+
+        new_entries = [entry for entry, key in zip(feed.entries, keys) if key not in indexed]
+        if not new_entries:
+            return None
+        return feedparser.FeedParserDict(entries=new_entries)
+
 
-        es_query = {
+    def search_query(self, param: FetchQuery):
+        return {
             "size": self.max_results,
             "query": {
                 "multi_match": {
@@ -164,7 +234,10 @@ class Agent_Tools():
             }
         }
 
-        response = self.index.search(index=self.index_name, body=es_query)
+
+    def search(self, param: FetchQuery):
+
+        response = self.index.search(index=self.index_name, body=self.search_query(param))
 
         result_docs = []
         
@@ -174,6 +247,77 @@ class Agent_Tools():
         return result_docs
 
 
+
+class Async_Agent_Tools(Agent_Tools):
+    """
+    Agent_Tools with async tools for an AsyncElasticsearch client.
+
+    arXiv and Elasticsearch requests are awaited on the event loop, so
+    parallel tool calls run concurrently instead of holding a worker
+    thread each. Downloading and parsing the PDFs keeps its own thread and
+    process pools and runs in a worker thread.
+    """
+
+    async def get_metadata(self, paper_name="electron"):
+
+        response = await http_client.aget(self.metadata_url(paper_name))
+        response.raise_for_status()
+        return feedparser.parse(response.content)
+
+
+    async def ensure_index(self):
+        if self._index_ready:
+            return
+
+        if await self.index.ping():
+            print("✅ Connected to Elasticsearch")
+        else:
+            print("❌ Connection failed")
+
+        if not await self.index.indices.exists(index=self.index_name):
+            try:
+                await self.index.indices.create(index=self.index_name, body=INDEX_SETTINGS)
+                print(f"✅ Created index: {self.index_name}")
+            except BadRequestError as e:
+                # another loader created it after the exists() check
+                if e.error != "resource_already_exists_exception":
+                    raise
+        else:
+            missing = missing_key_mappings(await self.index.indices.get_mapping(index=self.index_name))
+            if missing:
+                await self.index.indices.put_mapping(index=self.index_name, properties=missing)
+
+        self._index_ready = True
+
+
+    async def create_elasticsearch_index(self, doc, batch_size=500):
+        await self.ensure_index()
+
+        report = await async_bulk_index(self.index, self.index_name, doc, batch_size=batch_size, id_field="chunk_id")
+        print(f"✅ Indexed {report.indexed} chunks, {report.failed} failed")
+
+
+    async def get_data_to_index(self, param: FetchQuery):
+        feed = await self.get_metadata(param.paper_name)
+
+        await self.ensure_index()
+        keys = [paper_key(entry.id) for entry in feed.entries]
+        indexed = await async_indexed_values(self.index, self.index_name, "paper_key", keys)
+
+        new_feed = self.new_papers(feed, keys, indexed)
+        if new_feed is None:
+            return
+
+        doc = await asyncio.to_thread(self.extract_data, new_feed)
+        await self.create_elasticsearch_index(doc)
+
+
+    async def search(self, param: FetchQuery):
+
+        response = await self.index.search(index=self.index_name, body=self.search_query(param))
+        return [hit['_source'] for hit in response['hits']['hits']]
+
+
 # es = Elasticsearch("http://localhost:9200")
 
 # agent_class = Agent_Tools(es_index=es)
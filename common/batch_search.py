@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.preprocessing import normalize
+from sklearn.utils.extmath import safe_sparse_dot
+
+
+# number of queries scored at once, bounds the dense score block to
+# QUERY_BLOCK x number of documents floats
+QUERY_BLOCK = 256
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest positive scores of every row, best first.
+
+    Uses argpartition, so only the k selected scores are sorted instead
+    of the whole row.
+
+    Args:
+        scores: 2D array with one row of document scores per query
+        k: Number of results per row
+
+    Returns:
+        List with one index array per row, with at most k entries
+    """
+    num_docs = scores.shape[1]
+    if k < num_docs:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(num_docs), scores.shape)
+
+    results = []
+    for row, idx in zip(scores, candidates):
+        idx = idx[row[idx] > 0]
+        results.append(idx[np.argsort(-row[idx], kind="stable")])
+    return results
+
+
+def _keyword_mask(index, filter_dict: Dict[str, Any]) -> Optional[np.ndarray]:
+    mask = None
+    for field, value in filter_dict.items():
+        if field not in index.keyword_fields:
+            continue
+        if value is None:
+            field_mask = index.keyword_df[field].isna().to_numpy()
+        else:
+            field_mask = (index.keyword_df[field] == value).to_numpy()
+        mask = field_mask if mask is None else mask & field_mask
+    return mask
+
+
+def search_many(
+        index,
+        queries: Sequence[str],
+        filter_dict: Optional[Dict[str, Any]] = None,
+        boost_dict: Optional[Dict[str, float]] = None,
+        num_results: int = 10,
+        output_ids: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+    """
+    Run many queries against a minsearch Index at once.
+
+    All queries are vectorized in one call per text field and scored with
+    one sparse matrix product against the TF-IDF matrix, instead of one
+    product per query. The scores are the same as Index.search(). Indexes
+    without TF-IDF matrices, e.g. an AppendableIndex, are searched one
+    query at a time.
+
+    Args:
+        index: A fitted Index
+        queries: The search queries
+        filter_dict: Keyword fields to filter by, as in Index.search()
+        boost_dict: Boost scores of the text fields, as in Index.search()
+        num_results: Number of results per query
+        output_ids: Add an '_id' field with the position of the document
+
+    Returns:
+        One list of results per query, in the order of the queries
+    """
+    filter_dict = filter_dict or {}
+    boost_dict = boost_dict or {}
+
+    if not hasattr(index, "text_matrices"):
+        return [
+            index.search(
+                query,
+                filter_dict=filter_dict,
+                boost_dict=boost_dict,
+                num_results=num_results,
+                output_ids=output_ids,
+            )
+            for query in queries
+        ]
+
+    queries = list(queries)
+    num_docs = len(index.docs)
+    if num_docs == 0 or not queries:
+        return [[] for _ in queries]
+
+    # the document rows are normalized once instead of once per query
+    fields = [
+        (field, normalize(index.text_matrices[field]).T, boost_dict.get(field, 1))
+        for field in index.text_fields
+    ]
+    mask = _keyword_mask(index, filter_dict)
+
+    results = []
+    for start in range(0, len(queries), QUERY_BLOCK):
+        block = queries[start:start + QUERY_BLOCK]
+
+        scores = np.zeros((len(block), num_docs))
+        for field, matrix_t, boost in fields:
+            query_vecs = normalize(index.vectorizers[field].transform(block))
+            scores += safe_sparse_dot(query_vecs, matrix_t, dense_output=True) * boost
+
+        if mask is not None:
+            scores *= mask
+
+        for top_indices in top_k(scores, num_results):
+            if output_ids:
+                results.append([{**index.docs[i], '_id': int(i)} for i in top_indices])
+            else:
+                results.append([index.docs[i] for i in top_indices])
+
+    return results
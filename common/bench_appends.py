@@ -0,0 +1,67 @@
+"""
+Cost of adding many chunks to an AppendableIndex vs a BufferedAppendableIndex
+
+Adds synthetic web page chunks to an index that already holds documents,
+one append() at a time and with one extend(), and compares both with
+fitting all documents at once.
+
+Usage:
+    python -m common.bench_appends
+"""
+import random
+import time
+
+from minsearch import AppendableIndex
+
+from common.buffered_index import BufferedAppendableIndex
+
+
+SIZES = [1_000, 5_000, 20_000]
+WORDS_PER_CHUNK = 300
+
+
+def timed(func) -> float:
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def main():
+    rng = random.Random(1)
+    vocabulary = ["".join(rng.choices("abcdefghij", k=5)) for _ in range(5_000)]
+
+    print(f"{'chunks':>7} {'append s':>9} {'buffered append s':>18} {'extend s':>9} {'fit s':>7}")
+
+    for num_chunks in SIZES:
+        docs = [
+            {"title": "page", "content": " ".join(rng.choices(vocabulary, k=WORDS_PER_CHUNK))}
+            for _ in range(num_chunks)
+        ]
+        seed_docs, new_docs = docs[:100], docs[100:]
+        fields = ["title", "content"]
+
+        def append_plain():
+            index = AppendableIndex(text_fields=fields).fit(list(seed_docs))
+            for doc in new_docs:
+                index.append(doc)
+
+        def append_buffered():
+            index = BufferedAppendableIndex(text_fields=fields).fit(list(seed_docs))
+            for doc in new_docs:
+                index.append(doc)
+            index.flush()
+
+        def extend_buffered():
+            BufferedAppendableIndex(text_fields=fields).fit(list(seed_docs)).extend(new_docs)
+
+        def fit_buffered():
+            BufferedAppendableIndex(text_fields=fields).fit(list(docs))
+
+        print(
+            f"{num_chunks:>7} {timed(append_plain):>9.2f} {timed(append_buffered):>18.2f}"
+            f" {timed(extend_buffered):>9.2f} {timed(fit_buffered):>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
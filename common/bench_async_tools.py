@@ -0,0 +1,100 @@
+"""
+Wall-clock time of an agent turn with parallel tool calls, sync vs async tools
+
+A pydantic-ai agent with a FunctionModel asks for N fetch_web_page calls
+in one response, then answers. The tool GETs a page from a local server
+that takes LATENCY seconds per request. The sync tool uses
+http_client.get() and runs on pydantic-ai's worker threads, the async
+tool awaits http_client.aget() on the event loop.
+
+Usage:
+    python -m common.bench_async_tools
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from common import http_client
+
+
+LATENCY = 0.2
+PARALLEL_CALLS = [1, 4, 16, 64, 256]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        body = b"Title: Page\n\n# Page\n\nSome content."
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    # the default backlog of 5 drops connections of a burst of parallel calls
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def parallel_calls(num_calls: int, url: str) -> FunctionModel:
+    """
+    A model that requests num_calls tool calls at once, then answers.
+    """
+    def model(messages, info: AgentInfo) -> ModelResponse:
+        if len(messages) == 1:
+            return ModelResponse(parts=[
+                ToolCallPart("fetch_web_page", {"url": f"{url}/page/{i}"}, tool_call_id=str(i))
+                for i in range(num_calls)
+            ])
+        return ModelResponse(parts=[TextPart("done")])
+
+    return FunctionModel(model)
+
+
+def fetch_web_page_sync(url: str) -> str:
+    return http_client.get(url).text
+
+
+async def fetch_web_page_async(url: str) -> str:
+    return (await http_client.aget(url)).text
+
+
+def timed_turn(tool, num_calls: int, url: str) -> float:
+    agent = Agent(parallel_calls(num_calls, url))
+    agent.tool_plain(name="fetch_web_page")(tool)
+
+    t0 = time.perf_counter()
+    result = agent.run_sync("fetch the pages")
+    assert result.output == "done"
+    return time.perf_counter() - t0
+
+
+def main():
+    server = _Server(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"backend latency {LATENCY * 1000:.0f} ms per request\n")
+    print(f"{'tool calls':>10} {'sync tools s':>13} {'async tools s':>14} {'speedup':>8}")
+    for num_calls in PARALLEL_CALLS:
+        sync_s = timed_turn(fetch_web_page_sync, num_calls, url)
+        async_s = timed_turn(fetch_web_page_async, num_calls, url)
+        print(f"{num_calls:>10} {sync_s:>13.3f} {async_s:>14.3f} {sync_s / async_s:>7.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
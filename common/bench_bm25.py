@@ -0,0 +1,79 @@
+"""
+Query latency of minsearch Index and BM25Index vs corpus size
+
+The vocabulary grows with the corpus, so every query term appears in about
+the same number of documents at every size. A search that only reads the
+postings of the query terms keeps the same latency as the corpus grows.
+AppendableIndex is left out: it re-tokenizes every matching document on
+each search and takes about a second per query already at 2000 documents.
+
+Usage:
+    python -m common.bench_bm25
+"""
+import random
+import time
+
+from minsearch import Index
+
+from common.bm25 import BM25Index
+
+
+SIZES = [2_000, 10_000, 50_000]
+WORDS_PER_DOC = 50
+DOCS_PER_WORD = 20
+NUM_QUERIES = 50
+
+
+def to_word(i: int) -> str:
+    # letters only, the minsearch tokenizer splits words on digits
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    word = ""
+    while True:
+        i, rest = divmod(i, len(letters))
+        word += letters[rest]
+        if i == 0:
+            return word + "q"
+
+
+def make_docs(rng: random.Random, num_docs: int) -> tuple[list, list]:
+    vocabulary = [to_word(i) for i in range(num_docs * WORDS_PER_DOC // DOCS_PER_WORD)]
+    docs = [
+        {
+            "question": " ".join(rng.choices(vocabulary, k=10)),
+            "text": " ".join(rng.choices(vocabulary, k=WORDS_PER_DOC)),
+            "course": f"course-{rng.randrange(5)}",
+        }
+        for _ in range(num_docs)
+    ]
+    queries = [" ".join(rng.choices(vocabulary, k=4)) for _ in range(NUM_QUERIES)]
+    return docs, queries
+
+
+def time_queries(index, queries) -> float:
+    t0 = time.perf_counter()
+    for query in queries:
+        index.search(query, filter_dict={"course": "course-0"}, boost_dict={"question": 3.0}, num_results=5)
+    return (time.perf_counter() - t0) / len(queries) * 1000
+
+
+def main():
+    rng = random.Random(1)
+    fields = {"text_fields": ["question", "text"], "keyword_fields": ["course"]}
+
+    print(f"{'docs':>7} {'Index ms':>9} {'BM25Index ms':>13} {'BM25 fit s':>11}")
+
+    for num_docs in SIZES:
+        docs, queries = make_docs(rng, num_docs)
+
+        tfidf_ms = time_queries(Index(**fields).fit(docs), queries)
+
+        t0 = time.perf_counter()
+        bm25 = BM25Index(**fields).fit(docs)
+        fit_s = time.perf_counter() - t0
+        bm25_ms = time_queries(bm25, queries)
+
+        print(f"{num_docs:>7} {tfidf_ms:>9.2f} {bm25_ms:>13.2f} {fit_s:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
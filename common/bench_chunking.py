@@ -0,0 +1,81 @@
+"""
+Memory of sliding_window() dicts vs Chunk views, and sliding vs boundary-aware chunks
+
+Chunks a synthetic document with the window sizes used in the projects and
+measures, with tracemalloc, the memory held by the list of chunks. Then
+compares the number of chunks, the index fit time and the search time of
+plain sliding windows and iter_boundary_chunks().
+
+Usage:
+    python -m common.bench_chunking
+"""
+import random
+import time
+import tracemalloc
+
+from minsearch import Index
+
+from common.chunking import chunk_views, iter_boundary_chunks, iter_chunks, sliding_window
+
+
+WINDOWS = [
+    ("week1 transcripts", 30, 15),
+    ("week2 web pages", 3000, 1000),
+    ("capstone papers", 5000, 1000),
+]
+
+
+def traced_mb(func, *args) -> tuple[float, int]:
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, len(result)
+
+
+def main():
+    rng = random.Random(1)
+    words = "the model learns from data and the agent searches the index".split()
+    text = " ".join(rng.choices(words, k=100_000))
+    data = text.encode("utf-8")
+
+    print(f"document: {len(text) / 2**20:.1f} MB of text")
+    print(f"{'window':>18} {'size':>5} {'step':>5} {'chunks':>8} {'dicts MB':>9} {'views MB':>9} {'bytes views MB':>15}")
+
+    for name, size, step in WINDOWS:
+        dicts_mb, num_chunks = traced_mb(sliding_window, text, size, step)
+        views_mb, _ = traced_mb(chunk_views, text, size, step)
+        bytes_mb, _ = traced_mb(chunk_views, data, size, step)
+        print(f"{name:>18} {size:>5} {step:>5} {num_chunks:>8} {dicts_mb:>9.1f} {views_mb:>9.1f} {bytes_mb:>15.1f}")
+
+    sentences = [" ".join(rng.choices(words, k=rng.randint(5, 25))) + "." for _ in range(20_000)]
+    text = " ".join(sentences)
+    queries = ["agent searches the index", "model learns from data"] * 25
+
+    print()
+    print(f"{'chunker':>28} {'chunks':>8} {'avg len':>8} {'fit s':>7} {'search ms':>10}")
+
+    chunkers = [
+        ("sliding 30/15 chars", iter_chunks(text, 30, 15)),
+        ("boundary 30/15 chars", iter_boundary_chunks(text, 30, 15)),
+        ("sliding 512/256 chars", iter_chunks(text, 512, 256)),
+        ("boundary 128/64 tokens", iter_boundary_chunks(text, 128, 64, unit="tokens")),
+    ]
+    for name, chunks in chunkers:
+        docs = [{'content': chunk.content} for chunk in chunks]
+
+        t0 = time.perf_counter()
+        index = Index(text_fields=["content"]).fit(docs)
+        fit = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for query in queries:
+            index.search(query, num_results=5)
+        search = (time.perf_counter() - t0) / len(queries)
+
+        avg_len = sum(len(doc['content']) for doc in docs) / len(docs)
+        print(f"{name:>28} {len(docs):>8} {avg_len:>8.0f} {fit:>7.2f} {search * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Search latency of AppendableIndex vs FilteredAppendableIndex with a course filter
+
+Builds FAQ-like indexes with a growing number of courses and documents and
+times the search SearchTools.search() runs: one course filter, a boost
+dict and the top 5 results.
+
+Usage:
+    python -m common.bench_filtered_search
+"""
+import random
+import time
+
+from minsearch import AppendableIndex
+
+from common.filtered_index import FilteredAppendableIndex
+
+
+SIZES = [(3, 1_000), (3, 10_000), (10, 10_000), (30, 10_000), (30, 30_000)]
+NUM_QUERIES = 20
+
+
+def make_docs(rng: random.Random, vocabulary: list[str], num_courses: int, num_docs: int):
+    return [
+        {
+            "question": " ".join(rng.choices(vocabulary, k=10)),
+            "text": " ".join(rng.choices(vocabulary, k=60)),
+            "section": " ".join(rng.choices(vocabulary, k=3)),
+            "course": f"course-{rng.randrange(num_courses)}",
+        }
+        for _ in range(num_docs)
+    ]
+
+
+def time_search(index, queries) -> float:
+    t0 = time.perf_counter()
+    for query in queries:
+        index.search(
+            query,
+            filter_dict={"course": "course-0"},
+            boost_dict={"question": 3.0, "section": 0.5},
+            num_results=5,
+            output_ids=True,
+        )
+    return (time.perf_counter() - t0) / len(queries) * 1000
+
+
+def main():
+    rng = random.Random(1)
+    vocabulary = ["".join(rng.choices("abcdefghij", k=4)) for _ in range(2_000)]
+    queries = [" ".join(rng.choices(vocabulary, k=5)) for _ in range(NUM_QUERIES)]
+
+    print(f"{'courses':>8} {'docs':>7} {'full ms':>8} {'filtered ms':>12} {'speedup':>8}")
+
+    for num_courses, num_docs in SIZES:
+        docs = make_docs(rng, vocabulary, num_courses, num_docs)
+        fields = {"text_fields": ["question", "text", "section"], "keyword_fields": ["course"]}
+
+        full_ms = time_search(AppendableIndex(**fields).fit(docs), queries)
+        filtered_ms = time_search(FilteredAppendableIndex(**fields).fit(docs), queries)
+
+        print(f"{num_courses:>8} {num_docs:>7} {full_ms:>8.1f} {filtered_ms:>12.1f} {full_ms / filtered_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
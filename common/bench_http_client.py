@@ -0,0 +1,81 @@
+"""
+Latency of requests.get() vs the shared keep-alive session of common.http_client
+
+Serves a small JSON response from a local HTTP/1.1 server and times
+sequential GETs, opening a new connection per request with requests.get()
+and reusing pooled connections with http_client.get(). Then counts how a
+burst of 503 answers is absorbed by the retries.
+
+Usage:
+    python -m common.bench_http_client
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from common import http_client
+
+
+NUM_REQUESTS = 500
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, Nagle would delay the body
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests += 1
+        self.server.connections.add(self.client_address)
+
+        if self.path.startswith("/flaky") and self.server.failures > 0:
+            self.server.failures -= 1
+            status, body = 503, b"unavailable"
+        else:
+            status, body = 200, json.dumps({"query": {"search": []}}).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def timed(get, url: str) -> float:
+    t0 = time.perf_counter()
+    for _ in range(NUM_REQUESTS):
+        get(url).raise_for_status()
+    return (time.perf_counter() - t0) / NUM_REQUESTS * 1000
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = 0
+    server.connections = set()
+    server.failures = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{'client':>22} {'ms/request':>11} {'connections':>12}")
+    for name, get in [("requests.get", requests.get), ("http_client.get", http_client.get)]:
+        server.connections.clear()
+        ms = timed(get, url + "/w/api.php")
+        print(f"{name:>22} {ms:>11.3f} {len(server.connections):>12}")
+
+    server.failures = 2
+    server.requests = 0
+    t0 = time.perf_counter()
+    status = http_client.get(url + "/flaky").status_code
+    print(f"\n2 x 503 then 200: status {status} after {server.requests} requests in {time.perf_counter() - t0:.2f} s")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Parse time of Jina Reader output, the old parse_data vs ReaderPage
+
+Builds synthetic Reader pages with a header of HEADER_LINES metadata
+lines and a growing number of Markdown sections, then times the old
+week2 AgentTools.parse_data, ReaderPage.to_dict() and the time until
+ReaderPage yields its first section, which is when chunking can start.
+
+Usage:
+    python -m common.bench_reader_parser
+"""
+import random
+import re
+import time
+
+from common.reader_parser import ReaderPage
+
+
+HEADER_LINES = 8
+PAGE_SECTIONS = [100, 1_000, 10_000]
+
+
+def parse_data_old(raw_data):
+    """
+    week2 AgentTools.parse_data before ReaderPage, content is joined and
+    searched once per metadata line.
+    """
+    lines = raw_data.splitlines()
+
+    metadata = {
+        "title": None,
+        "url_source": "",
+        "published_time": None,
+        "markdown_content": None
+    }
+
+    meta_lines = []
+    content_start = 0
+
+    for i, line in enumerate(lines):
+        if re.match(r"^[A-Z][\w\s-]*:\s", line):
+            meta_lines.append(line)
+        elif not line.strip():
+            continue
+        else:
+            content_start = i
+            break
+
+    for line in meta_lines:
+        key, value = line.split(":", 1)
+        key = key.lower().strip().replace(" ", "_")
+        if key in metadata:
+            metadata[key] = value.strip()
+
+        content = "\n".join(lines[content_start:]).strip()
+
+        if not metadata["title"]:
+            match = re.search(r"^#\s*(.+)", content)
+            if match:
+                metadata["title"] = match.group(1).strip()
+
+        metadata["markdown_content"] = content
+
+    return metadata
+
+
+def make_page(num_sections: int, rng: random.Random) -> str:
+    words = "the capybara is a large rodent that lives near rivers and lakes in south america".split()
+    header = ["Title: Capybara", "URL Source: https://en.wikipedia.org/wiki/Capybara", "Published Time: 2025-09-30"]
+    header += [f"Warning {i}: cached snapshot" for i in range(HEADER_LINES - len(header))]
+
+    lines = [line for h in header for line in (h, "")]
+    lines.append("Markdown Content:")
+    for i in range(num_sections):
+        lines.append(f"## Section {i}")
+        lines += [" ".join(rng.choices(words, k=20)) for _ in range(5)]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def timed(func, *args) -> float:
+    t0 = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - t0) * 1000
+
+
+def first_section(raw_data: str):
+    return next(ReaderPage(raw_data.splitlines()).sections())
+
+
+def main():
+    rng = random.Random(1)
+
+    print(f"{HEADER_LINES} header lines")
+    print(f"{'sections':>9} {'MB':>6} {'old ms':>9} {'ReaderPage ms':>14} {'speedup':>8} {'first section ms':>17}")
+    for num_sections in PAGE_SECTIONS:
+        raw_data = make_page(num_sections, rng)
+        assert parse_data_old(raw_data)["title"] == ReaderPage(raw_data.splitlines()).metadata["title"]
+
+        old_ms = timed(parse_data_old, raw_data)
+        new_ms = timed(lambda: ReaderPage(raw_data.splitlines()).to_dict())
+        first_ms = timed(first_section, raw_data)
+        print(f"{num_sections:>9} {len(raw_data) / 2**20:>6.1f} {old_ms:>9.2f} {new_ms:>14.2f} "
+              f"{old_ms / new_ms:>7.1f}x {first_ms:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
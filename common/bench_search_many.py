@@ -0,0 +1,65 @@
+"""
+Queries per second of Index.search() in a loop vs search_many()
+
+Fits a minsearch Index on synthetic FAQ-like documents and runs an
+evaluation set of questions one by one and as one batch.
+
+Usage:
+    python -m common.bench_search_many
+"""
+import random
+import time
+
+from minsearch import Index
+
+from common.batch_search import search_many
+
+
+NUM_DOCS = [1_000, 10_000, 50_000]
+NUM_QUERIES = 2_000
+
+
+def make_vocabulary(rng: random.Random, size: int = 5_000) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choices(letters, k=rng.randint(3, 9))) for _ in range(size)]
+
+
+def main():
+    rng = random.Random(1)
+    vocabulary = make_vocabulary(rng)
+    queries = [" ".join(rng.choices(vocabulary, k=rng.randint(3, 8))) for _ in range(NUM_QUERIES)]
+
+    print(f"{'docs':>7} {'queries':>8} {'loop q/s':>9} {'batch q/s':>10} {'speedup':>8}")
+
+    for num_docs in NUM_DOCS:
+        docs = [
+            {
+                "question": " ".join(rng.choices(vocabulary, k=10)),
+                "text": " ".join(rng.choices(vocabulary, k=80)),
+                "course": rng.choice(["data-engineering-zoomcamp", "machine-learning-zoomcamp", "mlops-zoomcamp"]),
+            }
+            for _ in range(num_docs)
+        ]
+        index = Index(text_fields=["question", "text"], keyword_fields=["course"]).fit(docs)
+        kwargs = {
+            "filter_dict": {"course": "data-engineering-zoomcamp"},
+            "boost_dict": {"question": 3.0},
+            "num_results": 5,
+        }
+
+        # the loop is timed on a sample, it is too slow for the full set
+        sample = queries[:200]
+        t0 = time.perf_counter()
+        for query in sample:
+            index.search(query, **kwargs)
+        loop_qps = len(sample) / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        search_many(index, queries, **kwargs)
+        batch_qps = len(queries) / (time.perf_counter() - t0)
+
+        print(f"{num_docs:>7} {len(queries):>8} {loop_qps:>9.0f} {batch_qps:>10.0f} {batch_qps / loop_qps:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
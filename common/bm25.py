@@ -0,0 +1,209 @@
+import math
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from minsearch.append import Tokenizer
+
+from common.batch_search import top_k
+
+
+# term frequencies are stored as unsigned 16 bit integers
+MAX_TF = 2**16 - 1
+
+
+class Postings:
+    """
+    Postings list of one term: doc ids and term frequencies in two arrays.
+
+    Doc ids are 4 byte and term frequencies 2 byte integers, instead of a
+    Python int object per entry. Documents are added in id order, so the
+    ids stay sorted.
+    """
+
+    __slots__ = ("doc_ids", "tfs")
+
+    def __init__(self):
+        self.doc_ids = array("I")
+        self.tfs = array("H")
+
+    def add(self, doc_id: int, tf: int) -> None:
+        self.doc_ids.append(doc_id)
+        self.tfs.append(min(tf, MAX_TF))
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+
+class BM25Index:
+    """
+    In-process BM25 search index with the interface of minsearch.Index.
+
+    Every text field has its own inverted index of array-backed postings
+    lists and its own document lengths. A search only reads the postings of
+    the query terms, so its cost depends on how many documents contain
+    them, not on the size of the corpus. Field boosts multiply the BM25
+    score of each field, keyword filters keep the documents whose values
+    match exactly, as in minsearch.
+
+    Attributes:
+        text_fields (list): Text field names to index.
+        keyword_fields (list): Keyword field names to filter on.
+        k1 (float): Term frequency saturation.
+        b (float): Document length normalization.
+        docs (list): Documents in the index.
+        postings (dict): For every text field, the Postings of each term.
+    """
+
+    def __init__(self, text_fields, keyword_fields=None, stop_words=None, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            text_fields (list): Text field names to index.
+            keyword_fields (list, optional): Keyword field names to filter on.
+            stop_words (set or None): Stop words to remove. If None, uses the
+                                      English stop words of minsearch.
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalization.
+        """
+        self.text_fields = text_fields
+        self.keyword_fields = keyword_fields if keyword_fields is not None else []
+        self.k1 = k1
+        self.b = b
+        self.tokenizer = Tokenizer(stop_words=stop_words)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.docs = []
+        self.postings = {field: {} for field in self.text_fields}
+        self.doc_lengths = {field: array("I") for field in self.text_fields}
+        self.total_lengths = {field: 0 for field in self.text_fields}
+
+        # keyword values are stored as one integer code per document
+        self.keyword_codes = {field: array("i") for field in self.keyword_fields}
+        self.keyword_values = {field: {} for field in self.keyword_fields}
+
+    def fit(self, docs: Iterable[Dict[str, Any]]) -> "BM25Index":
+        """
+        Fits the index with the provided documents, replacing any indexed ones.
+        """
+        self._reset()
+        return self.extend(docs)
+
+    def append(self, doc: Dict[str, Any]) -> "BM25Index":
+        """
+        Appends a single document to the index.
+        """
+        doc_id = len(self.docs)
+        self.docs.append(doc)
+
+        for field in self.text_fields:
+            tokens = self.tokenizer.tokenize(doc.get(field) or "")
+            postings = self.postings[field]
+
+            for token, tf in Counter(tokens).items():
+                if token not in postings:
+                    postings[token] = Postings()
+                postings[token].add(doc_id, tf)
+
+            self.doc_lengths[field].append(len(tokens))
+            self.total_lengths[field] += len(tokens)
+
+        for field in self.keyword_fields:
+            values = self.keyword_values[field]
+            value = doc.get(field)
+            if value not in values:
+                values[value] = len(values)
+            self.keyword_codes[field].append(values[value])
+
+        return self
+
+    def extend(self, docs: Iterable[Dict[str, Any]]) -> "BM25Index":
+        """
+        Appends many documents to the index.
+        """
+        for doc in docs:
+            self.append(doc)
+        return self
+
+    def _field_scores(self, field: str, query_terms: Counter) -> tuple[np.ndarray, np.ndarray]:
+        num_docs = len(self.docs)
+        avg_length = self.total_lengths[field] / num_docs or 1
+        doc_lengths = np.frombuffer(self.doc_lengths[field], dtype=np.uint32)
+
+        all_ids = []
+        all_scores = []
+        for term, count in query_terms.items():
+            postings = self.postings[field].get(term)
+            if postings is None:
+                continue
+
+            df = len(postings)
+            idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+
+            ids = np.frombuffer(postings.doc_ids, dtype=np.uint32)
+            tfs = np.frombuffer(postings.tfs, dtype=np.uint16).astype(np.float64)
+            norm = self.k1 * (1 - self.b + self.b * doc_lengths[ids] / avg_length)
+
+            all_ids.append(ids)
+            all_scores.append(count * idf * tfs * (self.k1 + 1) / (tfs + norm))
+
+        if not all_ids:
+            return np.empty(0, dtype=np.uint32), np.empty(0)
+        return np.concatenate(all_ids), np.concatenate(all_scores)
+
+    def search(
+            self,
+            query: str,
+            filter_dict: Optional[Dict[str, Any]] = None,
+            boost_dict: Optional[Dict[str, float]] = None,
+            num_results: int = 10,
+            output_ids: bool = False
+        ) -> List[Dict[str, Any]]:
+        """
+        Searches the index with the given query, filters, and boost parameters.
+
+        Args:
+            query (str): The search query string.
+            filter_dict (dict): Keyword fields and the values they must have.
+            boost_dict (dict): Boost scores of the text fields.
+            num_results (int): The number of top results to return.
+            output_ids (bool): If True, adds an '_id' field with the position of the document.
+
+        Returns:
+            list of dict: Matching documents, best first.
+        """
+        filter_dict = filter_dict or {}
+        boost_dict = boost_dict or {}
+
+        query_terms = Counter(self.tokenizer.tokenize(query))
+        if not self.docs or not query_terms:
+            return []
+
+        ids = []
+        scores = []
+        for field in self.text_fields:
+            field_ids, field_scores = self._field_scores(field, query_terms)
+            ids.append(field_ids)
+            scores.append(field_scores * boost_dict.get(field, 1))
+
+        # sum the scores of every candidate over the terms and fields
+        candidates, positions = np.unique(np.concatenate(ids), return_inverse=True)
+        if len(candidates) == 0:
+            return []
+        totals = np.bincount(positions, weights=np.concatenate(scores))
+
+        for field, value in filter_dict.items():
+            if field not in self.keyword_fields:
+                continue
+            code = self.keyword_values[field].get(value)
+            if code is None:
+                return []
+            codes = np.frombuffer(self.keyword_codes[field], dtype=np.int32)
+            totals = totals * (codes[candidates] == code)
+
+        top_indices = candidates[top_k(totals[None, :], num_results)[0]]
+
+        if output_ids:
+            return [{**self.docs[i], '_id': int(i)} for i in top_indices]
+        return [self.docs[i] for i in top_indices]
@@ -0,0 +1,121 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable
+
+from minsearch import AppendableIndex
+
+
+class BufferedAppendableIndex(AppendableIndex):
+    """
+    AppendableIndex with a write buffer for its postings.
+
+    AppendableIndex.append() recounts the documents of every token's
+    postings list for each token it adds, so appending or fitting many
+    documents gets slower with every document. Here, append() only
+    tokenizes the document and collects its postings in a buffer. The
+    buffer is merged into the inverted index as one segment when it holds
+    buffer_size documents, or before the next search, and the document
+    frequencies are updated once per token of the segment.
+
+    Documents and keyword values are stored right away, so document ids
+    and filters behave as in AppendableIndex.
+    """
+
+    def __init__(self, text_fields, keyword_fields=None, stop_words=None, buffer_size: int = 1000):
+        """
+        Args:
+            text_fields (list): Text field names to index.
+            keyword_fields (list, optional): Keyword field names to index.
+            stop_words (set or None): Stop words, as in AppendableIndex.
+            buffer_size (int): Number of buffered documents that triggers a merge.
+        """
+        super().__init__(text_fields, keyword_fields, stop_words)
+        self.buffer_size = buffer_size
+        self._reset_buffer()
+
+    def _reset_buffer(self) -> None:
+        self._buffer = {field: defaultdict(list) for field in self.text_fields}
+        self._buffered_docs = 0
+
+    def fit(self, docs):
+        """
+        Fits the index with the provided documents, replacing any indexed ones.
+        """
+        self.inverted_index = {field: defaultdict(list) for field in self.text_fields}
+        self.doc_frequencies = {field: defaultdict(int) for field in self.text_fields}
+        self.vocabularies = {field: set() for field in self.text_fields}
+        self.keyword_data = {field: [] for field in self.keyword_fields}
+        self._reset_buffer()
+
+        self.docs = docs
+        self.total_docs = 0
+        for doc_id, doc in enumerate(docs):
+            self._add(doc_id, doc)
+        self.flush()
+
+        if self.docs:
+            has_vocabulary = any(len(vocab) > 0 for vocab in self.vocabularies.values())
+            if not has_vocabulary:
+                raise ValueError(
+                    "empty vocabulary; perhaps the documents only contain stop words"
+                )
+
+        return self
+
+    def append(self, doc):
+        doc_id = len(self.docs)
+        self.docs.append(doc)
+        self._add(doc_id, doc)
+
+        if self._buffered_docs >= self.buffer_size:
+            self.flush()
+
+        return self
+
+    def extend(self, docs: Iterable[Dict[str, Any]]):
+        """
+        Appends many documents and merges them into the index at once.
+
+        Args:
+            docs: Documents to append.
+        """
+        for doc in docs:
+            self.append(doc)
+        self.flush()
+
+        return self
+
+    def _add(self, doc_id: int, doc: Dict[str, Any]) -> None:
+        for field in self.text_fields:
+            buffer = self._buffer[field]
+            for token in self._process_text(doc.get(field, "")):
+                buffer[token].append(doc_id)
+
+        for field in self.keyword_fields:
+            self.keyword_data[field].append(doc.get(field))
+
+        self.total_docs += 1
+        self._buffered_docs += 1
+
+    def flush(self) -> None:
+        """
+        Merges the buffered postings into the inverted index.
+        """
+        if not self._buffered_docs:
+            return
+
+        for field, buffer in self._buffer.items():
+            inverted_index = self.inverted_index[field]
+            doc_frequencies = self.doc_frequencies[field]
+
+            for token, doc_ids in buffer.items():
+                inverted_index[token].extend(doc_ids)
+                # the buffered documents are new, so they only add to the count
+                doc_frequencies[token] += len(set(doc_ids))
+
+            self.vocabularies[field].update(buffer)
+
+        self._reset_buffer()
+
+    def search(self, query, filter_dict=None, boost_dict=None, num_results=10, output_ids=False):
+        self.flush()
+        return super().search(query, filter_dict, boost_dict, num_results, output_ids)
@@ -0,0 +1,316 @@
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Sequence
+
+
+class Chunk:
+    """
+    A window over a sequence, stored as (source, start, end) instead of a copy.
+
+    The text of the window is only materialized when `content` is accessed.
+    For bytes-like sources it is a zero-copy memoryview.
+    """
+
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source: Sequence[Any], start: int, end: int):
+        self.source = source
+        self.start = start
+        self.end = end
+
+    @property
+    def content(self) -> Any:
+        """
+        The chunk content: a slice of the source, or a memoryview for bytes input.
+        """
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            return memoryview(self.source)[self.start:self.end]
+        return self.source[self.start:self.end]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Materialize the chunk in the {'start': ..., 'content': ...} format
+        returned by sliding_window().
+        """
+        return {'start': self.start, 'content': self.content}
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return f"Chunk(start={self.start}, end={self.end})"
+
+
+def iter_chunks(seq: Sequence[Any], size: int, step: int) -> Iterator[Chunk]:
+    """
+    Lazily create overlapping chunks from a sequence using a sliding window.
+
+    Args:
+        seq: The input sequence (string, bytes or list) to be chunked.
+        size (int): The size of each chunk/window.
+        step (int): The step size between consecutive windows.
+
+    Yields:
+        Chunk: A view on the window, nothing is copied from the sequence.
+
+    Raises:
+        ValueError: If size or step are not positive integers.
+
+    Example:
+        >>> [(c.start, c.content) for c in iter_chunks("hello world", size=5, step=3)]
+        [(0, 'hello'), (3, 'lo wo'), (6, 'world'), (9, 'ld')]
+    """
+    if size <= 0 or step <= 0:
+        raise ValueError("size and step must be positive")
+
+    n = len(seq)
+    for i in range(0, n, step):
+        yield Chunk(seq, i, min(i + size, n))
+        if i + size > n:
+            break
+
+
+# a word, and whether it ends a sentence: punctuation, optionally followed by
+# closing quotes or brackets, or a blank line after it
+_WORD = re.compile(r"\S+")
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*$")
+
+# rough number of characters per token of an English BPE tokenizer
+CHARS_PER_TOKEN = 4
+
+
+class BoundaryIndex:
+    """
+    Word and sentence boundaries of a text, computed once in a single pass.
+
+    Attributes:
+        text: The indexed text.
+        word_starts: Offset where each word starts.
+        word_ends: Offset right after each word.
+        last_sentence_end: For each word, the index of the closest word at or
+            before it that ends a sentence, or -1.
+        token_counts: Prefix sums of the approximate token count, i.e.
+            token_counts[k] is the number of tokens in the first k words.
+    """
+
+    __slots__ = ("text", "word_starts", "word_ends", "last_sentence_end", "token_counts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.word_starts = []
+        self.word_ends = []
+        self.last_sentence_end = []
+        self.token_counts = [0]
+
+        last_sentence_end = -1
+        for k, match in enumerate(_WORD.finditer(text)):
+            start, end = match.span()
+
+            # a blank line before this word ends the previous sentence
+            if k > 0 and text.count("\n", self.word_ends[-1], start) > 1:
+                last_sentence_end = k - 1
+                self.last_sentence_end[-1] = last_sentence_end
+
+            if _SENTENCE_END.search(match.group()):
+                last_sentence_end = k
+
+            self.word_starts.append(start)
+            self.word_ends.append(end)
+            self.last_sentence_end.append(last_sentence_end)
+            self.token_counts.append(
+                self.token_counts[-1] + max(1, -(-(end - start) // CHARS_PER_TOKEN))
+            )
+
+    def __len__(self) -> int:
+        return len(self.word_starts)
+
+    def approx_tokens(self, start_word: int, end_word: int) -> int:
+        """
+        Approximate number of tokens of the words [start_word, end_word).
+        """
+        return self.token_counts[end_word] - self.token_counts[start_word]
+
+
+def iter_boundary_chunks(
+        text: str,
+        size: int,
+        step: int,
+        unit: str = "chars",
+        boundaries: BoundaryIndex | None = None
+    ) -> Iterator[Chunk]:
+    """
+    Create overlapping chunks that never split a word and prefer to end on a sentence.
+
+    Every window is as long as possible within `size` and ends on a word
+    boundary. If the last sentence end of the window keeps at least half of
+    the budget, the window is cut there instead. The next window starts at
+    the first word `step` after the start of the previous one. Unlike
+    sliding_window, no tiny windows are produced at the end of the text.
+
+    With unit="tokens", size and step are measured in approximate tokens
+    (about CHARS_PER_TOKEN characters per token, at least one per word),
+    which needs no tokenizer.
+
+    Args:
+        text: The text to be chunked.
+        size (int): The maximum size of each chunk, in characters or tokens.
+        step (int): The step size between the starts of consecutive chunks.
+        unit (str): "chars" or "tokens".
+        boundaries: Optional precomputed BoundaryIndex of the text.
+
+    Yields:
+        Chunk: A view on the window. A single word longer than size becomes
+        a chunk of its own.
+
+    Raises:
+        ValueError: If size or step are not positive, or the unit is unknown.
+
+    Example:
+        >>> text = "One two. Three four five. Six."
+        >>> [c.content for c in iter_boundary_chunks(text, size=20, step=10)]
+        ['One two. Three four', 'four five. Six.']
+    """
+    if size <= 0 or step <= 0:
+        raise ValueError("size and step must be positive")
+    if unit not in ("chars", "tokens"):
+        raise ValueError(f"unknown unit: {unit}")
+
+    if boundaries is None:
+        boundaries = BoundaryIndex(text)
+
+    starts = boundaries.word_starts
+    ends = boundaries.word_ends
+    num_words = len(boundaries)
+
+    # positions of the words in the chosen unit
+    if unit == "chars":
+        def window_end(first: int) -> int:
+            return bisect_right(ends, starts[first] + size)
+
+        def next_start(first: int) -> int:
+            return bisect_left(starts, starts[first] + step)
+
+        def length(first: int, last: int) -> int:
+            return ends[last] - starts[first]
+    else:
+        tokens = boundaries.token_counts
+
+        def window_end(first: int) -> int:
+            return bisect_right(tokens, tokens[first] + size) - 1
+
+        def next_start(first: int) -> int:
+            return bisect_left(tokens, tokens[first] + step)
+
+        def length(first: int, last: int) -> int:
+            return boundaries.approx_tokens(first, last + 1)
+
+    first = 0
+    while first < num_words:
+        # words [first, end) fit into the window, at least one word is taken
+        end = max(window_end(first), first + 1)
+
+        sentence_end = boundaries.last_sentence_end[end - 1]
+        if end < num_words and sentence_end >= first and length(first, sentence_end) * 2 >= size:
+            end = sentence_end + 1
+
+        yield Chunk(text, starts[first], ends[end - 1])
+
+        if end >= num_words:
+            break
+
+        first = max(next_start(first), first + 1)
+
+
+def chunk_views(seq: Sequence[Any], size: int, step: int) -> List[Chunk]:
+    """
+    Same as iter_chunks(), returned as a list.
+    """
+    return list(iter_chunks(seq, size, step))
+
+
+def sliding_window(
+        seq: Sequence[Any],
+        size: int,
+        step: int
+    ) -> List[Dict[str, Any]]:
+    """
+    Create overlapping chunks from a sequence using a sliding window approach.
+
+    Every chunk is materialized. Use iter_chunks() to get lightweight views
+    and only copy the text that is actually needed.
+
+    Args:
+        seq: The input sequence (string or list) to be chunked.
+        size (int): The size of each chunk/window.
+        step (int): The step size between consecutive windows.
+
+    Returns:
+        list: A list of dictionaries, each containing:
+            - 'start': The starting position of the chunk in the original sequence
+            - 'content': The chunk content
+
+    Raises:
+        ValueError: If size or step are not positive integers.
+
+    Example:
+        >>> sliding_window("hello world", size=5, step=3)
+        [{'start': 0, 'content': 'hello'}, {'start': 3, 'content': 'lo wo'}, {'start': 6, 'content': 'world'}, {'start': 9, 'content': 'ld'}]
+    """
+    return [
+        {'start': chunk.start, 'content': seq[chunk.start:chunk.end]}
+        for chunk in iter_chunks(seq, size, step)
+    ]
+
+
+class DocumentChunk(Mapping):
+    """
+    A chunk of a document that shares the document's metadata by reference.
+
+    Behaves like the dicts created by chunk_documents(), e.g. chunk['title']
+    or {**chunk}, but the metadata is looked up in the parent document
+    instead of being copied into every chunk, and the content is a lazy
+    view on the document text.
+
+    Keys:
+        - 'start': Starting position of the chunk in the document text
+        - content_field: The chunk content ('content' by default)
+        - 'parent_id': Id of the document the chunk belongs to
+        - All fields of the parent metadata
+    """
+
+    __slots__ = ("view", "parent", "parent_id", "content_field")
+
+    def __init__(self,
+                view: Chunk,
+                parent: Dict[str, Any],
+                parent_id: Any,
+                content_field: str = 'content'
+        ):
+        self.view = view
+        self.parent = parent
+        self.parent_id = parent_id
+        self.content_field = content_field
+
+    def __getitem__(self, key: str) -> Any:
+        if key == self.content_field:
+            return self.view.content
+        if key == 'start':
+            return self.view.start
+        if key == 'parent_id':
+            return self.parent_id
+        return self.parent[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'start'
+        yield self.content_field
+        yield 'parent_id'
+        for key in self.parent:
+            if key not in ('start', self.content_field, 'parent_id'):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"DocumentChunk(parent_id={self.parent_id!r}, start={self.view.start}, end={self.view.end})"
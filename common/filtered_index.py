@@ -0,0 +1,106 @@
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+import numpy as np
+
+from common.batch_search import top_k
+from common.buffered_index import BufferedAppendableIndex
+
+
+class FilteredAppendableIndex(BufferedAppendableIndex):
+    """
+    BufferedAppendableIndex that only scores the documents that pass the filters.
+
+    The row ids of every keyword value are kept up to date on fit() and
+    append(), so a search with a filter_dict looks up its candidate rows
+    instead of scoring every document and masking the scores afterwards.
+    The top results are picked with argpartition. Results are the same as
+    AppendableIndex.search().
+
+    Attributes:
+        keyword_rows (dict): For every keyword field, the row ids of each value.
+    """
+
+    def __init__(self, text_fields, keyword_fields=None, stop_words=None, buffer_size: int = 1000):
+        super().__init__(text_fields, keyword_fields, stop_words, buffer_size)
+        self.keyword_rows = {field: defaultdict(list) for field in self.keyword_fields}
+
+    def fit(self, docs):
+        super().fit(docs)
+
+        self.keyword_rows = {field: defaultdict(list) for field in self.keyword_fields}
+        for field, values in self.keyword_data.items():
+            for doc_id, value in enumerate(values):
+                self.keyword_rows[field][value].append(doc_id)
+
+        return self
+
+    def append(self, doc):
+        doc_id = len(self.docs)
+        super().append(doc)
+
+        for field in self.keyword_fields:
+            self.keyword_rows[field][doc.get(field)].append(doc_id)
+
+        return self
+
+    def candidate_rows(self, filter_dict: Dict[str, Any]) -> Optional[Set[int]]:
+        """
+        Row ids of the documents that match all keyword filters.
+
+        Args:
+            filter_dict: Keyword fields and the values they must have
+
+        Returns:
+            The set of matching row ids, or None if nothing is filtered
+        """
+        candidates = None
+        for field, value in filter_dict.items():
+            if field not in self.keyword_fields:
+                continue
+            rows = self.keyword_rows[field].get(value, [])
+            candidates = set(rows) if candidates is None else candidates.intersection(rows)
+        return candidates
+
+    def search(self, query, filter_dict=None, boost_dict=None, num_results=10, output_ids=False):
+        filter_dict = filter_dict or {}
+        boost_dict = boost_dict or {}
+
+        self.flush()
+        if not self.docs:
+            return []
+
+        query_tokens = self._process_text(query)
+        if not query_tokens:
+            return []
+
+        candidates = self.candidate_rows(filter_dict)
+        if candidates is not None and not candidates:
+            return []
+
+        scores = defaultdict(float)
+        for field in self.text_fields:
+            query_vector, field_tokens = self._create_query_vector(field, query_tokens)
+            if query_vector is None:
+                continue
+
+            matching_docs = self._get_matching_documents(field, field_tokens)
+            if candidates is not None:
+                matching_docs &= candidates
+
+            doc_vectors = self._create_document_vectors(field, field_tokens, matching_docs)
+            boost = boost_dict.get(field, 1)
+            for doc_id, doc_vector in doc_vectors.items():
+                scores[doc_id] += np.dot(query_vector, doc_vector) * boost
+
+        if not scores:
+            return []
+
+        # in row order, so ties are broken like in AppendableIndex.search()
+        doc_ids = np.array(sorted(scores))
+        values = np.array([scores[doc_id] for doc_id in doc_ids])
+        top_indices = doc_ids[top_k(values[None, :], num_results)[0]]
+
+        if output_ids:
+            return [{**self.docs[i], "_id": int(i)} for i in top_indices]
+        return [self.docs[i] for i in top_indices]
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import weakref
+from typing import Any
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# (connect, read) timeout in seconds for requests that do not set one
+DEFAULT_TIMEOUT = (5, 30)
+
+# rate limited or temporarily unavailable, worth another try
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TimeoutSession(requests.Session):
+    """
+    requests.Session that applies a default timeout to every request.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_maxsize: int = 10,
+        timeout=DEFAULT_TIMEOUT
+    ) -> requests.Session:
+    """
+    Create a session with keep-alive connection pools and retries.
+
+    Connections are pooled per host and reused across requests, instead of
+    one TCP and TLS handshake per request as with requests.get(). Idempotent
+    requests that fail to connect or get a 429/5xx answer are retried with
+    exponential backoff, honoring Retry-After. The last response is returned
+    after the retries run out, so raise_for_status() still works as usual.
+
+    Args:
+        retries: Maximum number of retries per request
+        backoff_factor: Backoff between retries is backoff_factor * 2 ** (retry - 1) seconds
+        pool_maxsize: Number of open connections kept per host
+        timeout: Default timeout of a request, (connect, read) in seconds
+
+    Returns:
+        requests.Session: A session for all HTTP calls
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
+
+    session = TimeoutSession(timeout=timeout)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_shared_session = None
+_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    The session shared by all tools of the process, created on first use.
+    """
+    global _shared_session
+    with _lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+    return _shared_session
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """
+    GET a URL with the shared session, same arguments as requests.get().
+    """
+    return get_session().get(url, **kwargs)
+
+
+def _httpx_timeout(timeout) -> httpx.Timeout:
+    # requests style (connect, read) tuples are not understood by httpx
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def create_async_client(pool_maxsize: int = 10, timeout=DEFAULT_TIMEOUT) -> httpx.AsyncClient:
+    """
+    Create an httpx.AsyncClient with keep-alive connections.
+
+    The asyncio counterpart of create_session(): requests awaited in
+    parallel share the pooled connections and do not hold a thread while
+    waiting. Redirects are followed like requests does.
+
+    Args:
+        pool_maxsize: Number of idle connections kept open
+        timeout: Default timeout of a request, (connect, read) in seconds
+
+    Returns:
+        httpx.AsyncClient: A client for the HTTP calls of async tools
+    """
+    return httpx.AsyncClient(
+        timeout=_httpx_timeout(timeout),
+        limits=httpx.Limits(max_keepalive_connections=pool_maxsize),
+        follow_redirects=True,
+    )
+
+
+# an AsyncClient can only be used on the event loop it was created on
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    The async client shared by all tools on the running event loop, created on first use.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = create_async_client()
+    return client
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def aget(url: str, retries: int = 3, backoff_factor: float = 0.5, **kwargs: Any) -> httpx.Response:
+    """
+    GET a URL with the shared async client, same arguments as httpx.AsyncClient.get().
+
+    Failed connections and 429/5xx answers are retried with exponential
+    backoff, honoring Retry-After, like the session of get(). The last
+    response is returned after the retries run out.
+    """
+    if "timeout" in kwargs:
+        kwargs["timeout"] = _httpx_timeout(kwargs["timeout"])
+
+    client = get_async_client()
+    for attempt in range(retries + 1):
+        delay = backoff_factor * 2 ** attempt
+        try:
+            response = await client.get(url, **kwargs)
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+            delay = _retry_after(response) or delay
+            await response.aclose()
+
+        await asyncio.sleep(delay)
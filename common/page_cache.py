@@ -0,0 +1,159 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class PageCache:
+    """
+    URL-keyed cache of fetched pages.
+
+    An in-memory LRU sits in front of an optional on-disk store, so a page
+    read earlier in the session costs no network call and one read in an
+    earlier session only a file read. Pages older than ttl are fetched
+    again. Failed fetches (None) are not cached.
+
+    On disk every page is a gzip file named after the hash of its URL, the
+    modification time of the file is the time the page was fetched.
+
+    Attributes:
+        max_size: Maximum number of pages kept in memory.
+        ttl: Seconds a page stays valid, or None to keep it forever.
+        hits: Number of lookups answered from memory.
+        disk_hits: Number of lookups answered from disk.
+        misses: Number of lookups that had to fetch.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, max_size: int = 256, ttl: Optional[float] = 24 * 3600):
+        """
+        Args:
+            cache_dir: Directory of the on-disk store, None to keep pages in memory only
+            max_size: Maximum number of pages kept in memory
+            ttl: Optional number of seconds a page stays valid
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        # sync tools run on worker threads
+        self._lock = threading.Lock()
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                stored_at, text = entry
+                if self._fresh(stored_at):
+                    self._entries.move_to_end(url)
+                    self.hits += 1
+                    return text
+                del self._entries[url]
+
+        entry = self._read(url)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            self._remember(url, *entry)
+        return entry[1]
+
+    def put(self, url: str, text: str) -> None:
+        stored_at = time.time()
+        if self.cache_dir is not None:
+            self._write(url, text, stored_at)
+
+        with self._lock:
+            self._remember(url, stored_at, text)
+
+    def get_or_fetch(self, url: str, fetch: Callable[[str], Optional[str]]) -> Optional[str]:
+        """
+        The cached page, or the result of fetch(url) stored in the cache.
+        """
+        text = self.get(url)
+        if text is None:
+            text = fetch(url)
+            if text is not None:
+                self.put(url, text)
+        return text
+
+    async def get_or_fetch_async(self, url: str, fetch: Callable[[str], Awaitable[Optional[str]]]) -> Optional[str]:
+        """
+        Async version of get_or_fetch() for an async fetch function.
+        """
+        text = self.get(url)
+        if text is None:
+            text = await fetch(url)
+            if text is not None:
+                self.put(url, text)
+        return text
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Hit-rate metrics of the cache.
+
+        Returns:
+            Dictionary with hits, disk_hits, misses, hit_rate and size
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+    def _fresh(self, stored_at: float) -> bool:
+        return self.ttl is None or time.time() - stored_at < self.ttl
+
+    def _remember(self, url: str, stored_at: float, text: str) -> None:
+        self._entries[url] = (stored_at, text)
+        self._entries.move_to_end(url)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.md.gz"
+
+    def _read(self, url: str) -> Optional[tuple[float, str]]:
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(url)
+        try:
+            stored_at = path.stat().st_mtime
+            if not self._fresh(stored_at):
+                path.unlink(missing_ok=True)
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as f_in:
+                return stored_at, f_in.read()
+        except (OSError, EOFError):
+            return None
+
+    def _write(self, url: str, text: str, stored_at: float) -> None:
+        # write to a temp file first so a crash never leaves a broken page
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f_raw, gzip.GzipFile(fileobj=f_raw, mode="wb") as f_out:
+                f_out.write(text.encode("utf-8"))
+            os.utime(tmp_name, (stored_at, stored_at))
+            os.replace(tmp_name, self._path(url))
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
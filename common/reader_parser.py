@@ -0,0 +1,143 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+# "Title: ...", "URL Source: ...", "Published Time: ..." at the top of the output
+HEADER_LINE = re.compile(r"([A-Z][\w\s-]*):\s(.*)")
+# announces the content in the Jina Reader output, it is not part of the content
+CONTENT_MARKER = "Markdown Content:"
+HEADING = re.compile(r"(#{1,6})\s+(.+)")
+TITLE_HEADING = re.compile(r"#\s*(.+)")
+
+
+@dataclass
+class Section:
+    """
+    A part of the page from one Markdown heading to the next.
+
+    The lines before the first heading form a section with heading None.
+    """
+    heading: Optional[str]
+    level: int
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def content(self) -> str:
+        return "\n".join(self.lines)
+
+
+class ReaderPage:
+    """
+    Single-pass parser of Jina Reader output.
+
+    The header is read when the page is created. The content is only read
+    by sections(), which yields every section as soon as the next heading
+    is reached, so it can be chunked and indexed while the rest of the page
+    is still being read. Lines are read once and the content is joined
+    once, by markdown_content.
+
+    Example:
+        >>> page = ReaderPage(["Title: Capybara", "", "# Capybara", "A rodent.", "## Diet", "Grass."])
+        >>> page.metadata["title"], [s.heading for s in page.sections()]
+        ('Capybara', ['Capybara', 'Diet'])
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        """
+        Args:
+            lines: Lines of the output, e.g. text.splitlines() or an open file
+        """
+        self._lines = iter(lines)
+        self._content_lines: List[str] = []
+        self._consumed = False
+
+        self.metadata: Dict[str, Any] = {
+            "title": None,
+            "url_source": "",
+            "published_time": None,
+        }
+        self._first_line = self._read_header()
+
+        # infer the title from the first Markdown heading if missing
+        if not self.metadata["title"] and self._first_line is not None:
+            match = TITLE_HEADING.match(self._first_line.lstrip())
+            if match:
+                self.metadata["title"] = match.group(1).strip()
+
+    def _read_header(self) -> Optional[str]:
+        """
+        Read the key-value lines at the top and return the first content line.
+        """
+        for line in self._lines:
+            line = line.rstrip("\r\n")
+            if line.rstrip() == CONTENT_MARKER:
+                break
+
+            match = HEADER_LINE.match(line)
+            if match:
+                key = match.group(1).lower().strip().replace(" ", "_")
+                if key in self.metadata:
+                    self.metadata[key] = match.group(2).strip()
+            elif line.strip():
+                return line
+
+        # the content follows the marker, skip blank lines up to it
+        for line in self._lines:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                return line
+        return None
+
+    def _content(self) -> Iterator[str]:
+        if self._first_line is not None:
+            line, self._first_line = self._first_line, None
+            yield line
+        for line in self._lines:
+            yield line.rstrip("\r\n")
+
+    def sections(self) -> Iterator[Section]:
+        """
+        Yield the sections of the content while reading it. Can be iterated only once.
+
+        Headings inside fenced code blocks do not start a section.
+        """
+        if self._consumed:
+            raise RuntimeError("the sections of a ReaderPage can be read only once")
+        self._consumed = True
+
+        section = Section(heading=None, level=0)
+        in_code = False
+
+        for line in self._content():
+            self._content_lines.append(line)
+
+            if line.startswith("```"):
+                in_code = not in_code
+            elif not in_code:
+                match = HEADING.match(line)
+                if match:
+                    if section.lines:
+                        yield section
+                    section = Section(heading=match.group(2).strip(), level=len(match.group(1)))
+
+            section.lines.append(line)
+
+        if section.lines:
+            yield section
+
+    @property
+    def markdown_content(self) -> str:
+        """
+        The whole content, reads the rest of the page if needed. No
+        sections can be read afterwards.
+        """
+        self._consumed = True
+        self._content_lines.extend(self._content())
+        return "\n".join(self._content_lines).strip()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The header metadata and the content, in the format of AgentTools.parse_data().
+        """
+        return {**self.metadata, "markdown_content": self.markdown_content}
@@ -0,0 +1,194 @@
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from common.batch_search import search_many
+
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for use as a cache key.
+
+    minsearch lowercases the query, splits it on non-word characters and
+    scores the terms as a bag of words, so the sorted lowercase words give
+    the same results as the original query.
+
+    Example:
+        >>> normalize_query("  How do I  make money with AI? ")
+        'ai do how i make money with'
+    """
+    return " ".join(sorted(_WORD.findall(query.lower())))
+
+
+class SearchCache:
+    """
+    LRU cache of search results with an optional time to live.
+
+    Attributes:
+        max_size: Maximum number of cached queries.
+        ttl: Seconds a result stays valid, or None to keep it until evicted.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that had to search.
+        invalidations: Number of times the cache was cleared.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Any) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, results = entry
+            if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(results)
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: Any, results: List[Dict[str, Any]]) -> None:
+        self._entries[key] = (time.monotonic(), list(results))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Hit-rate metrics of the cache.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, size and invalidations
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "invalidations": self.invalidations,
+        }
+
+
+class CachedIndex:
+    """
+    Puts a SearchCache in front of a minsearch Index or AppendableIndex.
+
+    search() results are cached by the normalized query, num_results,
+    filter_dict, boost_dict and output_ids. append(), extend() and fit() clear the
+    cache, and the number of indexed documents is part of the key, so
+    documents appended directly to the wrapped index are never missed.
+    All other attributes are forwarded to the wrapped index.
+    """
+
+    def __init__(self, index, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            index: The index to wrap
+            max_size: Maximum number of cached queries
+            ttl: Optional number of seconds a result stays valid
+        """
+        self.index = index
+        self.cache = SearchCache(max_size=max_size, ttl=ttl)
+
+    def search(
+        self,
+        query: str,
+        filter_dict: Optional[Dict] = None,
+        boost_dict: Optional[Dict] = None,
+        num_results: int = 10,
+        output_ids: bool = False,
+    ) -> List[Dict[str, Any]]:
+        key = self._key(query, filter_dict, boost_dict, num_results, output_ids)
+
+        results = self.cache.get(key)
+        if results is None:
+            results = self.index.search(
+                query,
+                filter_dict=filter_dict,
+                boost_dict=boost_dict,
+                num_results=num_results,
+                output_ids=output_ids,
+            )
+            self.cache.put(key, results)
+
+        return results
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        filter_dict: Optional[Dict] = None,
+        boost_dict: Optional[Dict] = None,
+        num_results: int = 10,
+        output_ids: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Cached version of common.batch_search.search_many(): cached queries
+        are answered from the cache, the rest are searched in one batch.
+        """
+        keys = [self._key(q, filter_dict, boost_dict, num_results, output_ids) for q in queries]
+        results = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            found = search_many(
+                self.index,
+                [queries[i] for i in missing],
+                filter_dict=filter_dict,
+                boost_dict=boost_dict,
+                num_results=num_results,
+                output_ids=output_ids,
+            )
+            for i, result in zip(missing, found):
+                self.cache.put(keys[i], result)
+                results[i] = result
+
+        return results
+
+    def _key(self, query, filter_dict, boost_dict, num_results, output_ids) -> tuple:
+        return (
+            normalize_query(query),
+            num_results,
+            json.dumps(filter_dict or {}, sort_keys=True, default=str),
+            json.dumps(boost_dict or {}, sort_keys=True, default=str),
+            output_ids,
+            len(self.index.docs),
+        )
+
+    def append(self, doc: Dict[str, Any]) -> "CachedIndex":
+        self.index.append(doc)
+        self.cache.clear()
+        return self
+
+    def extend(self, docs: Iterable[Dict[str, Any]]) -> "CachedIndex":
+        self.index.extend(docs)
+        self.cache.clear()
+        return self
+
+    def fit(self, docs: List[Dict[str, Any]]) -> "CachedIndex":
+        self.index.fit(docs)
+        self.cache.clear()
+        return self
+
+    def stats(self) -> Dict[str, float]:
+        return self.cache.stats()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.index, name)
@@ -0,0 +1,24 @@
+import random
+
+
+WORDS = "docker python homework deadline install module course video kafka spark".split()
+
+
+def make_docs(num_docs, text_fields, courses=None, seed=1):
+    """
+    Random documents for comparing indexes.
+
+    Args:
+        num_docs: Number of documents
+        text_fields: Number of words of every text field, e.g. {"title": 3, "content": 40}
+        courses: Values of a "course" keyword field, None to leave it out
+        seed: Seed of the random words
+    """
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(num_docs):
+        doc = {field: " ".join(rng.choices(WORDS, k=num_words)) for field, num_words in text_fields.items()}
+        if courses is not None:
+            doc["course"] = rng.choice(courses)
+        docs.append(doc)
+    return docs
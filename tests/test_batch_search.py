@@ -0,0 +1,35 @@
+import random
+
+from minsearch import AppendableIndex, Index
+
+from common.batch_search import search_many
+from common.search_cache import CachedIndex
+
+from index_docs import WORDS, make_docs
+
+
+FAQ_FIELDS = {"question": 5, "text": 30}
+
+
+def test_search_many_matches_search():
+    docs = make_docs(300, FAQ_FIELDS, courses=["de", "ml", "llm"])
+    index = Index(text_fields=["question", "text"], keyword_fields=["course"]).fit(docs)
+    queries = [" ".join(random.Random(i).choices(WORDS, k=3)) for i in range(40)] + ["unknown"]
+
+    kwargs = {"filter_dict": {"course": "de"}, "boost_dict": {"question": 3.0}, "num_results": 5}
+    batched = search_many(index, queries, output_ids=True, **kwargs)
+
+    for query, results in zip(queries, batched):
+        expected = index.search(query, output_ids=True, **kwargs)
+        assert [r["_id"] for r in results] == [r["_id"] for r in expected]
+
+
+def test_search_many_falls_back_and_caches():
+    docs = make_docs(50, FAQ_FIELDS, courses=["de", "ml", "llm"])
+    index = CachedIndex(AppendableIndex(text_fields=["question", "text"]).fit(docs))
+
+    results = index.search_many(["docker install", "kafka"], num_results=3)
+    assert results == [index.index.search("docker install", num_results=3), index.index.search("kafka", num_results=3)]
+
+    index.search_many(["install docker"], num_results=3)
+    assert index.stats()["hits"] == 1
@@ -0,0 +1,42 @@
+import math
+
+from common.bm25 import BM25Index
+
+
+DOCS = [
+    {"question": "How do I install Docker?", "text": "Download Docker Desktop.", "course": "de"},
+    {"question": "Docker compose fails", "text": "Check the docker compose file.", "course": "de"},
+    {"question": "Where is the homework?", "text": "In the course repository.", "course": "ml"},
+    {"question": "Kafka setup", "text": "Start the broker with docker.", "course": "de"},
+]
+
+
+def test_bm25_score_of_a_single_term():
+    index = BM25Index(text_fields=["text"], k1=1.2, b=0.75).fit(DOCS)
+
+    results = index.search("broker", output_ids=True)
+    assert [r["_id"] for r in results] == [3]
+
+    # the BM25 formula for the only matching document, checked by hand
+    idf = math.log(1 + (4 - 1 + 0.5) / (1 + 0.5))
+    lengths = [3, 4, 2, 3]
+    norm = 1.2 * (1 - 0.75 + 0.75 * lengths[3] / (sum(lengths) / 4))
+    ids, scores = index._field_scores("text", {"broker": 1})
+    assert list(ids) == [3]
+    assert math.isclose(scores[0], idf * 2.2 / (1 + norm))
+
+
+def test_filters_boosts_and_appends():
+    index = BM25Index(text_fields=["question", "text"], keyword_fields=["course"]).fit(DOCS[:3])
+    index.append(DOCS[3])
+
+    results = index.search("docker", filter_dict={"course": "de"}, num_results=10, output_ids=True)
+    assert sorted(r["_id"] for r in results) == [0, 1, 3]
+    assert index.search("docker", filter_dict={"course": "ml"}) == []
+    assert index.search("docker", filter_dict={"course": "unknown"}) == []
+
+    # only the text field mentions the broker, a boost on it does not change that
+    boosted = index.search("docker broker", boost_dict={"text": 5.0, "question": 0.1}, num_results=1)
+    assert boosted == [DOCS[3]]
+
+    assert index.search("the") == []
@@ -0,0 +1,32 @@
+from minsearch import AppendableIndex
+
+from common.buffered_index import BufferedAppendableIndex
+
+from index_docs import make_docs
+
+
+def test_buffered_appends_match_appendable_index():
+    docs = make_docs(120, {"title": 3, "content": 40})
+    plain = AppendableIndex(text_fields=["title", "content"]).fit(docs[:40])
+    buffered = BufferedAppendableIndex(text_fields=["title", "content"], buffer_size=16).fit(list(docs[:40]))
+
+    for doc in docs[40:]:
+        plain.append(doc)
+    for doc in docs[40:80]:
+        buffered.append(doc)
+    buffered.extend(docs[80:])
+
+    assert buffered.total_docs == plain.total_docs
+    assert buffered.doc_frequencies == plain.doc_frequencies
+    assert buffered.inverted_index == plain.inverted_index
+
+    for query in ["docker install", "kafka spark video", "homework"]:
+        expected = plain.search(query, boost_dict={"title": 2.0}, num_results=5, output_ids=True)
+        assert buffered.search(query, boost_dict={"title": 2.0}, num_results=5, output_ids=True) == expected
+
+
+def test_search_sees_buffered_docs():
+    index = BufferedAppendableIndex(text_fields=["content"]).fit([{"content": "docker install"}])
+
+    index.append({"content": "kafka streams"})
+    assert index.search("kafka") == [{"content": "kafka streams"}]
@@ -0,0 +1,42 @@
+from common.chunking import BoundaryIndex, Chunk, iter_boundary_chunks, iter_chunks, sliding_window
+
+
+def test_views_match_sliding_window():
+    text = "the quick brown fox jumps over the lazy dog"
+
+    for size, step in [(5, 3), (10, 10), (100, 20), (1, 1)]:
+        views = [chunk.to_dict() for chunk in iter_chunks(text, size, step)]
+        assert views == sliding_window(text, size, step)
+
+
+def test_bytes_chunks_are_memoryviews():
+    data = b"hello world"
+    chunk = next(iter_chunks(data, size=5, step=3))
+
+    assert isinstance(chunk, Chunk)
+    assert isinstance(chunk.content, memoryview)
+    assert chunk.content.obj is data
+    assert bytes(chunk.content) == b"hello"
+
+
+def test_boundary_chunks_keep_words_and_budget():
+    text = "Data engineering is fun. Machine learning is fun too!\n\nAgents call tools. " * 20
+
+    for unit, size, step in [("chars", 60, 30), ("tokens", 16, 8)]:
+        chunks = list(iter_boundary_chunks(text, size, step, unit=unit))
+        boundaries = BoundaryIndex(text)
+
+        assert chunks[0].start == 0
+        assert chunks[-1].end == len(text.rstrip())
+        for chunk in chunks:
+            assert chunk.start == 0 or text[chunk.start - 1].isspace()
+            assert chunk.end == len(text) or text[chunk.end].isspace()
+            if unit == "chars":
+                assert len(chunk) <= size
+            else:
+                first = boundaries.word_starts.index(chunk.start)
+                last = boundaries.word_ends.index(chunk.end)
+                assert boundaries.approx_tokens(first, last + 1) <= size
+
+        sentence_ends = sum(chunk.content.endswith((".", "!")) for chunk in chunks)
+        assert sentence_ends >= len(chunks) - 1
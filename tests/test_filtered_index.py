@@ -0,0 +1,32 @@
+from minsearch import AppendableIndex
+
+from common.filtered_index import FilteredAppendableIndex
+
+from index_docs import make_docs
+
+
+COURSES = ["de", "ml", "llm", None]
+
+
+def test_filtered_search_matches_appendable_index():
+    docs = make_docs(200, {"question": 5, "text": 20}, courses=COURSES)
+    fields = {"text_fields": ["question", "text"], "keyword_fields": ["course"]}
+    plain = AppendableIndex(**fields).fit(docs[:150])
+    filtered = FilteredAppendableIndex(**fields).fit(list(docs[:150]))
+
+    for doc in docs[150:]:
+        plain.append(doc)
+        filtered.append(doc)
+
+    for course in COURSES + ["unknown"]:
+        for query in ["docker install", "kafka spark video", "homework"]:
+            kwargs = {
+                "filter_dict": {"course": course},
+                "boost_dict": {"question": 3.0},
+                "num_results": 5,
+                "output_ids": True,
+            }
+            expected = [r["_id"] for r in plain.search(query, **kwargs)]
+            assert [r["_id"] for r in filtered.search(query, **kwargs)] == expected
+
+    assert filtered.search("docker", num_results=3) == plain.search("docker", num_results=3)
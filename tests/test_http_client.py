@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from common.http_client import aget, create_session, get_async_client
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(1)
+        self.server.requests += 1
+        status = 503 if self.server.requests <= self.server.failures else 200
+        body = b"ok" if status == 200 else b"busy"
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(failures):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    server.requests = 0
+    server.failures = failures
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def test_retries_5xx_then_returns_last_response():
+    server, url = serve(failures=2)
+    session = create_session(retries=3, backoff_factor=0)
+
+    response = session.get(url)
+    assert response.status_code == 200 and response.text == "ok"
+    assert server.requests == 3
+
+    server.requests, server.failures = 0, 10
+    assert session.get(url).status_code == 503
+    assert server.requests == 4
+    server.shutdown()
+
+
+def test_default_timeout():
+    server, url = serve(failures=0)
+    session = create_session(retries=0, timeout=0.2)
+
+    with pytest.raises(requests.exceptions.RequestException):
+        session.get(url + "slow")
+    server.shutdown()
+
+
+def test_aget_retries_and_shares_client():
+    server, url = serve(failures=2)
+
+    async def run():
+        first = await aget(url, backoff_factor=0)
+        assert server.requests == 3
+
+        # parallel requests reuse the client of the loop
+        server.requests, server.failures = 0, 0
+        responses = await asyncio.gather(*(aget(url) for _ in range(5)))
+        assert get_async_client() is get_async_client()
+        return [first, *responses]
+
+    responses = asyncio.run(run())
+    assert [r.text for r in responses] == ["ok"] * 6
+    assert server.requests == 5
+    server.shutdown()
+
+
+def test_aget_timeout():
+    server, url = serve(failures=0)
+
+    with pytest.raises(httpx.TimeoutException):
+        asyncio.run(aget(url + "slow", retries=0, timeout=0.2))
+    server.shutdown()
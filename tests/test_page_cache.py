@@ -0,0 +1,70 @@
+import asyncio
+import os
+import time
+
+from common.page_cache import PageCache
+
+
+class CountingFetch:
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        return self.pages.get(url)
+
+
+def test_pages_are_fetched_once_per_session_and_across_sessions(tmp_path):
+    fetch = CountingFetch({"https://en.wikipedia.org/wiki/Capybara": "# Capybara"})
+    cache = PageCache(tmp_path)
+
+    for _ in range(3):
+        assert cache.get_or_fetch("https://en.wikipedia.org/wiki/Capybara", fetch) == "# Capybara"
+    assert len(fetch.calls) == 1
+    assert cache.stats()["hits"] == 2
+
+    # failed fetches are tried again
+    assert cache.get_or_fetch("https://example.com/missing", fetch) is None
+    assert cache.get_or_fetch("https://example.com/missing", fetch) is None
+    assert len(fetch.calls) == 3
+
+    # a new session reads the page from disk
+    new_session = PageCache(tmp_path)
+    assert new_session.get_or_fetch("https://en.wikipedia.org/wiki/Capybara", fetch) == "# Capybara"
+    assert len(fetch.calls) == 3
+    assert new_session.stats()["disk_hits"] == 1
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    cache = PageCache(tmp_path, max_size=2, ttl=60)
+    for url in ["a", "b", "c"]:
+        cache.put(url, url.upper())
+
+    assert len(cache._entries) == 2
+    # "a" was evicted from memory but is still on disk
+    assert cache.get("a") == "A"
+    assert cache.stats()["disk_hits"] == 1
+
+    stale = time.time() - 120
+    os.utime(cache._path("b"), (stale, stale))
+    cache._entries.clear()
+    assert cache.get("b") is None
+    assert not cache._path("b").exists()
+
+
+def test_async_fetch_in_memory_only():
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        return f"page {url}"
+
+    async def run(cache):
+        first = await cache.get_or_fetch_async("x", fetch)
+        second = await cache.get_or_fetch_async("x", fetch)
+        return first, second
+
+    assert asyncio.run(run(PageCache())) == ("page x", "page x")
+    assert calls == ["x"]
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from common.reader_parser import ReaderPage
+
+
+JINA_OUTPUT = """Title: Capybara - Wikipedia
+
+URL Source: https://en.wikipedia.org/wiki/Capybara
+
+Published Time: 2025-09-30T12:00:00Z
+
+Markdown Content:
+The capybara is the largest living rodent.
+
+## Etymology
+Its common name is derived from Tupi.
+
+```python
+# not a heading
+```
+
+## Diet
+Grasses and aquatic plants.
+"""
+
+
+def test_header_and_content():
+    page = ReaderPage(JINA_OUTPUT.splitlines())
+
+    assert page.metadata == {
+        "title": "Capybara - Wikipedia",
+        "url_source": "https://en.wikipedia.org/wiki/Capybara",
+        "published_time": "2025-09-30T12:00:00Z",
+    }
+    content = page.markdown_content
+    assert content.startswith("The capybara is the largest living rodent.")
+    assert content.endswith("Grasses and aquatic plants.")
+    assert page.to_dict()["markdown_content"] == content
+
+
+def test_sections_are_yielded_while_reading():
+    lines = iter(io.StringIO(JINA_OUTPUT))
+    page = ReaderPage(lines)
+    sections = page.sections()
+
+    first = next(sections)
+    assert first.heading is None and first.lines == ["The capybara is the largest living rodent.", ""]
+    # only the heading that ends the first section has been read
+    assert next(lines) == "Its common name is derived from Tupi.\n"
+
+    page = ReaderPage(JINA_OUTPUT.splitlines())
+    sections = list(page.sections())
+    assert [(s.heading, s.level) for s in sections] == [(None, 0), ("Etymology", 2), ("Diet", 2)]
+    assert "# not a heading" in sections[1].content
+
+    assert page.markdown_content.count("\n## ") == 2
+    with pytest.raises(RuntimeError):
+        list(page.sections())
+
+
+def test_title_from_heading_without_header():
+    page = ReaderPage("# Capybara\n\nA rodent.\n\nNote: it swims.".splitlines())
+
+    assert page.metadata["title"] == "Capybara"
+    assert page.markdown_content == "# Capybara\n\nA rodent.\n\nNote: it swims."
@@ -0,0 +1,52 @@
+from minsearch import AppendableIndex, Index
+
+from common.search_cache import CachedIndex, normalize_query
+
+
+DOCS = [
+    {"question": "How do I install Docker?", "text": "Use the installer.", "course": "de"},
+    {"question": "Where is the homework?", "text": "In the course repo.", "course": "de"},
+    {"question": "How do I install Python?", "text": "Use conda.", "course": "ml"},
+]
+
+
+def test_cached_search_matches_index_and_counts_hits():
+    plain = Index(text_fields=["question", "text"], keyword_fields=["course"]).fit(DOCS)
+    cached = CachedIndex(Index(text_fields=["question", "text"], keyword_fields=["course"]).fit(DOCS))
+
+    kwargs = {"filter_dict": {"course": "de"}, "boost_dict": {"question": 3.0}, "num_results": 2}
+    expected = plain.search("how to install?", **kwargs)
+
+    assert cached.search("how to install?", **kwargs) == expected
+    assert cached.search("  To HOW install ", **kwargs) == expected
+    assert cached.stats()["hits"] == 1
+
+    # different parameters are different entries
+    cached.search("how to install?", num_results=1)
+    assert cached.stats()["misses"] == 2
+
+
+def test_append_invalidates_results():
+    index = AppendableIndex(text_fields=["question", "text"], keyword_fields=["course"])
+    cached = CachedIndex(index.fit(DOCS[:1]))
+
+    assert len(cached.search("homework")) == 0
+
+    cached.append(DOCS[1])
+    assert [r["question"] for r in cached.search("homework")] == ["Where is the homework?"]
+
+    # documents appended behind the wrapper's back change the key as well
+    index.append({"question": "Homework deadline?", "text": "Sunday.", "course": "de"})
+    assert len(cached.search("homework")) == 2
+
+
+def test_ttl_expires_entries():
+    cached = CachedIndex(Index(text_fields=["question"]).fit(DOCS), ttl=0)
+
+    cached.search("docker")
+    cached.search("docker")
+    assert cached.stats()["hits"] == 0
+
+
+def test_normalize_query():
+    assert normalize_query("Docker, install!") == normalize_query("install docker")
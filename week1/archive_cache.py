@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Iterable
+
+
+@dataclass
+class CacheEntry:
+    digest: str
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: float = 0.0
+    last_used: float = 0.0
+
+
+class ArchiveCache:
+    """
+    Persistent, content-addressed cache for downloaded repository archives.
+
+    Archives are stored once under their sha256 digest and referenced by a
+    key such as 'owner/repo/ref'. Each key keeps the ETag and Last-Modified
+    headers of its download, so later requests can be revalidated with
+    If-None-Match / If-Modified-Since. When the total size goes over
+    max_bytes, the least recently used keys are evicted.
+    """
+
+    def __init__(self,
+                cache_dir: str | Path,
+                max_bytes: int = 2 * 1024**3,
+                max_age: float | None = None
+        ):
+        """
+        Initialize the archive cache.
+
+        Args:
+            cache_dir: Directory where archives and the index are stored
+            max_bytes: Upper bound for the total size of the cached archives
+            max_age: Optional number of seconds an entry is used without
+                    revalidating it with the server
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.entries = self._load_index()
+
+        self.hits = 0
+        self.misses = 0
+
+    def is_fresh(self, key: str) -> bool:
+        """
+        Check whether an entry can be used without asking the server.
+
+        Args:
+            key: Cache key of the archive
+
+        Returns:
+            True if the entry exists and is younger than max_age
+        """
+        entry = self.entries.get(key)
+        if entry is None or self.max_age is None:
+            return False
+        if not self._object_path(entry.digest).exists():
+            return False
+        return time.time() - entry.stored_at < self.max_age
+
+    def revalidation_headers(self, key: str) -> dict[str, str]:
+        """
+        Build the conditional request headers for a cached archive.
+
+        Args:
+            key: Cache key of the archive
+
+        Returns:
+            If-None-Match / If-Modified-Since headers, empty if nothing is cached
+        """
+        entry = self.entries.get(key)
+        if entry is None or not self._object_path(entry.digest).exists():
+            return {}
+
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def hit(self, key: str, revalidated: bool = False) -> Path:
+        """
+        Record a cache hit and return the path of the cached archive.
+
+        Args:
+            key: Cache key of the archive
+            revalidated: True if the server confirmed the entry (304), which
+                    restarts its max_age window
+
+        Returns:
+            Path of the cached zip file
+        """
+        entry = self.entries[key]
+        entry.last_used = time.time()
+        if revalidated:
+            entry.stored_at = entry.last_used
+        self._save_index()
+
+        self.hits += 1
+        return self._object_path(entry.digest)
+
+    def store(self,
+                key: str,
+                chunks: Iterable[bytes],
+                etag: str | None = None,
+                last_modified: str | None = None
+        ) -> Path:
+        """
+        Write a freshly downloaded archive to the cache and record a miss.
+
+        Args:
+            key: Cache key of the archive
+            chunks: Archive content, e.g. resp.iter_content()
+            etag: ETag header of the response
+            last_modified: Last-Modified header of the response
+
+        Returns:
+            Path of the cached zip file
+        """
+        sha = hashlib.sha256()
+        size = 0
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f_out:
+                for chunk in chunks:
+                    sha.update(chunk)
+                    size += len(chunk)
+                    f_out.write(chunk)
+
+            digest = sha.hexdigest()
+            os.replace(tmp_name, self._object_path(digest))
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+        now = time.time()
+        self.entries[key] = CacheEntry(
+            digest=digest,
+            size=size,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=now,
+            last_used=now
+        )
+        self._evict(keep=key)
+        self._remove_orphans()
+        self._save_index()
+
+        self.misses += 1
+        return self._object_path(digest)
+
+    def total_bytes(self) -> int:
+        """
+        Total size of the archives on disk. Keys sharing content count once.
+        """
+        sizes = {entry.digest: entry.size for entry in self.entries.values()}
+        return sum(sizes.values())
+
+    def stats(self) -> dict[str, float]:
+        """
+        Hit/miss counters of this cache instance.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries and bytes
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes(),
+        }
+
+    def _evict(self, keep: str) -> None:
+        """
+        Drop least recently used keys until the cache fits into max_bytes.
+        The entry that was just stored is never evicted.
+        """
+        by_last_used = sorted(self.entries.items(), key=lambda item: item[1].last_used)
+
+        for key, _ in by_last_used:
+            if self.total_bytes() <= self.max_bytes:
+                break
+            if key != keep:
+                del self.entries[key]
+
+    def _remove_orphans(self) -> None:
+        """
+        Delete archives on disk that are no longer referenced by any key.
+        """
+        referenced = {entry.digest for entry in self.entries.values()}
+
+        for path in self.objects_dir.glob("*.zip"):
+            if path.stem not in referenced:
+                path.unlink(missing_ok=True)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / f"{digest}.zip"
+
+    def _load_index(self) -> dict[str, CacheEntry]:
+        if not self.index_path.exists():
+            return {}
+
+        with open(self.index_path, "r", encoding="utf-8") as f_in:
+            raw = json.load(f_in)
+        return {key: CacheEntry(**value) for key, value in raw.items()}
+
+    def _save_index(self) -> None:
+        # write to a temp file first so a crash never leaves a broken index
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f_out:
+            json.dump({key: asdict(entry) for key, entry in self.entries.items()}, f_out)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,58 @@
+"""
+Speedup of the parallel extractor in GithubRepositoryDataReader
+
+Builds a synthetic archive with tens of thousands of markdown files and
+extracts it with a growing number of thread and process workers.
+
+Usage:
+    cd week1
+    python bench_parallel_extract.py [num_files]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_utils import make_synthetic_repo_zip
+from github_helper import GithubRepositoryDataReader
+
+
+def time_extraction(archive: Path, workers: int, use_processes: bool) -> tuple[int, float]:
+    reader = GithubRepositoryDataReader(
+        "bench",
+        "repo",
+        allowed_extensions={"md"},
+        workers=workers,
+        use_processes=use_processes
+    )
+
+    t0 = time.perf_counter()
+    files = list(reader._iter_archive(archive))
+    return len(files), time.perf_counter() - t0
+
+
+def main():
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 30_000
+    worker_counts = [1, 2, 4, 8]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive = make_synthetic_repo_zip(
+            Path(tmp_dir) / "repo.zip", num_files, words_per_file=1000
+        )
+        print(f"{num_files} files, {archive.stat().st_size / 2**20:.1f} MB zip, {os.cpu_count()} CPUs")
+
+        _, baseline = time_extraction(archive, workers=1, use_processes=False)
+
+        print(f"{'pool':>8} {'workers':>8} {'seconds':>8} {'speedup':>8}")
+        print(f"{'-':>8} {1:>8} {baseline:>8.2f} {1.0:>7.2f}x")
+
+        for use_processes in [False, True]:
+            pool = "process" if use_processes else "thread"
+            for workers in worker_counts[1:]:
+                _, elapsed = time_extraction(archive, workers, use_processes)
+                print(f"{pool:>8} {workers:>8} {elapsed:>8.2f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
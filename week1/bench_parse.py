@@ -0,0 +1,56 @@
+"""
+Throughput of parse_data versus the number of worker processes
+
+Builds a synthetic corpus of podcast-style markdown pages, where one in
+five pages has no transcript, and parses it with a growing number of
+workers.
+
+Usage:
+    cd week1
+    python bench_parse.py [num_files]
+"""
+import os
+import random
+import sys
+import time
+
+from bench_utils import make_podcast_markdown
+from github_helper import RawRepositoryFile
+from homework import parse_data
+
+
+def make_corpus(num_files: int) -> list[RawRepositoryFile]:
+    rng = random.Random(1)
+    corpus = []
+
+    for i in range(num_files):
+        if i % 5 == 0:
+            content = f"---\ntitle: Season {i}\n---\n\nSeason overview page\n"
+        else:
+            content = make_podcast_markdown(i, num_lines=200, rng=rng)
+        corpus.append(RawRepositoryFile(filename=f"_podcast/s01e{i:04d}.md", content=content))
+
+    return corpus
+
+
+def main():
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    corpus = make_corpus(num_files)
+    size_mb = sum(len(f.content) for f in corpus) / 2**20
+
+    print(f"{num_files} files, {size_mb:.1f} MB of markdown, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>8} {'files/s':>8} {'speedup':>8}")
+
+    baseline = None
+    for workers in [1, 2, 4, 8]:
+        t0 = time.perf_counter()
+        parsed = parse_data(corpus, workers=workers)
+        elapsed = time.perf_counter() - t0
+
+        baseline = baseline or elapsed
+        assert len(parsed) == num_files - len(range(0, num_files, 5))
+        print(f"{workers:>8} {elapsed:>8.2f} {num_files / elapsed:>8.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
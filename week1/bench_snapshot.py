@@ -0,0 +1,56 @@
+"""
+Startup time of the podcast search: refitting the index vs loading a snapshot
+
+Usage:
+    cd week1
+    python bench_snapshot.py [num_episodes]
+"""
+import random
+import sys
+import tempfile
+import time
+
+from bench_utils import make_podcast_markdown
+from github_helper import RawRepositoryFile
+from homework import index_documents, parse_data, search_index
+from index_snapshot import load_index, save_index
+
+
+def main():
+    num_episodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rng = random.Random(1)
+    files = [
+        RawRepositoryFile(f"_podcast/s01e{i:03d}.md", make_podcast_markdown(i, 200, rng))
+        for i in range(num_episodes)
+    ]
+    documents = parse_data(files)
+    query = "how do I make money with AI?"
+
+    t0 = time.perf_counter()
+    index = index_documents(documents)
+    fit = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        t0 = time.perf_counter()
+        save_index(index, tmp_dir)
+        save = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        loaded = load_index(tmp_dir)
+        load = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        result = search_index(loaded, query, n=10)
+        first_query = time.perf_counter() - t0
+
+        assert [doc['title'] for doc in result] == [doc['title'] for doc in search_index(index, query, n=10)]
+
+    print(f"{len(index.docs)} chunks from {num_episodes} episodes")
+    print(f"chunk + fit:     {fit * 1e3:8.1f} ms")
+    print(f"save snapshot:   {save * 1e3:8.1f} ms")
+    print(f"load snapshot:   {load * 1e3:8.1f} ms")
+    print(f"first query:     {first_query * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Peak memory of GithubRepositoryDataReader.read() vs .stream()
+
+Generates synthetic repository archives of growing size, serves them from a
+local HTTP server and reads each one in a fresh process, so ru_maxrss is the
+peak for that single run.
+
+Usage:
+    cd week1
+    python bench_streaming.py
+"""
+import multiprocessing as mp
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+from bench_utils import make_synthetic_repo_zip, serve_archives
+from github_helper import GithubRepositoryDataReader
+
+
+SIZES = [2_000, 8_000, 32_000]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_reader(base_url: str, repo_name: str, mode: str, queue) -> None:
+    reader = GithubRepositoryDataReader(
+        "bench",
+        repo_name,
+        allowed_extensions={"md"},
+        base_url=base_url
+    )
+
+    rss_before = peak_rss_mb()
+    t0 = time.perf_counter()
+
+    if mode == "read":
+        num_files = len(reader.read())
+    else:
+        num_files = sum(1 for _ in reader.stream())
+
+    elapsed = time.perf_counter() - t0
+    queue.put((num_files, elapsed, peak_rss_mb() - rss_before))
+
+
+def measure(base_url: str, repo_name: str, mode: str):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=run_reader, args=(base_url, repo_name, mode, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            make_synthetic_repo_zip(Path(tmp_dir) / f"repo{size}.zip", size)
+
+        print(f"{'files':>8} {'zip MB':>8} {'mode':>7} {'seconds':>8} {'peak RSS +MB':>13}")
+
+        with serve_archives(tmp_dir) as server:
+            for size in SIZES:
+                repo_name = f"repo{size}"
+                zip_mb = (Path(tmp_dir) / f"{repo_name}.zip").stat().st_size / 2**20
+
+                for mode in ["read", "stream"]:
+                    num_files, elapsed, rss = measure(server.url, repo_name, mode)
+                    print(f"{num_files:>8} {zip_mb:>8.1f} {mode:>7} {elapsed:>8.2f} {rss:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
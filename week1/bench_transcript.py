@@ -0,0 +1,65 @@
+"""
+Scaling of extract_only_transcript_text on synthetic transcripts
+
+Compares the join-based extractor in homework.py with the previous
+implementation (string += and re.split on every line) on transcripts of
+growing size. Linear scaling shows as a flat time per line.
+
+Usage:
+    cd week1
+    python bench_transcript.py
+"""
+import random
+import re
+import timeit
+
+from bench_utils import WORDS
+from homework import extract_only_transcript_text
+
+
+def extract_only_transcript_text_concat(doc_content):
+    # the implementation before the rewrite, kept as the reference
+    transcript_text = " "
+    for d in doc_content[1:]:
+        if 'line' in d.keys():
+            transcript_text += re.split(r"\n\s*\n" ,d['line'].strip())[0]
+        elif 'header' in d.keys():
+            transcript_text += d['header']
+
+    transcript_text = transcript_text.strip()
+
+    return transcript_text
+
+
+def make_transcript(num_lines: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    transcript = [{'header': 'Intro'}]
+
+    for i in range(num_lines):
+        if i % 20 == 0:
+            transcript.append({'header': f"Section {i // 20}"})
+
+        # several paragraphs per line, only the first one is kept
+        paragraphs = [" ".join(rng.choices(WORDS, k=60)) for _ in range(4)]
+        transcript.append({'line': "\n\n".join(paragraphs), 'sec': i, 'who': 'Guest'})
+
+    return transcript
+
+
+def main():
+    print(f"{'lines':>8} {'old ms':>8} {'new ms':>8} {'old us/line':>12} {'new us/line':>12}")
+
+    for num_lines in [500, 2_000, 8_000, 32_000]:
+        transcript = make_transcript(num_lines)
+        assert extract_only_transcript_text(transcript) == extract_only_transcript_text_concat(transcript)
+
+        number = max(1, 20_000 // num_lines)
+        old = min(timeit.repeat(lambda: extract_only_transcript_text_concat(transcript), number=number, repeat=3)) / number
+        new = min(timeit.repeat(lambda: extract_only_transcript_text(transcript), number=number, repeat=3)) / number
+
+        print(f"{num_lines:>8} {old * 1e3:>8.2f} {new * 1e3:>8.2f} "
+              f"{old / num_lines * 1e6:>12.2f} {new / num_lines * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import os
+import random
+import threading
+import zipfile
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+
+WORDS = (
+    "data engineering machine learning podcast episode transcript model "
+    "pipeline career python agent search index vector llm prompt course "
+    "community interview question answer experience project startup team"
+).split()
+
+
+def make_synthetic_repo_zip(
+        path: str | Path,
+        num_files: int,
+        words_per_file: int = 500,
+        folder: str = "_podcast/s01",
+        repo_dir: str = "repo-main",
+        seed: int = 1
+    ) -> Path:
+    """
+    Write a zip archive shaped like a codeload download of a repository.
+
+    Every file is a podcast-style markdown page with a short frontmatter
+    header and random words as the body, so the archive does not compress
+    to nothing.
+
+    Args:
+        path: Where to write the zip archive
+        num_files: Number of markdown files to generate
+        words_per_file: Number of random words in each file body
+        folder: Folder inside the repository that holds the files
+        repo_dir: Top-level directory of the archive ('<repo>-<branch>')
+        seed: Seed for the random generator
+
+    Returns:
+        The path of the written archive
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{repo_dir}/README.md", "# synthetic repository\n")
+        zf.writestr(f"{repo_dir}/.gitignore", "*.pyc\n")
+
+        for i in range(num_files):
+            body = " ".join(rng.choices(WORDS, k=words_per_file))
+            content = (
+                "---\n"
+                f"title: Episode {i}\n"
+                f"episode: {i}\n"
+                "---\n\n"
+                f"{body}\n"
+            )
+            zf.writestr(f"{repo_dir}/{folder}/episode-{i:06d}.md", content)
+
+    return path
+
+
+def make_podcast_markdown(episode: int, num_lines: int, rng: random.Random) -> str:
+    """
+    Build a podcast page with a YAML transcript, like the ones in
+    datatalksclub.github.io/_podcast.
+
+    Args:
+        episode: Episode number, used in the title
+        num_lines: Number of transcript lines
+        rng: Random generator for the words
+
+    Returns:
+        The markdown content of the page
+    """
+    lines = [
+        "---",
+        f"title: Episode {episode}",
+        "season: 1",
+        f"episode: {episode}",
+        "guests:",
+        "- guest-name",
+        "transcript:",
+        "- header: Intro",
+    ]
+    for i in range(num_lines):
+        text = " ".join(rng.choices(WORDS, k=40))
+        lines.append(f"- line: {text}")
+        lines.append(f"  sec: {i * 10}")
+        lines.append(f"  time: '{i // 6}:{i % 6 * 10:02d}'")
+        lines.append("  who: Guest")
+    lines.append("---")
+    lines.append("")
+
+    return "\n".join(lines)
+
+
+class _ArchiveHandler(SimpleHTTPRequestHandler):
+    """
+    Serves every zip archive of the directory under the codeload-style URL
+    '/<owner>/<name>/zip/refs/heads/main', where the archive is '<name>.zip'.
+
+    Responses carry an ETag built from the file's mtime and size, and a
+    matching If-None-Match is answered with 304. Every GET is counted in
+    the server's 'requests' and 'bytes_sent' attributes.
+    """
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        self.server.requests += 1
+        self._etag = None
+
+        if os.path.exists(path):
+            stat = os.stat(path)
+            self._etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+            if self.headers.get("If-None-Match") == self._etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            self.server.bytes_sent += stat.st_size
+
+        super().do_GET()
+
+    def end_headers(self):
+        if getattr(self, "_etag", None):
+            self.send_header("ETag", self._etag)
+        super().end_headers()
+
+    def translate_path(self, path):
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if len(parts) >= 2:
+            return os.path.join(self.directory, f"{parts[1]}.zip")
+        return os.path.join(self.directory, "__missing__")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_archives(directory: str | Path) -> Iterator[ThreadingHTTPServer]:
+    """
+    Run a local HTTP server that serves the zip archives of a directory.
+
+    Args:
+        directory: Directory with '<repo_name>.zip' files
+
+    Yields:
+        The running server. server.url is the base url to pass to
+        GithubRepositoryDataReader.
+    """
+    def handler(*args, **kwargs):
+        return _ArchiveHandler(*args, directory=str(directory), **kwargs)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.requests = 0
+    server.bytes_sent = 0
+    host, port = server.server_address
+    server.url = f"http://{host}:{port}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
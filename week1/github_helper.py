@@ -1,10 +1,17 @@
 import io
-from typing import Iterable, Callable
+import re
+from typing import Iterable, Iterator, Callable, BinaryIO
+import tempfile
 import zipfile
 import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
 
-import requests
+from common import http_client
+
+from archive_cache import ArchiveCache
 
 
 @dataclass
@@ -13,6 +20,145 @@ class RawRepositoryFile:
     content: str
 
 
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Translate a path glob into a regular expression.
+
+    '**' matches any number of characters including '/', '**/' matches zero or
+    more whole directories, '*' and '?' do not cross a '/'.
+    """
+    regex = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        else:
+            regex.append(re.escape(pattern[i]))
+            i += 1
+
+    return "".join(regex)
+
+
+def compile_path_matcher(
+        allowed_extensions: Iterable[str] | None = None,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None
+    ) -> re.Pattern:
+    """
+    Compile all path rules of the reader into one regular expression.
+
+    The returned pattern fullmatches a lowercased, normalized path only if
+    it is a non-hidden file, has one of the allowed extensions, matches at
+    least one include glob and none of the exclude globs.
+
+    Args:
+        allowed_extensions: File extensions to keep (e.g., {"md", "py"})
+        include: Globs of paths to keep, e.g. "_podcast/**". Keeps all paths if empty
+        exclude: Globs of paths to drop, checked before include
+
+    Returns:
+        Compiled pattern to use with fullmatch()
+
+    Example:
+        >>> matcher = compile_path_matcher({"md"}, include=["_podcast/s*"])
+        >>> bool(matcher.fullmatch("_podcast/s01e01.md"))
+        True
+    """
+    parts = [
+        # hidden files
+        r"(?!(?:.*/)?\.[^/]*$)",
+    ]
+
+    if exclude:
+        excluded = "|".join(_glob_to_regex(glob.lower()) for glob in exclude)
+        parts.append(f"(?!(?:{excluded})$)")
+
+    if allowed_extensions:
+        extensions = "|".join(re.escape(ext.lower()) for ext in sorted(allowed_extensions))
+        parts.append(rf"(?=.*\.(?:{extensions})$)")
+
+    if include:
+        included = "|".join(_glob_to_regex(glob.lower()) for glob in include)
+        parts.append(f"(?:{included})")
+    else:
+        parts.append(".*")
+
+    # directories and empty paths never match
+    parts.append(r"(?<=[^/])")
+
+    return re.compile("".join(parts), flags=re.DOTALL)
+
+
+def _open_zip(archive: Path | bytes) -> zipfile.ZipFile:
+    """
+    Open a zip archive given by its path or its content.
+    """
+    if isinstance(archive, bytes):
+        return zipfile.ZipFile(io.BytesIO(archive))
+    return zipfile.ZipFile(archive)
+
+
+def _extract_member(
+        zf: zipfile.ZipFile,
+        file_info: zipfile.ZipInfo | str,
+        filepath: str
+    ) -> RawRepositoryFile | None:
+    """
+    Inflate and decode a single member of the archive.
+
+    Args:
+        zf: ZipFile object containing the repository data
+        file_info: The member to extract
+        filepath: Normalized path stored in the result
+
+    Returns:
+        RawRepositoryFile for the member, or None if it could not be read
+    """
+    try:
+        with zf.open(file_info) as f_in:
+            content = f_in.read().decode("utf-8", errors="ignore")
+            if content is not None:
+                content = content.strip()
+
+            return RawRepositoryFile(
+                filename=filepath,
+                content=content
+            )
+
+    except Exception as e:
+        name = file_info if isinstance(file_info, str) else file_info.filename
+        print(f"Error processing {name}: {e}")
+        traceback.print_exc()
+        return None
+
+
+def _extract_batch(archive: Path | bytes, members: list[tuple[str, str]]) -> list[RawRepositoryFile]:
+    """
+    Worker for the parallel extractor: extracts a batch of
+    (member name, normalized path) pairs with its own handle on the
+    archive, which is closed when the batch is done.
+    """
+    data = []
+
+    with _open_zip(archive) as zf:
+        for name, filepath in members:
+            file = _extract_member(zf, name, filepath)
+            if file is not None:
+                data.append(file)
+
+    return data
+
+
 class GithubRepositoryDataReader:
     """
     Downloads and parses markdown and code files from a GitHub repository.
@@ -22,7 +168,14 @@ class GithubRepositoryDataReader:
                 repo_owner: str,
                 repo_name: str,
                 allowed_extensions: Iterable[str] | None = None,
-                filename_filter: Callable[[str], bool] | None = None
+                filename_filter: Callable[[str], bool] | None = None,
+                include: Iterable[str] | None = None,
+                exclude: Iterable[str] | None = None,
+                base_url: str = "https://codeload.github.com",
+                ref: str = "main",
+                cache: ArchiveCache | None = None,
+                workers: int = 1,
+                use_processes: bool = False
         ):
         """
         Initialize the GitHub repository data reader.
@@ -32,20 +185,40 @@ class GithubRepositoryDataReader:
             repo_name: The name of the GitHub repository
             allowed_extensions: Optional set of file extensions to include
                     (e.g., {"md", "py"}). If not provided, all file types are included
-            filename_filter: Optional callable to filter files by their path
+            filename_filter: Optional callable to filter files by their path.
+                    Called for every entry, prefer include/exclude when possible
+            include: Optional globs of paths to include (e.g., ["_podcast/**"]).
+                    '**' crosses directories, '*' does not
+            exclude: Optional globs of paths to exclude
+            base_url: Host serving the zip archives. Defaults to GitHub's codeload,
+                    can be pointed to a local server for testing
+            ref: Branch to download
+            cache: Optional ArchiveCache. When given, archives are kept on disk
+                    and only downloaded again if the server reports a change
+            workers: Number of workers that decompress and decode files.
+                    1 (the default) extracts on the calling thread
+            use_processes: Use a process pool instead of a thread pool for the
+                    workers. Worth it when decoding dominates over inflating
         """
-        prefix = "https://codeload.github.com"
         self.url = (
-            f"{prefix}/{repo_owner}/{repo_name}/zip/refs/heads/main"
+            f"{base_url}/{repo_owner}/{repo_name}/zip/refs/heads/{ref}"
         )
+        self.cache_key = f"{repo_owner}/{repo_name}/{ref}"
+        self.cache = cache
+        self.workers = workers
+        self.use_processes = use_processes
 
         if allowed_extensions is not None:
             self.allowed_extensions = {ext.lower() for ext in allowed_extensions}
-
-        if filename_filter is None:
-            self.filename_filter = lambda filepath: True
         else:
-            self.filename_filter = filename_filter
+            self.allowed_extensions = None
+
+        self.filename_filter = filename_filter
+        self.path_matcher = compile_path_matcher(self.allowed_extensions, include, exclude)
+
+        # members dropped by name in the last extraction, without inflating them
+        self.skipped_files = 0
+        self.skipped_bytes = 0
 
     def read(self) -> list[RawRepositoryFile]:
         """
@@ -57,15 +230,190 @@ class GithubRepositoryDataReader:
         Raises:
             Exception: If the repository download fails
         """
-        resp = requests.get(self.url)
+        if self.cache is not None:
+            return list(self._iter_archive(self._fetch_cached()))
+
+        resp = http_client.get(self.url)
         if resp.status_code != 200:
             raise Exception(f"Failed to download repository: {resp.status_code}")
 
-        zf = zipfile.ZipFile(io.BytesIO(resp.content))
-        repository_data = self._extract_files(zf)
-        zf.close()
+        return list(self._iter_archive(resp.content))
+
+    def stream(self, chunk_size: int = 1024 * 1024) -> Iterator[RawRepositoryFile]:
+        """
+        Download the repository to a temporary file and lazily yield its files.
+
+        Unlike read(), the archive is never held in memory: the response is
+        written to disk in chunks and the zip is read from there, one file at
+        a time. The temporary file is removed once the generator is exhausted
+        or closed.
+
+        If the reader has a cache, the cached archive is read instead of a
+        temporary file.
+
+        Args:
+            chunk_size: Number of bytes to read from the response at a time
+
+        Yields:
+            RawRepositoryFile objects for each processed file
+
+        Raises:
+            Exception: If the repository download fails
+        """
+        if self.cache is not None:
+            yield from self._iter_archive(self._fetch_cached(chunk_size))
+            return
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            archive_path = Path(tmp_dir) / "repository.zip"
+            with open(archive_path, "wb") as f_out:
+                self._download_to_file(f_out, chunk_size)
+
+            yield from self._iter_archive(archive_path)
+
+    def fetch_archive(self, chunk_size: int = 1024 * 1024) -> tuple[Path, str]:
+        """
+        Get the archive through the cache without extracting it.
+
+        Together with read_archive() this splits read(), so a caller can
+        compare the digest with the one of a previous run and skip the
+        extraction when the archive did not change.
+
+        Args:
+            chunk_size: Number of bytes to read from the response at a time
+
+        Returns:
+            Path of the cached zip archive and its sha256 digest
+
+        Raises:
+            ValueError: If the reader has no cache
+            Exception: If the repository download fails
+        """
+        if self.cache is None:
+            raise ValueError("fetch_archive() needs a reader with a cache")
+
+        archive = self._fetch_cached(chunk_size)
+        return archive, self.cache.entries[self.cache_key].digest
+
+    def read_archive(self, archive: Path) -> list[RawRepositoryFile]:
+        """
+        Extract the files of an archive returned by fetch_archive().
+        """
+        return list(self._iter_archive(archive))
+
+    def _fetch_cached(self, chunk_size: int = 1024 * 1024) -> Path:
+        """
+        Get the archive through the cache, revalidating it with the server.
+
+        A fresh entry (see ArchiveCache.max_age) is used without any request.
+        Otherwise the request carries If-None-Match / If-Modified-Since and a
+        304 response reuses the cached zip.
+
+        Args:
+            chunk_size: Number of bytes to read from the response at a time
+
+        Returns:
+            Path of the cached zip archive
+
+        Raises:
+            Exception: If the repository download fails
+        """
+        if self.cache.is_fresh(self.cache_key):
+            return self.cache.hit(self.cache_key)
+
+        headers = self.cache.revalidation_headers(self.cache_key)
+
+        with http_client.get(self.url, headers=headers, stream=True) as resp:
+            if resp.status_code == 304 and headers:
+                return self.cache.hit(self.cache_key, revalidated=True)
+
+            if resp.status_code != 200:
+                raise Exception(f"Failed to download repository: {resp.status_code}")
+
+            return self.cache.store(
+                self.cache_key,
+                resp.iter_content(chunk_size=chunk_size),
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified")
+            )
+
+    def _download_to_file(self, f_out: BinaryIO, chunk_size: int) -> None:
+        """
+        Stream the repository archive into an open binary file.
+
+        Args:
+            f_out: File object the archive is written to
+            chunk_size: Number of bytes to read from the response at a time
+
+        Raises:
+            Exception: If the repository download fails
+        """
+        with http_client.get(self.url, stream=True) as resp:
+            if resp.status_code != 200:
+                raise Exception(f"Failed to download repository: {resp.status_code}")
+
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                f_out.write(chunk)
+
+    def _iter_archive(self, archive: Path | bytes) -> Iterator[RawRepositoryFile]:
+        """
+        Yield the files of an archive, in parallel if the reader has workers.
+
+        Args:
+            archive: Path of the zip file or its content
+
+        Yields:
+            RawRepositoryFile objects for each processed file
+        """
+        if self.workers > 1:
+            yield from self._iter_files_parallel(archive)
+            return
+
+        with _open_zip(archive) as zf:
+            yield from self._iter_files(zf)
+
+    def _iter_files_parallel(self, archive: Path | bytes) -> Iterator[RawRepositoryFile]:
+        """
+        Extract files on a thread or process pool, keeping the archive order.
+
+        The member list is filtered once on the calling thread and split into
+        batches. Every batch is extracted with its own handle on the archive,
+        so workers never share a file position, and the handle is closed
+        with the batch. Process workers need the archive on disk,
+        so an in-memory archive is written to a temporary file first.
 
-        return repository_data
+        Args:
+            archive: Path of the zip file or its content
+
+        Yields:
+            RawRepositoryFile objects for each processed file
+        """
+        with _open_zip(archive) as zf:
+            members = [
+                (file_info.filename, filepath)
+                for file_info, filepath in self._select_members(zf)
+            ]
+
+        if not members:
+            return
+
+        # a few batches per worker keeps them busy when file sizes differ
+        batch_size = max(1, len(members) // (self.workers * 4))
+        batches = [members[i:i + batch_size] for i in range(0, len(members), batch_size)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            if self.use_processes:
+                executor_class = ProcessPoolExecutor
+                if isinstance(archive, bytes):
+                    archive_path = Path(tmp_dir) / "repository.zip"
+                    archive_path.write_bytes(archive)
+                    archive = archive_path
+            else:
+                executor_class = ThreadPoolExecutor
+
+            with executor_class(max_workers=self.workers) as executor:
+                for files in executor.map(partial(_extract_batch, archive), batches):
+                    yield from files
 
     def _extract_files(self, zf: zipfile.ZipFile) -> list[RawRepositoryFile]:
         """
@@ -77,32 +425,51 @@ class GithubRepositoryDataReader:
         Returns:
             List of RawRepositoryFile objects for each processed file
         """
-        data = []
+        return list(self._iter_files(zf))
+
+    def _iter_files(self, zf: zipfile.ZipFile) -> Iterator[RawRepositoryFile]:
+        """
+        Lazily extract and process files from the zip archive.
+
+        Args:
+            zf: ZipFile object containing the repository data
+
+        Yields:
+            RawRepositoryFile objects for each processed file
+        """
+        for file_info, filepath in self._select_members(zf):
+            file = _extract_member(zf, file_info, filepath)
+            if file is not None:
+                yield file
+
+    def _select_members(self, zf: zipfile.ZipFile) -> list[tuple[zipfile.ZipInfo, str]]:
+        """
+        Filter the archive's central directory by name, before any member is opened.
+
+        Also counts the members that were skipped in self.skipped_files and
+        their uncompressed size in self.skipped_bytes.
+
+        Args:
+            zf: ZipFile object containing the repository data
+
+        Returns:
+            (ZipInfo, normalized path) pairs of the files to extract
+        """
+        selected = []
+        self.skipped_files = 0
+        self.skipped_bytes = 0
 
         for file_info in zf.infolist():
             filepath = self._normalize_filepath(file_info.filename)
 
-            if self._should_skip_file(filepath):
+            if file_info.is_dir() or self._should_skip_file(filepath):
+                self.skipped_files += 1
+                self.skipped_bytes += file_info.file_size
                 continue
 
-            try:
-                with zf.open(file_info) as f_in:
-                    content = f_in.read().decode("utf-8", errors="ignore")
-                    if content is not None:
-                        content = content.strip()
-
-                    file = RawRepositoryFile(
-                        filename=filepath,
-                        content=content
-                    )
-                    data.append(file)
-
-            except Exception as e:
-                print(f"Error processing {file_info.filename}: {e}")
-                traceback.print_exc()
-                continue
+            selected.append((file_info, filepath))
 
-        return data
+        return selected
 
     def _should_skip_file(self, filepath: str) -> bool:
         """
@@ -116,41 +483,15 @@ class GithubRepositoryDataReader:
         """
         filepath = filepath.lower()
 
-        # directory
-        if filepath.endswith("/"):
-            return True
-        
-        # hidden file
-        filename = filepath.split("/")[-1]
-        if filename.startswith("."):
+        # directories, hidden files, extensions and include/exclude globs
+        if self.path_matcher.fullmatch(filepath) is None:
             return True
 
-        if self.allowed_extensions:
-            ext = self._get_extension(filepath)
-            if ext not in self.allowed_extensions:
-                return True
-
-        if not self.filename_filter(filepath):
+        if self.filename_filter is not None and not self.filename_filter(filepath):
             return True
 
         return False
 
-    def _get_extension(self, filepath: str) -> str:
-        """
-        Extract the file extension from a filepath.
-        
-        Args:
-            filepath: The file path to extract extension from
-            
-        Returns:
-            The file extension (without dot) or empty string if no extension
-        """
-        filename = filepath.lower().split("/")[-1]
-        if "." in filename:
-            return filename.rsplit(".", maxsplit=1)[-1]
-        else:
-            return ""
-
     def _normalize_filepath(self, filepath: str) -> str:
         """
         Removes the top-level directory from the file path inside the zip archive.
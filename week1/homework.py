@@ -1,8 +1,17 @@
 from github_helper import GithubRepositoryDataReader
+from common.chunking import DocumentChunk, iter_boundary_chunks, iter_chunks, sliding_window
+from archive_cache import ArchiveCache
+from repository_manifest import RepositoryManifest, SyncDiff
+from index_snapshot import load_index, save_index, snapshot_info, update_snapshot_info
+from common.batch_search import search_many
+from common.search_cache import CachedIndex
 import frontmatter
 
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List
 from minsearch import Index
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
 import re
 
 
@@ -12,87 +21,118 @@ def filename_filter(filepath, folder_name='_podcast/s'):
     else:
         return False
 
-def read_github_data():
+ARCHIVE_CACHE_DIR = ".cache/archives"
+MANIFEST_PATH = ".cache/podcast_manifest.pkl"
+INDEX_SNAPSHOT_DIR = ".cache/podcast_index"
+
+
+def repository_reader(use_cache: bool = True) -> GithubRepositoryDataReader:
     allowed_extensions = {"md", "mdx"}
 
     repo_owner = 'DataTalksClub'
     repo_name = 'datatalksclub.github.io'
 
-    reader = GithubRepositoryDataReader(
+    # same files as filename_filter(filepath, folder_name='_podcast/s'),
+    # but matched against the zip's central directory in one compiled pattern
+    include = ["**_podcast/s**"]
+
+    return GithubRepositoryDataReader(
         repo_owner,
         repo_name,
-        filename_filter=filename_filter,
-        allowed_extensions=allowed_extensions
+        include=include,
+        allowed_extensions=allowed_extensions,
+        cache=ArchiveCache(ARCHIVE_CACHE_DIR) if use_cache else None
     )
-    
+
+
+def read_github_data(stream: bool = False, use_cache: bool = True):
+    reader = repository_reader(use_cache)
+
+    # stream=True yields the files one by one from an archive spilled to disk
+    if stream:
+        return reader.stream()
+
     return reader.read()
 
 
 
-def parse_data(data_raw):
+# cheap check for a top-level 'transcript' key before the full YAML load
+TRANSCRIPT_KEY = re.compile(r"^transcript\s*:", re.MULTILINE)
 
-    data_parsed = []
-    for f in data_raw:
-        post = frontmatter.loads(f.content)
-        data = post.to_dict()
-        del data['content']
-        data['filename'] = f.filename
-        if 'transcript' in data.keys():
-            data_parsed.append(data)
 
-    return data_parsed
+def parse_file(filename, content):
+    """
+    Parse the frontmatter of one podcast page.
 
+    Returns:
+        dict: The frontmatter fields and the filename, or None if the page
+        has no transcript.
+    """
+    if TRANSCRIPT_KEY.search(content) is None:
+        return None
+
+    post = frontmatter.loads(content)
+    if 'transcript' not in post.metadata:
+        return None
+
+    data = dict(post.metadata)
+    data['filename'] = filename
+    return data
 
-def extract_only_transcript_text(doc_content):
-    transcript_text = " "
-    for d in doc_content[1:]:
-        if 'line' in d.keys():
-            transcript_text += re.split(r"\n\s*\n" ,d['line'].strip())[0]
-        elif 'header' in d.keys():
-            transcript_text += d['header']
-    
-    transcript_text = transcript_text.strip()
 
-    return transcript_text
+def _parse_batch(batch):
+    return [parse_file(filename, content) for filename, content in batch]
 
 
-def sliding_window(
-        seq: Iterable[Any],
-        size: int,
-        step: int
-    ) -> List[Dict[str, Any]]:
+def parse_data(data_raw, workers: int = 1, batch_size: int = 32):
     """
-    Create overlapping chunks from a sequence using a sliding window approach.
+    Parse the frontmatter of the podcast pages and keep the ones with a transcript.
 
     Args:
-        seq: The input sequence (string or list) to be chunked.
-        size (int): The size of each chunk/window.
-        step (int): The step size between consecutive windows.
+        data_raw: An iterable of RawRepositoryFile objects.
+        workers (int, optional): Number of processes parsing the YAML.
+                                 Defaults to 1, which parses in this process.
+        batch_size (int, optional): Number of files sent to a worker at once.
 
     Returns:
-        list: A list of dictionaries, each containing:
-            - 'start': The starting position of the chunk in the original sequence
-            - 'content': The chunk content
+        list: The parsed documents, in the order of data_raw.
+    """
+    files = ((f.filename, f.content) for f in data_raw)
 
-    Raises:
-        ValueError: If size or step are not positive integers.
+    if workers <= 1:
+        parsed = (parse_file(filename, content) for filename, content in files)
+    else:
+        batches = iter(lambda: list(islice(files, batch_size)), [])
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = [data for batch in executor.map(_parse_batch, batches) for data in batch]
 
-    Example:
-        >>> sliding_window("hello world", size=5, step=3)
-        [{'start': 0, 'content': 'hello'}, {'start': 3, 'content': 'lo wo'}]
+    return [data for data in parsed if data is not None]
+
+
+# blank line separating paragraphs inside a transcript line
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def extract_only_transcript_text(doc_content):
+    """
+    Join the first paragraph of every transcript line and the section headers
+    into one text. The first entry of the transcript is skipped.
+
+    The pieces are collected in a list and joined once, and only the first
+    paragraph break of a line is searched for instead of splitting all of it.
     """
-    if size <= 0 or step <= 0:
-        raise ValueError("size and step must be positive")
+    parts = []
+    for d in doc_content[1:]:
+        if 'line' in d:
+            line = d['line'].strip()
+            match = PARAGRAPH_BREAK.search(line)
+            parts.append(line[:match.start()] if match else line)
+        elif 'header' in d:
+            parts.append(d['header'])
+
+    return "".join(parts).strip()
 
-    n = len(seq)
-    result = []
-    for i in range(0, n, step):
-        batch = seq[i:i+size]
-        result.append({'start': i, 'content': batch})
-        if i + size > n:
-            break
 
-    return result
 
 
 def chunk_documents(
@@ -144,18 +184,81 @@ def chunk_documents(
     return results
 
 
-def index_documents(documents, chunk: bool = True, chunking_params=None) -> Index:
+def iter_chunk_documents(
+        documents: Iterable[Dict[str, Any]],
+        size: int = 30,
+        step: int = 15,
+        content_field_name: str = 'transcript',
+        unit: str | None = None,
+        id_field_name: str = 'filename'
+) -> Iterator[DocumentChunk]:
+    """
+    Streaming version of chunk_documents that yields one chunk at a time.
+
+    The metadata of a document (all fields except the content field) is
+    stored once and shared by reference by all of its chunks, which only
+    keep a 'parent_id', their position and a view on the transcript text.
+    The chunks can be used like the dicts returned by chunk_documents.
+
+    Args:
+        documents: An iterable of document dictionaries, e.g. a generator.
+        size (int, optional): The maximum size of each chunk. Defaults to 30.
+        step (int, optional): The step size between chunks. Defaults to 15.
+        content_field_name (str, optional): The name of the field containing document content.
+                                          Defaults to 'transcript'.
+        unit (str, optional): None for plain character windows. "chars" or "tokens"
+                              for windows that snap to word and sentence boundaries,
+                              with size and step in characters or approximate tokens.
+        id_field_name (str, optional): The field that identifies a document, used as
+                                       'parent_id'. Defaults to 'filename'.
+
+    Yields:
+        DocumentChunk: A chunk with 'start', 'content', 'parent_id' and the
+        document metadata. 'parent_id' is the value of id_field_name, so it
+        stays the same when chunks of earlier syncs are merged with new ones.
+
+    Example:
+        >>> documents = [{'transcript': [{}, {'line': 'hello world'}], 'filename': 'doc.txt'}]
+        >>> [chunk['content'] for chunk in iter_chunk_documents(documents, size=5, step=5)]
+        ['hello', ' worl', 'd']
+    """
+    for doc in documents:
+        if content_field_name not in doc:
+            continue
+
+        parent_id = doc[id_field_name]
+
+        metadata = {key: value for key, value in doc.items() if key != content_field_name}
+        transcript_text = extract_only_transcript_text(doc[content_field_name])
+
+        if unit is None:
+            views = iter_chunks(transcript_text, size=size, step=step)
+        else:
+            views = iter_boundary_chunks(transcript_text, size=size, step=step, unit=unit)
+
+        for view in views:
+            yield DocumentChunk(view, metadata, parent_id)
+
+
+def index_documents(documents, chunk: bool = True, chunking_params=None, index_class=Index) -> Index:
     """
     Create a searchable index from a collection of documents.
 
     Args:
         documents: A collection of document dictionaries, each containing at least
-                  'content' and 'filename' fields.
+                  'content' and 'filename' fields. Can be a generator, e.g.
+                  iter_chunk_documents() with chunk=False.
         chunk (bool, optional): Whether to chunk documents before indexing.
                                Defaults to False.
         chunking_params (dict, optional): Parameters for document chunking.
-                                        Defaults to {'size': 2000, 'step': 1000}.
-                                        Only used when chunk=True.
+                                        Defaults to {'size': 30, 'step': 15}.
+                                        Only used when chunk=True. E.g.
+                                        {'size': 128, 'step': 64, 'unit': 'tokens'}
+                                        creates fewer chunks that keep whole words.
+        index_class (optional): Index class to fit, minsearch Index by default.
+                                common.bm25.BM25Index has the same interface
+                                and ranks with BM25. Only an Index can be
+                                saved with save_index().
 
     Returns:
         Index: A fitted minsearch Index object ready for searching.
@@ -168,32 +271,159 @@ def index_documents(documents, chunk: bool = True, chunking_params=None) -> Inde
     if chunk:
         if chunking_params is None:
             chunking_params = {'size': 30, 'step': 15}
-        documents = chunk_documents(documents, **chunking_params)
+        documents = iter_chunk_documents(documents, **chunking_params)
+
+    # minsearch keeps the documents in a list, the chunks are created lazily
+    # one by one and share their podcast metadata
+    documents = list(documents)
+    if chunk:
         print(f"We have generated {len(documents)} chunks from the podcasts")
 
-    index = Index(
+    index = index_class(
         text_fields=["content", "title"],
     )
 
     index.fit(documents)
     return index
 
+def sync_index(data_raw, manifest_path=MANIFEST_PATH, chunking_params=None, workers: int = 1) -> Index:
+    """
+    Incrementally bring the podcast index up to date with the repository files.
+
+    Only files that were added or changed since the last sync are parsed
+    and chunked. Chunks of unchanged files come from the manifest, and
+    chunks of removed files are dropped.
+
+    Args:
+        data_raw: RawRepositoryFile objects of the current archive.
+        manifest_path (str, optional): Where the manifest is stored between runs.
+        chunking_params (dict, optional): Parameters for iter_chunk_documents.
+                                        Defaults to {'size': 30, 'step': 15, 'id_field_name': 'filename'}.
+        workers (int, optional): Number of processes parsing the changed files.
+
+    Returns:
+        Index: A fitted minsearch Index over the chunks of all current files.
+    """
+    _, manifest = sync_manifest(data_raw, manifest_path, chunking_params, workers)
+    return index_documents(manifest.all_chunks(), chunk=False)
+
+
+def sync_manifest(
+        data_raw,
+        manifest_path=MANIFEST_PATH,
+        chunking_params=None,
+        workers: int = 1
+    ) -> tuple[SyncDiff, RepositoryManifest]:
+    """
+    The sync step of sync_index() without fitting an index.
+
+    Returns:
+        tuple: The diff against the previous sync and the updated manifest.
+    """
+    if chunking_params is None:
+        # id_field_name is part of the params so that manifests stored with
+        # position based parent ids are chunked again
+        chunking_params = {'size': 30, 'step': 15, 'id_field_name': 'filename'}
+
+    manifest = RepositoryManifest(manifest_path, chunking_params)
+    diff, to_process = manifest.diff(data_raw)
+    print(f"Sync: {len(diff.added)} added, {len(diff.changed)} changed, {len(diff.removed)} removed")
+
+    if not diff.is_empty:
+        chunks = iter_chunk_documents(parse_data(to_process, workers=workers), **chunking_params)
+        manifest.update(diff, to_process, chunks)
+        manifest.save()
+
+    return diff, manifest
+
+
 def search_index(index, query, n):
+    # index may be a CachedIndex, then repeated queries skip the search
     search_result = index.search(query, num_results=n)
 
     return search_result
 
 
-def main():
+def search_index_many(index, queries, n):
+    # all queries are scored in one batch, e.g. for an evaluation set
+    if isinstance(index, CachedIndex):
+        return index.search_many(queries, num_results=n)
+    return search_many(index, queries, num_results=n)
+
+
+def build_index(incremental: bool = True) -> Index:
     # Downloading and extracting the github data
     data_raw = read_github_data()
     print(f"Downloaded {len(data_raw)} podcast transcripts")
 
+    if incremental:
+        # Only parse and chunk the episodes that changed since the last run
+        return sync_index(data_raw, workers=os.cpu_count() or 1)
+
     # Parsing the data to the dictionary format
-    parsed_data = parse_data(data_raw)
+    parsed_data = parse_data(data_raw, workers=os.cpu_count() or 1)
 
     #Chunk the data and index using minsearch
-    index = index_documents(parsed_data)
+    return index_documents(parsed_data)
+
+
+def get_index(
+        incremental: bool = True,
+        refresh: bool = False,
+        snapshot_dir=INDEX_SNAPSHOT_DIR,
+        manifest_path=MANIFEST_PATH
+    ) -> Index:
+    """
+    The podcast index, from the saved snapshot while the repository is unchanged.
+
+    The cached archive is revalidated with its ETag first. If its digest
+    is the one the snapshot was saved with, the memory-mapped snapshot is
+    loaded without extracting any file. Otherwise the files are synced
+    with the manifest, and the index is fitted on the manifest chunks and
+    saved as the new snapshot if a podcast file was added, changed or
+    removed.
+
+    Args:
+        incremental (bool, optional): Sync with the manifest. False rebuilds
+                                      the index from scratch on every call.
+        refresh (bool, optional): Ignore the snapshot and fit the index again.
+        snapshot_dir (str, optional): Directory of the saved index.
+        manifest_path (str, optional): Where the manifest is stored between runs.
+
+    Returns:
+        Index: The fitted or loaded index.
+    """
+    if not incremental:
+        index = build_index(incremental=False)
+        save_index(index, snapshot_dir)
+        return index
+
+    reader = repository_reader()
+    archive, digest = reader.fetch_archive()
+
+    saved_info = None if refresh else snapshot_info(snapshot_dir)
+    if saved_info is not None and saved_info.get("archive_digest") == digest:
+        return load_index(snapshot_dir)
+
+    data_raw = reader.read_archive(archive)
+    print(f"Downloaded {len(data_raw)} podcast transcripts")
+    diff, manifest = sync_manifest(data_raw, manifest_path, workers=os.cpu_count() or 1)
+
+    info = {"archive_digest": digest}
+    if diff.is_empty and saved_info is not None:
+        # other files of the repository changed, the snapshot is still valid
+        update_snapshot_info(snapshot_dir, info)
+        return load_index(snapshot_dir)
+
+    index = index_documents(manifest.all_chunks(), chunk=False)
+    save_index(index, snapshot_dir, info)
+    return index
+
+
+def main(incremental: bool = True, refresh: bool = False):
+    # A saved index is memory-mapped, no vectorizing while the repository
+    # is unchanged. refresh=True fits it again.
+    index = CachedIndex(get_index(incremental, refresh))
 
     # Test the question 
     query = "how do I make money with AI?"
@@ -0,0 +1,219 @@
+import json
+import os
+from collections.abc import Sequence
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from minsearch import Index
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+class LazyDocuments(Sequence):
+    """
+    Read-only list of documents stored as JSON lines, decoded on access.
+
+    The byte offset of every document is kept in a separate array, so
+    loading the store does not parse any JSON and a search only decodes
+    the documents it returns.
+    """
+
+    def __init__(self, path: str | Path, offsets: np.ndarray):
+        self.path = Path(path)
+        self.offsets = offsets
+        self._mmap = np.memmap(self.path, dtype=np.uint8, mode="r") if offsets[-1] > 0 else None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("document index out of range")
+
+        raw = self._mmap[self.offsets[i]:self.offsets[i + 1]].tobytes()
+        return json.loads(raw)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _vectorizer_params(vectorizer: TfidfVectorizer) -> Dict[str, Any]:
+    # dtype, callables etc. are not JSON serializable, minsearch leaves them at the defaults
+    params = {}
+    for key, value in vectorizer.get_params().items():
+        if isinstance(value, (str, int, float, bool, tuple, type(None))):
+            params[key] = value
+    return params
+
+
+def save_index(index: Index, directory: str | Path, info: Dict[str, Any] | None = None) -> None:
+    """
+    Write a fitted minsearch Index to a directory.
+
+    For every text field, the vocabulary goes to a JSON file and the IDF
+    weights and the CSR arrays of the TF-IDF matrix to .npy files, which
+    load_index() can memory-map. The documents are stored as JSON lines
+    with an offsets array. Dates are stored as ISO strings.
+
+    Args:
+        index: A fitted Index
+        directory: Directory for the snapshot, created if needed
+        info: Optional JSON serializable data about the source of the index,
+              e.g. the digest of the archive it was built from
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    meta = {
+        "text_fields": index.text_fields,
+        "keyword_fields": index.keyword_fields,
+        "num_docs": len(index.docs),
+        "fields": {},
+        "info": info or {},
+    }
+
+    for i, field in enumerate(index.text_fields):
+        if field not in index.text_matrices:
+            continue
+
+        vectorizer = index.vectorizers[field]
+        matrix = index.text_matrices[field].tocsr()
+
+        with open(directory / f"field{i}.vocab.json", "w", encoding="utf-8") as f_out:
+            json.dump(vectorizer.get_feature_names_out().tolist(), f_out)
+
+        np.save(directory / f"field{i}.idf.npy", vectorizer.idf_)
+        np.save(directory / f"field{i}.data.npy", matrix.data)
+        np.save(directory / f"field{i}.indices.npy", matrix.indices)
+        np.save(directory / f"field{i}.indptr.npy", matrix.indptr)
+
+        meta["fields"][field] = {
+            "file_prefix": f"field{i}",
+            "shape": list(matrix.shape),
+            "vectorizer_params": _vectorizer_params(vectorizer),
+        }
+
+    offsets = [0]
+    with open(directory / "docs.jsonl", "wb") as f_out:
+        for doc in index.docs:
+            line = json.dumps(dict(doc), default=_json_default).encode("utf-8") + b"\n"
+            f_out.write(line)
+            offsets.append(offsets[-1] + len(line))
+    np.save(directory / "docs.offsets.npy", np.array(offsets, dtype=np.int64))
+
+    keyword_data = {}
+    if index.keyword_df is not None:
+        keyword_data = {
+            field: [None if pd.isna(value) else value for value in index.keyword_df[field].tolist()]
+            for field in index.keyword_fields
+        }
+    with open(directory / "keywords.json", "w", encoding="utf-8") as f_out:
+        json.dump(keyword_data, f_out, default=_json_default)
+
+    # written last: a snapshot without meta.json is incomplete
+    _write_meta(directory, meta)
+
+
+def _write_meta(directory: Path, meta: Dict[str, Any]) -> None:
+    tmp_path = directory / "meta.json.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f_out:
+        json.dump(meta, f_out)
+    os.replace(tmp_path, directory / "meta.json")
+
+
+def snapshot_info(directory: str | Path) -> Dict[str, Any] | None:
+    """
+    The info saved with a snapshot, without loading the index.
+
+    Returns:
+        The info dict of save_index(), None if there is no complete snapshot
+    """
+    meta_path = Path(directory) / "meta.json"
+    if not meta_path.exists():
+        return None
+
+    with open(meta_path, "r", encoding="utf-8") as f_in:
+        return json.load(f_in).get("info", {})
+
+
+def update_snapshot_info(directory: str | Path, info: Dict[str, Any]) -> None:
+    """
+    Replace the info of a saved snapshot, e.g. when the source changed
+    without changing the index. The index files are not touched.
+    """
+    directory = Path(directory)
+    with open(directory / "meta.json", "r", encoding="utf-8") as f_in:
+        meta = json.load(f_in)
+
+    meta["info"] = info
+    _write_meta(directory, meta)
+
+
+def load_index(directory: str | Path, mmap: bool = True) -> Index:
+    """
+    Load an Index written by save_index() without refitting it.
+
+    Args:
+        directory: Directory of the snapshot
+        mmap: Memory-map the matrices and the document store instead of
+              reading them into memory
+
+    Returns:
+        Index: A minsearch Index ready for searching
+    """
+    directory = Path(directory)
+    mmap_mode = "r" if mmap else None
+
+    with open(directory / "meta.json", "r", encoding="utf-8") as f_in:
+        meta = json.load(f_in)
+
+    index = Index(text_fields=meta["text_fields"], keyword_fields=meta["keyword_fields"])
+
+    for field, info in meta["fields"].items():
+        prefix = directory / info["file_prefix"]
+
+        params = info["vectorizer_params"]
+        params["ngram_range"] = tuple(params["ngram_range"])
+        vectorizer = TfidfVectorizer(**params)
+
+        with open(f"{prefix}.vocab.json", "r", encoding="utf-8") as f_in:
+            vectorizer.vocabulary_ = {term: i for i, term in enumerate(json.load(f_in))}
+        vectorizer.idf_ = np.load(f"{prefix}.idf.npy")
+
+        matrix = csr_matrix(
+            (
+                np.load(f"{prefix}.data.npy", mmap_mode=mmap_mode),
+                np.load(f"{prefix}.indices.npy", mmap_mode=mmap_mode),
+                np.load(f"{prefix}.indptr.npy", mmap_mode=mmap_mode),
+            ),
+            shape=tuple(info["shape"]),
+            copy=False,
+        )
+
+        index.vectorizers[field] = vectorizer
+        index.text_matrices[field] = matrix
+
+    offsets = np.load(directory / "docs.offsets.npy", mmap_mode=mmap_mode)
+    if mmap:
+        index.docs = LazyDocuments(directory / "docs.jsonl", offsets)
+    else:
+        with open(directory / "docs.jsonl", "r", encoding="utf-8") as f_in:
+            index.docs = [json.loads(line) for line in f_in]
+
+    with open(directory / "keywords.json", "r", encoding="utf-8") as f_in:
+        keyword_data = json.load(f_in)
+    index.keyword_df = pd.DataFrame({field: keyword_data.get(field, []) for field in index.keyword_fields})
+
+    return index
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from github_helper import RawRepositoryFile
+
+
+@dataclass
+class FileRecord:
+    content_hash: str
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class SyncDiff:
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class RepositoryManifest:
+    """
+    Local record of the files that went into the index.
+
+    Keeps the content hash of every repository file together with the chunks
+    it produced, so a sync only needs to parse and chunk the files whose
+    hash changed. The manifest is tied to the chunking parameters: if they
+    change, every file counts as changed.
+    """
+
+    def __init__(self, path: str | Path, chunking_params: Dict[str, Any] | None = None):
+        """
+        Load the manifest from disk, or start an empty one.
+
+        Args:
+            path: File the manifest is pickled to
+            chunking_params: Parameters the stored chunks were created with
+        """
+        self.path = Path(path)
+        self.chunking_params = chunking_params or {}
+        self.records: Dict[str, FileRecord] = {}
+
+        if self.path.exists():
+            with open(self.path, "rb") as f_in:
+                saved = pickle.load(f_in)
+            if saved["chunking_params"] == self.chunking_params:
+                self.records = saved["records"]
+
+    def diff(self, files: Iterable[RawRepositoryFile]) -> tuple[SyncDiff, List[RawRepositoryFile]]:
+        """
+        Compare a fresh list of repository files against the manifest.
+
+        Args:
+            files: Files of the new archive
+
+        Returns:
+            The diff, and the added or changed files that need processing
+        """
+        diff = SyncDiff()
+        to_process = []
+        seen = set()
+
+        for f in files:
+            seen.add(f.filename)
+            record = self.records.get(f.filename)
+
+            if record is None:
+                diff.added.append(f.filename)
+            elif record.content_hash != content_hash(f.content):
+                diff.changed.append(f.filename)
+            else:
+                continue
+
+            to_process.append(f)
+
+        diff.removed = [filename for filename in self.records if filename not in seen]
+
+        return diff, to_process
+
+    def update(self,
+                diff: SyncDiff,
+                processed: Iterable[RawRepositoryFile],
+                chunks: Iterable[Dict[str, Any]]
+        ) -> None:
+        """
+        Apply a diff: drop removed files and store the new chunks.
+
+        Args:
+            diff: The diff returned by diff()
+            processed: The files returned by diff(), after processing
+            chunks: Chunks created from the processed files. Each chunk has a
+                    'filename' field. Files without chunks are still recorded,
+                    so they are not parsed again
+        """
+        for filename in diff.removed:
+            del self.records[filename]
+
+        for f in processed:
+            self.records[f.filename] = FileRecord(content_hash=content_hash(f.content))
+
+        for chunk in chunks:
+            self.records[chunk["filename"]].chunks.append(chunk)
+
+    def all_chunks(self) -> List[Dict[str, Any]]:
+        """
+        Chunks of all files in the manifest, in filename order.
+        """
+        return [
+            chunk
+            for filename in sorted(self.records)
+            for chunk in self.records[filename].chunks
+        ]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f_out:
+            pickle.dump({"chunking_params": self.chunking_params, "records": self.records}, f_out)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,19 @@
+from github_helper import RawRepositoryFile
+
+
+def make_podcast_file(episode: int, lines: list[str]) -> RawRepositoryFile:
+    """Build a podcast page shaped like the ones in datatalksclub.github.io."""
+    transcript = "\n".join(
+        f"- line: {line}\n  sec: {i}\n  who: Guest" for i, line in enumerate(lines)
+    )
+    content = (
+        "---\n"
+        f"title: Episode {episode}\n"
+        "season: 1\n"
+        f"episode: {episode}\n"
+        "transcript:\n"
+        "- header: Intro\n"
+        f"{transcript}\n"
+        "---\n"
+    )
+    return RawRepositoryFile(filename=f"_podcast/s01e{episode:02d}.md", content=content)
@@ -0,0 +1,117 @@
+import hashlib
+import zipfile
+
+from bench_utils import make_synthetic_repo_zip, serve_archives
+from archive_cache import ArchiveCache
+import github_helper
+from github_helper import GithubRepositoryDataReader
+
+
+def test_stream_yields_same_files_as_read(tmp_path):
+    make_synthetic_repo_zip(tmp_path / "repo.zip", num_files=20, words_per_file=50)
+
+    with serve_archives(tmp_path) as server:
+        reader = GithubRepositoryDataReader(
+            "owner",
+            "repo",
+            allowed_extensions={"md"},
+            filename_filter=lambda filepath: "_podcast" in filepath,
+            base_url=server.url
+        )
+        files_read = reader.read()
+        files_streamed = list(reader.stream())
+
+    assert len(files_read) == 20
+    assert files_streamed == files_read
+    assert files_read[0].filename == "_podcast/s01/episode-000000.md"
+    assert files_read[0].content.startswith("---")
+
+
+def test_cache_revalidates_with_etag(tmp_path):
+    make_synthetic_repo_zip(tmp_path / "repo.zip", num_files=5, words_per_file=50)
+    cache = ArchiveCache(tmp_path / "cache")
+
+    with serve_archives(tmp_path) as server:
+        reader = GithubRepositoryDataReader("owner", "repo", base_url=server.url, cache=cache)
+
+        first = reader.read()
+        bytes_after_download = server.bytes_sent
+        second = list(reader.stream())
+        archive, digest = reader.fetch_archive()
+
+        assert server.requests == 3
+        assert server.bytes_sent == bytes_after_download
+
+    assert first == second == reader.read_archive(archive)
+    assert digest == hashlib.sha256((tmp_path / "repo.zip").read_bytes()).hexdigest()
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ArchiveCache(tmp_path / "cache", max_bytes=250)
+
+    cache.store("owner/a/main", [b"a" * 100])
+    cache.store("owner/b/main", [b"b" * 100])
+    cache.hit("owner/a/main")
+    cache.store("owner/c/main", [b"c" * 100])
+
+    assert set(cache.entries) == {"owner/a/main", "owner/c/main"}
+    assert len(list(cache.objects_dir.glob("*.zip"))) == 2
+    assert ArchiveCache(tmp_path / "cache").entries.keys() == cache.entries.keys()
+
+
+def test_parallel_extraction_keeps_archive_order(tmp_path):
+    archive = make_synthetic_repo_zip(tmp_path / "repo.zip", num_files=50, words_per_file=20)
+    sequential = GithubRepositoryDataReader("owner", "repo")
+
+    for use_processes in [False, True]:
+        parallel = GithubRepositoryDataReader(
+            "owner",
+            "repo",
+            workers=3,
+            use_processes=use_processes
+        )
+
+        assert list(parallel._iter_archive(archive)) == list(sequential._iter_archive(archive))
+        assert list(parallel._iter_archive(archive.read_bytes())) == list(sequential._iter_archive(archive))
+
+
+def test_parallel_extraction_closes_archive_handles(tmp_path, monkeypatch):
+    archive = make_synthetic_repo_zip(tmp_path / "repo.zip", num_files=50, words_per_file=20)
+    reader = GithubRepositoryDataReader("owner", "repo", workers=3)
+
+    handles = []
+
+    def open_zip(archive):
+        handles.append(zipfile.ZipFile(archive))
+        return handles[-1]
+
+    monkeypatch.setattr(github_helper, "_open_zip", open_zip)
+    list(reader._iter_archive(archive))
+
+    assert len(handles) > 1
+    assert all(zf.fp is None for zf in handles)
+
+
+def test_globs_skip_members_without_inflating(tmp_path):
+    archive = make_synthetic_repo_zip(tmp_path / "repo.zip", num_files=10, words_per_file=20)
+    reader = GithubRepositoryDataReader(
+        "owner",
+        "repo",
+        allowed_extensions={"md"},
+        include=["_podcast/**"],
+        exclude=["**/episode-000000.md"]
+    )
+
+    files = list(reader._iter_archive(archive))
+
+    with zipfile.ZipFile(archive) as zf:
+        skipped = [
+            info for info in zf.infolist()
+            if info.filename.endswith(("/README.md", "/.gitignore", "/episode-000000.md"))
+        ]
+
+    assert [f.filename for f in files] == [f"_podcast/s01/episode-{i:06d}.md" for i in range(1, 10)]
+    assert reader.skipped_files == len(skipped)
+    assert reader.skipped_bytes == sum(info.file_size for info in skipped)
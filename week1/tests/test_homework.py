@@ -0,0 +1,72 @@
+from homework import (
+    chunk_documents,
+    extract_only_transcript_text,
+    index_documents,
+    iter_chunk_documents,
+    parse_data,
+    search_index,
+)
+from common.bm25 import BM25Index
+from github_helper import RawRepositoryFile
+from index_snapshot import load_index, save_index
+from podcast_utils import make_podcast_file
+
+
+def test_transcript_keeps_first_paragraph_of_each_line():
+    transcript = [
+        {'header': 'Skipped'},
+        {'header': 'Intro. '},
+        {'line': '  Hello there. \n\n This paragraph is dropped.', 'sec': 1},
+        {'line': 'Second line.', 'sec': 2},
+        {'sec': 3},
+    ]
+
+    assert extract_only_transcript_text(transcript) == "Intro. Hello there. Second line."
+
+
+def test_streamed_chunks_match_chunk_documents():
+    documents = parse_data([
+        make_podcast_file(1, ["we talk about data engineering and pipelines"]),
+        make_podcast_file(2, ["how to get a job in machine learning"]),
+    ])
+
+    streamed = list(iter_chunk_documents(iter(documents), size=20, step=10))
+    copied = chunk_documents(documents, size=20, step=10)
+
+    assert [{**chunk} for chunk in streamed] == [{**chunk, 'parent_id': chunk['filename']} for chunk in copied]
+    assert streamed[0].parent is streamed[1].parent
+
+    index = index_documents(iter(documents), chunking_params={'size': 20, 'step': 10})
+    result = search_index(index, "machine learning", 1)
+    assert result[0]['title'] == "Episode 2"
+    assert index.search("machine learning", num_results=1, output_ids=True)[0]['_id'] > 0
+
+    bm25 = index_documents(iter(documents), chunking_params={'size': 20, 'step': 10}, index_class=BM25Index)
+    assert search_index(bm25, "machine learning", 1)[0]['title'] == "Episode 2"
+
+
+def test_parallel_parse_keeps_order_and_skips_pages_without_transcript():
+    files = [make_podcast_file(i, [f"line of episode {i}"]) for i in range(1, 8)]
+    files.insert(3, RawRepositoryFile(filename="_podcast/s01.md", content="---\ntitle: Season 1\n---\n"))
+
+    serial = parse_data(files)
+    parallel = parse_data(files, workers=2, batch_size=2)
+
+    assert parallel == serial
+    assert [doc['episode'] for doc in parallel] == list(range(1, 8))
+
+
+def test_index_snapshot_gives_same_results(tmp_path):
+    documents = parse_data([
+        make_podcast_file(1, ["we talk about data engineering and pipelines"]),
+        make_podcast_file(2, ["how to get a job in machine learning"]),
+        make_podcast_file(3, ["machine learning engineering in production"]),
+    ])
+    index = index_documents(documents, chunking_params={'size': 40, 'step': 20})
+
+    save_index(index, tmp_path / "index")
+    loaded = load_index(tmp_path / "index")
+
+    for query in ["machine learning", "data pipelines", "nothing matches"]:
+        assert search_index(loaded, query, 3) == [dict(doc) for doc in search_index(index, query, 3)]
+    assert len(loaded.docs) == len(index.docs)
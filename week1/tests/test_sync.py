@@ -0,0 +1,106 @@
+import hashlib
+
+import homework
+from github_helper import RawRepositoryFile
+from podcast_utils import make_podcast_file
+
+
+def test_sync_only_parses_changed_files(tmp_path, monkeypatch):
+    manifest_path = tmp_path / "manifest.pkl"
+    params = {'size': 200, 'step': 100}
+
+    first = [
+        make_podcast_file(1, ["we talk about data engineering"]),
+        make_podcast_file(2, ["how to get a job in machine learning"]),
+        make_podcast_file(3, ["building a startup"]),
+        RawRepositoryFile(filename="_podcast/s01.md", content="no frontmatter here"),
+    ]
+    homework.sync_index(first, manifest_path, params)
+
+    parsed = []
+    parse_data = homework.parse_data
+
+    def spy(files, **kwargs):
+        parsed.extend(f.filename for f in files)
+        return parse_data(files, **kwargs)
+
+    monkeypatch.setattr(homework, "parse_data", spy)
+
+    second = [
+        first[0],
+        make_podcast_file(2, ["how to become a data scientist"]),
+        first[3],
+        make_podcast_file(4, ["kubernetes for data scientists"]),
+    ]
+    index = homework.sync_index(second, manifest_path, params)
+
+    assert parsed == ["_podcast/s01e02.md", "_podcast/s01e04.md"]
+    assert {doc['episode'] for doc in index.docs} == {1, 2, 4}
+    # chunks of the stored and the newly parsed files keep one parent_id per file
+    assert {doc['parent_id'] for doc in index.docs} == {doc['filename'] for doc in index.docs}
+    assert len({(doc['episode'], doc['parent_id']) for doc in index.docs}) == 3
+    assert homework.search_index(index, "data scientist", 1)[0]['episode'] in (2, 4)
+
+    parsed.clear()
+    homework.sync_index(second, manifest_path, params)
+    assert parsed == []
+
+
+class FakeReader:
+    """
+    Stands in for the repository reader, the archive digest changes
+    with the files and with other_files, which are not podcast files.
+    """
+
+    def __init__(self, files):
+        self.files = files
+        self.other_files = 0
+        self.extracted = 0
+
+    def fetch_archive(self):
+        digest = hashlib.sha256(repr(([f.content for f in self.files], self.other_files)).encode()).hexdigest()
+        return "archive.zip", digest
+
+    def read_archive(self, archive):
+        self.extracted += 1
+        return list(self.files)
+
+
+def test_get_index_reuses_snapshot_while_archive_is_unchanged(tmp_path, monkeypatch):
+    reader = FakeReader([
+        make_podcast_file(1, ["we talk about data engineering"]),
+        make_podcast_file(2, ["how to get a job in machine learning"]),
+    ])
+    monkeypatch.setattr(homework, "repository_reader", lambda: reader)
+
+    loaded = []
+    load_index = homework.load_index
+    monkeypatch.setattr(homework, "load_index", lambda path: loaded.append(path) or load_index(path))
+
+    paths = {"snapshot_dir": tmp_path / "index", "manifest_path": tmp_path / "manifest.pkl"}
+    homework.get_index(**paths)
+    assert (len(loaded), reader.extracted) == (0, 1)
+
+    # same archive: the snapshot is loaded without extracting the files
+    index = homework.get_index(**paths)
+    assert (len(loaded), reader.extracted) == (1, 1)
+    assert {doc['episode'] for doc in index.docs} == {1, 2}
+
+    # a new episode is synced and saved in the snapshot
+    reader.files.append(make_podcast_file(3, ["kubernetes for data scientists"]))
+    index = homework.get_index(**paths)
+    assert (len(loaded), reader.extracted) == (1, 2)
+    assert {doc['episode'] for doc in index.docs} == {1, 2, 3}
+
+    index = homework.get_index(**paths)
+    assert (len(loaded), reader.extracted) == (2, 2)
+    assert {doc['episode'] for doc in index.docs} == {1, 2, 3}
+
+    # only other files changed: the snapshot is kept and gets the new digest
+    reader.other_files += 1
+    homework.get_index(**paths)
+    homework.get_index(**paths)
+    assert (len(loaded), reader.extracted) == (4, 3)
+
+    homework.get_index(refresh=True, **paths)
+    assert (len(loaded), reader.extracted) == (4, 4)
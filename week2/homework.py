@@ -1,18 +1,24 @@
 import requests
 from typing import Optional
-from minsearch import AppendableIndex
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.messages import FunctionToolCallEvent
 from pydantic import BaseModel
-import re
 from toyaikit.chat.interface import StdOutputInterface
 from toyaikit.chat.runners import PydanticAIRunner
-from typing import Any, Dict, Iterable, List
 import asyncio
+import httpx
+
+from common import http_client
+from common.buffered_index import BufferedAppendableIndex
+from common.chunking import iter_boundary_chunks
+from common.page_cache import PageCache
+from common.reader_parser import ReaderPage
+from common.search_cache import CachedIndex
 
 
 
 reader_url_prefix = "https://r.jina.ai/"
+PAGE_CACHE_DIR = ".cache/pages"
 
 # Defining all helper classes and functions
 
@@ -44,51 +50,18 @@ class FetchParams(BaseModel):
     url: str
 
 
-def sliding_window(
-        seq: Iterable[Any],
-        size: int,
-        step: int
-    ) -> List[Dict[str, Any]]:
-    """
-    Create overlapping chunks from a sequence using a sliding window approach.
-
-    Args:
-        seq: The input sequence (string or list) to be chunked.
-        size (int): The size of each chunk/window.
-        step (int): The step size between consecutive windows.
-
-    Returns:
-        list: A list of dictionaries, each containing:
-            - 'start': The starting position of the chunk in the original sequence
-            - 'content': The chunk content
-
-    Raises:
-        ValueError: If size or step are not positive integers.
-
-    Example:
-        >>> sliding_window("hello world", size=5, step=3)
-        [{'start': 0, 'content': 'hello'}, {'start': 3, 'content': 'lo wo'}]
-    """
-    if size <= 0 or step <= 0:
-        raise ValueError("size and step must be positive")
-
-    n = len(seq)
-    result = []
-    for i in range(0, n, step):
-        batch = seq[i:i+size]
-        result.append({'start': i, 'content': batch})
-        if i + size > n:
-            break
-
-    return result
 
 
 
 # Main agent class that will be used for defining the agent tools
 class AgentTools:
 
-    def __init__(self, index):
-        self.index = index
+    def __init__(self, index, page_cache: PageCache | None = None):
+        # search results are cached until add_to_index() appends new chunks
+        self.index = CachedIndex(index)
+        self.page_cache = page_cache
+        # pages read again come from the cache and are not indexed twice
+        self.indexed_urls = set()
 
     @staticmethod
     def get_all_webpage_data(url) -> Optional[str]:
@@ -113,7 +86,7 @@ class AgentTools:
         reader_url = reader_url_prefix + url
 
         try:
-            response = requests.get(reader_url, timeout=10)
+            response = http_client.get(reader_url, timeout=10)
             response.raise_for_status()  # raises for 4xx/5xx HTTP errors
             return response.content.decode("utf-8")
         except (requests.exceptions.RequestException, UnicodeDecodeError) as e:
@@ -123,75 +96,62 @@ class AgentTools:
     
     @staticmethod
     def parse_data(raw_data):
+        """
+        Header metadata (title, url_source, published_time) and the
+        markdown_content of Jina Reader output, read in one pass.
+        """
+        return ReaderPage(raw_data.splitlines()).to_dict()
 
-        lines = raw_data.splitlines()
-
-        metadata = {
-            "title": None,
-            "url_source": "",
-            "published_time": None,
-            "markdown_content": None
-        }
-
-        meta_lines = []
-        content_start = 0
-
-        # Identify metadata lines at the top (e.g. "Title: ...")
-        for i, line in enumerate(lines):
-            if re.match(r"^[A-Z][\w\s-]*:\s", line):
-                meta_lines.append(line)
-            elif not line.strip():  # skip empty lines
-                continue
-            else:
-                content_start = i
-                break
-
-        # Parse key-value metadata lines
-        for line in meta_lines:
-            key, value = line.split(":", 1)
-            key = key.lower().strip().replace(" ", "_")
-            if key in metadata:
-                metadata[key] = value.strip()
-
-            content = "\n".join(lines[content_start:]).strip()
-
-            # Infer title from first Markdown heading if missing
-            if not metadata["title"]:
-                match = re.search(r"^#\s*(.+)", content)
-                if match:
-                    metadata["title"] = match.group(1).strip()
-
-            metadata["markdown_content"] = content
 
-        return metadata
+    def get_page_data(self, url) -> Optional[str]:
+        """
+        Markdown content of a web page from the page cache, fetched with
+        get_all_webpage_data() if it is not cached.
+        """
+        if self.page_cache is None:
+            return self.get_all_webpage_data(url)
+        return self.page_cache.get_or_fetch(url, self.get_all_webpage_data)
 
 
     def fetch_web_page(self, params: FetchParams) -> Optional[str]:
-        f"""
-        Returns web page content for {params}
         """
-        # raw_data = cls.get_all_webpage_data(params.url)
-        # print(raw_data)
-        metadata = self.parse_data(self.get_all_webpage_data(params.url))
+        Returns the Markdown content of the web page and adds it to the index.
+        """
+        raw_data = self.get_page_data(params.url)
+        if raw_data is None:
+            return None
 
-        self.add_to_index(self.parse_data(self.get_all_webpage_data(params.url)))
+        page = ReaderPage(raw_data.splitlines())
+        self.add_page_to_index(params.url, page)
 
-        return metadata["markdown_content"]
+        return page.markdown_content
+
+
+    def add_page_to_index(self, url, page: ReaderPage):
+        if url not in self.indexed_urls:
+            self.add_to_index(page)
+            self.indexed_urls.add(url)
     
 
-    def add_to_index(self, metadata):
-        content = metadata["markdown_content"]
-        chunks = sliding_window(content, size=3000, step=1000)
+    def add_to_index(self, page: ReaderPage):
+        metadata = page.metadata
 
-        for chunk in chunks:
-            doc = {
+        # every section is chunked as soon as it is parsed. Chunks are views on
+        # the section that end on word or sentence boundaries, each one is
+        # copied only when indexed
+        docs = (
+            {
             "title": metadata["title"],
             "url_source": metadata["url_source"],
             "published_time": metadata["published_time"],
-            "content": chunk["content"]
+            "content": chunk.content
             }
+            for section in page.sections()
+            for chunk in iter_boundary_chunks(section.content, size=3000, step=1000)
+        )
 
-            self.index.append(doc)
+        # all chunks of the page are merged into the index at once
+        self.index.extend(docs)
 
 
     def search(self, params: FetchQuery):
@@ -202,12 +162,80 @@ class AgentTools:
         output = [r["content"] for r in result]
 
         return "\n\n".join(output)
+
+
+
+class AsyncAgentTools(AgentTools):
+    """
+    AgentTools with an async fetch_web_page, so the pages of parallel tool
+    calls are downloaded concurrently on the event loop instead of holding
+    a worker thread each. search is async too: searching flushes the
+    buffered index, so every index access stays on the event loop thread
+    instead of running on a worker thread while fetch_web_page adds a page.
+    """
+
+    @staticmethod
+    async def get_all_webpage_data_async(url) -> Optional[str]:
+        """
+        Async version of get_all_webpage_data(), returns None if the request fails.
+        """
+        reader_url = reader_url_prefix + url
+
+        try:
+            response = await http_client.aget(reader_url, timeout=10)
+            response.raise_for_status()  # raises for 4xx/5xx HTTP errors
+            return response.content.decode("utf-8")
+        except (httpx.HTTPError, UnicodeDecodeError) as e:
+            print(f"Error fetching content from {url}: {e}")
+            return None
+
+
+    async def get_page_data_async(self, url) -> Optional[str]:
+        """
+        Async version of get_page_data().
+        """
+        if self.page_cache is None:
+            return await self.get_all_webpage_data_async(url)
+        return await self.page_cache.get_or_fetch_async(url, self.get_all_webpage_data_async)
+
+
+    async def fetch_web_page(self, params: FetchParams) -> Optional[str]:
+        """
+        Returns the Markdown content of the web page and adds it to the index.
+        """
+        raw_data = await self.get_page_data_async(params.url)
+        if raw_data is None:
+            return None
+
+        page = ReaderPage(raw_data.splitlines())
+        self.add_page_to_index(params.url, page)
+
+        return page.markdown_content
+
+
+    async def search(self, params: FetchQuery):
+        """
+        Search the index for documents matching the given query and return the contents.
+        """
+        return super().search(params)
     
 
 
 # Instanciating the agent_class
-index = AppendableIndex(text_fields=["title", "url_source", "published_time", "content"])
-agent_class = AgentTools(index)
+def create_index(index_class=BufferedAppendableIndex):
+    """
+    Empty index of the web page chunks.
+
+    Args:
+        index_class (optional): BufferedAppendableIndex by default, which merges
+                                the chunks of a page in one step. common.bm25.BM25Index
+                                has the same interface and ranks with BM25 instead of TF-IDF.
+    """
+    return index_class(text_fields=["title", "url_source", "published_time", "content"])
+
+
+index = create_index()
+agent_class = AsyncAgentTools(index, page_cache=PageCache(PAGE_CACHE_DIR))
 
 
 # Summarizing agent
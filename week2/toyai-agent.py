@@ -9,13 +9,22 @@ from toyaikit.chat.runners import OpenAIResponsesRunner
 from toyaikit.chat.runners import DisplayingRunnerCallback
 from toyaikit.tools import Tools
 
+from common import http_client
+from common.filtered_index import FilteredAppendableIndex
+from common.search_cache import CachedIndex
 
 
 
+
+FAQ_FILTER = {'course': 'data-engineering-zoomcamp'}
+FAQ_BOOST = {'question': 3.0, 'section': 0.5}
+
+
 class SearchTools:
 
     def __init__(self, index):
-        self.index = index
+        # repeated questions are answered from the cache, add_entry() clears it
+        self.index = CachedIndex(index)
 
     def search(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -27,12 +36,10 @@ class SearchTools:
         Returns:
             List[Dict[str, Any]]: A list of search result entries, each containing relevant metadata.
         """
-        boost = {'question': 3.0, 'section': 0.5}
-    
         results = self.index.search(
             query=query,
-            filter_dict={'course': 'data-engineering-zoomcamp'},
-            boost_dict=boost,
+            filter_dict=FAQ_FILTER,
+            boost_dict=FAQ_BOOST,
             num_results=5,
             output_ids=True
         )
@@ -56,8 +63,33 @@ class SearchTools:
         self.index.append(doc)
 
 
+def search_many(search_tools: SearchTools, queries: List[str]) -> List[List[Dict[str, Any]]]:
+    """
+    SearchTools.search for several queries at once, e.g. for an evaluation set.
+
+    Not a method of SearchTools, since Tools.add_tools() would offer it to
+    the model as a tool. Cached queries are answered from the cache of the
+    search tools. The others are scored in one batch by a TF-IDF Index and
+    one at a time by the other indexes.
+
+    Args:
+        search_tools (SearchTools): The tools whose index is searched.
+        queries (List[str]): Search queries to look up in the course FAQ.
+
+    Returns:
+        List[List[Dict[str, Any]]]: One list of search result entries per query, in the same order.
+    """
+    return search_tools.index.search_many(
+        queries,
+        filter_dict=FAQ_FILTER,
+        boost_dict=FAQ_BOOST,
+        num_results=5,
+        output_ids=True
+    )
+
+
 docs_url = 'https://github.com/alexeygrigorev/llm-rag-workshop/raw/main/notebooks/documents.json'
-docs_response = requests.get(docs_url)
+docs_response = http_client.get(docs_url)
 documents_raw = docs_response.json()
 
 documents = []
@@ -70,14 +102,26 @@ for course in documents_raw:
         documents.append(doc)
 
 
-from minsearch import AppendableIndex
+def create_index(documents, index_class=FilteredAppendableIndex):
+    """
+    Fit the FAQ index.
+
+    Args:
+        documents: The FAQ entries
+        index_class (optional): FilteredAppendableIndex by default, which scores
+                                only the documents of the filtered course.
+                                common.bm25.BM25Index has the same interface and
+                                ranks with BM25 instead of TF-IDF.
+    """
+    index = index_class(
+        text_fields=["question", "text", "section"],
+        keyword_fields=["course"]
+    )
+    index.fit(documents)
+    return index
 
-index = AppendableIndex(
-    text_fields=["question", "text", "section"],
-    keyword_fields=["course"]
-)
 
-index.fit(documents)
+index = create_index(documents)
 
 
 developer_prompt = """
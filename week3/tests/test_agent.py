@@ -1,5 +1,5 @@
 from wikiagent_.main import run_agent_sync
-from tests.utils import get_tool_calls
+from agent_utils import get_tool_calls
 from wikiagent_.wikiagent import SearchResultArticle
 
 
@@ -10,17 +10,17 @@ def test_agent_tool_calls_present():
     tool_calls = get_tool_calls(result)
 
     search_tool_calls = 0
-    get_page_tool_calls = 0
+    page_titles = []
     for call in tool_calls:
         if call.name == 'search':
             search_tool_calls += 1
-        if call.name == 'get_page':
-            get_page_tool_calls += 2
+        if call.name == 'get_pages':
+            page_titles.extend(call.args['page_titles'])
 
 
     assert len(tool_calls) > 0, "No tool calls found"
     assert search_tool_calls > 0, "No calls made for search tool"
-    assert get_page_tool_calls > 1, "get_page tool was not called multiple times"
+    assert len(page_titles) > 1, "get_pages tool did not fetch multiple pages"
 
     
 def test_agent_adds_references():
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from wikiagent_ import tools
+from wikiagent_.tools import AgentTools, AsyncAgentTools
+from wikiagent_.wikitext import wikitext_to_sections
+
+
+CAPYBARA = """{{Infobox animal|name=Capybara}}
+The '''capybara'''<ref>{{cite web|url=https://example.com}}</ref> is a [[rodent|giant rodent]].
+[[File:Capybara.jpg|thumb|A [[capybara]] in water]]
+
+== Habitat ==
+It lives in [[South America]].
+
+== References ==
+{{reflist}}
+[[Category:Rodents]]
+"""
+
+
+class _MediaWikiHandler(BaseHTTPRequestHandler):
+    """
+    The query API for titles "Capybara", "Page <n>" and the redirect
+    "Capybaras". Lowercase titles are normalized.
+
+    With server.continue_after set, a response has the content of that
+    many pages, the other pages are listed without revisions and a
+    "continue" block with rvcontinue asks for the next ones.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        titles = params["titles"][0].split("|")
+        self.server.batches.append(titles)
+
+        normalized, redirects, pages = [], [], {}
+        for title in titles:
+            if title[0].islower():
+                normalized.append({"from": title, "to": title.capitalize()})
+                title = title.capitalize()
+            if title == "Capybaras":
+                redirects.append({"from": title, "to": "Capybara"})
+                title = "Capybara"
+
+            if title == "Capybara" or title.startswith("Page "):
+                content = CAPYBARA if title == "Capybara" else f"Text of {title}."
+                pages[title] = {"title": title, "revisions": [{"slots": {"main": {"content": content}}}]}
+            else:
+                pages[title] = {"title": title, "missing": True}
+
+        response = {"query": {"normalized": normalized, "redirects": redirects}}
+        if self.server.continue_after:
+            with_content = [title for title, page in pages.items() if "revisions" in page]
+            start = int(params.get("rvcontinue", ["0"])[0])
+            end = start + self.server.continue_after
+            for title in with_content[:start] + with_content[end:]:
+                pages[title] = {"title": title}
+            if end < len(with_content):
+                response["continue"] = {"rvcontinue": str(end), "continue": "||"}
+        response["query"]["pages"] = list(pages.values())
+
+        body = json.dumps(response)
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def mediawiki(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MediaWikiHandler)
+    server.batches = []
+    server.continue_after = None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(tools, "WIKI_API_URL", f"http://127.0.0.1:{server.server_address[1]}/w/api.php")
+    yield server
+    server.shutdown()
+
+
+def test_wikitext_to_sections():
+    sections = wikitext_to_sections(CAPYBARA)
+
+    assert sections == [
+        {"heading": None, "level": 1, "text": "The capybara is a giant rodent."},
+        {"heading": "Habitat", "level": 2, "text": "It lives in South America."},
+    ]
+
+
+def test_get_pages_batches_titles(mediawiki):
+    titles = ["capybara", "Capybaras", "Not a page"] + [f"Page {i}" for i in range(60)] + ["capybara"]
+    agent_tools = AgentTools(index=None, parse_workers=1)
+
+    pages = agent_tools.get_pages(titles)
+
+    assert [len(batch) for batch in mediawiki.batches] == [50, 13]
+    assert len(pages) == 63
+    assert pages[0]["title"] == pages[1]["title"] == "Capybara"
+    assert pages[0]["url"] == "https://en.wikipedia.org/wiki/Capybara"
+    assert [s["heading"] for s in pages[0]["sections"]] == [None, "Habitat"]
+    assert pages[2] == {"title": "Not a page", "missing": True}
+    assert pages[-1]["sections"] == [{"heading": None, "level": 1, "text": "Text of Page 59."}]
+
+
+def test_async_get_pages_parses_on_worker_pool(mediawiki):
+    agent_tools = AsyncAgentTools(index=None, parse_workers=2)
+    titles = [f"Page {i}" for i in range(120)]
+
+    try:
+        pages = asyncio.run(agent_tools.get_pages(titles))
+    finally:
+        agent_tools.close()
+
+    assert sorted(len(batch) for batch in mediawiki.batches) == [20, 50, 50]
+    assert [page["sections"][0]["text"] for page in pages] == [f"Text of {title}." for title in titles]
+
+
+def test_get_pages_follows_continue(mediawiki):
+    mediawiki.continue_after = 2
+    titles = ["capybara", "Not a page"] + [f"Page {i}" for i in range(4)]
+
+    pages = AgentTools(index=None, parse_workers=1).get_pages(titles)
+    async_pages = asyncio.run(AsyncAgentTools(index=None, parse_workers=1).get_pages(titles))
+
+    # three requests for the batch, each with all its titles
+    assert mediawiki.batches == [titles] * 3 + [titles] * 3
+    assert pages == async_pages
+    assert [page["title"] for page in pages] == ["Capybara", "Not a page"] + [f"Page {i}" for i in range(4)]
+    assert pages[1] == {"title": "Not a page", "missing": True}
+    assert pages[-1]["sections"] == [{"heading": None, "level": 1, "text": "Text of Page 3."}]
@@ -9,9 +9,13 @@ import urllib, urllib.request
 import feedparser
 from toyaikit.chat.interface import StdOutputInterface
 from toyaikit.chat.runners import PydanticAIRunner
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, List
 import asyncio
-import mwparserfromhell
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from common import http_client
+from wikiagent_.wikitext import wikitext_to_sections
 
 
 
@@ -24,51 +28,124 @@ class FetchParams(BaseModel):
     url: str
 
 
-def sliding_window(
-        seq: Iterable[Any],
-        size: int,
-        step: int
-    ) -> List[Dict[str, Any]]:
+WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+WIKI_INDEX_URL = "https://en.wikipedia.org/w/index.php"
+WIKI_PAGE_URL = "https://en.wikipedia.org/wiki/"
+
+# the MediaWiki API returns the content of at most 50 titles per request
+MAX_TITLES_PER_REQUEST = 50
+
+
+def search_params(search_query: str) -> Dict[str, Any]:
+    return {
+        "action": "query",
+        "format": "json",
+        "list": "search",
+        "srsearch": search_query,
+        "srlimit": 10
+    }
+
+
+def page_params(page_title: str) -> Dict[str, Any]:
+    return {
+        "action": "raw",
+        "format": "json",
+        "prop": "text",
+        "title": page_title,
+        "redirects": True
+    }
+
+
+def pages_params(page_titles: List[str]) -> Dict[str, Any]:
+    return {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "prop": "revisions",
+        "rvprop": "content",
+        "rvslots": "main",
+        "redirects": 1,
+        "titles": "|".join(page_titles)
+    }
+
+
+def title_batches(page_titles: List[str]) -> List[List[str]]:
     """
-    Create overlapping chunks from a sequence using a sliding window approach.
+    The distinct titles in batches of MAX_TITLES_PER_REQUEST.
+    """
+    titles = list(dict.fromkeys(page_titles))
+    return [titles[i:i + MAX_TITLES_PER_REQUEST] for i in range(0, len(titles), MAX_TITLES_PER_REQUEST)]
 
-    Args:
-        seq: The input sequence (string or list) to be chunked.
-        size (int): The size of each chunk/window.
-        step (int): The step size between consecutive windows.
 
-    Returns:
-        list: A list of dictionaries, each containing:
-            - 'start': The starting position of the chunk in the original sequence
-            - 'content': The chunk content
+def continue_params(page_titles: List[str], data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Parameters of the next request for a batch, None once the API has
+    returned everything.
+
+    The API stops when the content it returns gets too large and adds a
+    "continue" block (e.g. rvcontinue), which is merged into the original
+    parameters of the batch.
+    """
+    if "continue" not in data:
+        return None
+    return {**pages_params(page_titles), **data["continue"]}
 
-    Raises:
-        ValueError: If size or step are not positive integers.
 
-    Example:
-        >>> sliding_window("hello world", size=5, step=3)
-        [{'start': 0, 'content': 'hello'}, {'start': 3, 'content': 'lo wo'}]
+def read_pages(responses: List[Dict[str, Any]], page_titles: List[str]) -> Dict[str, tuple[str, Optional[str]]]:
     """
-    if size <= 0 or step <= 0:
-        raise ValueError("size and step must be positive")
+    Title and wikitext of every requested title in the API responses of a batch.
+
+    Titles are followed through the normalizations and redirects the API
+    applied. A page can be listed without its content in one response and
+    get it in a continuation, so the wikitext is None for a missing page
+    only once all the responses are read.
+    """
+    renamed, wikitexts = {}, {}
+    for data in responses:
+        query = data.get("query", {})
+        renamed.update({r["from"]: r["to"] for r in query.get("normalized", []) + query.get("redirects", [])})
+        wikitexts.update({
+            page["title"]: page["revisions"][0]["slots"]["main"]["content"]
+            for page in query.get("pages", [])
+            if page.get("revisions")
+        })
+
+    pages = {}
+    for requested in page_titles:
+        title, seen = requested, set()
+        while title in renamed and title not in seen:
+            seen.add(title)
+            title = renamed[title]
+        pages[requested] = (title, wikitexts.get(title))
+    return pages
+
+
+def page_results(page_titles: List[str], pages: Dict[str, tuple[str, Optional[str]]], sections: Dict[str, List]) -> List[Dict[str, Any]]:
+    results = []
+    for requested in dict.fromkeys(page_titles):
+        title, wikitext = pages[requested]
+        if wikitext is None:
+            results.append({"title": requested, "missing": True})
+        else:
+            results.append({
+                "title": title,
+                "url": WIKI_PAGE_URL + title.replace(" ", "_"),
+                "sections": sections[title]
+            })
+    return results
 
-    n = len(seq)
-    result = []
-    for i in range(0, n, step):
-        batch = seq[i:i+size]
-        result.append({'start': i, 'content': batch})
-        if i + size > n:
-            break
 
-    return result
 
 
 
 # Main agent class that will be used for defining the agent tools
 class AgentTools:
 
-    def __init__(self, index, headers=None):
+    def __init__(self, index, headers=None, parse_workers: int = 2):
         self.index = index
+        # wikitext is parsed on a process pool, created on first use
+        self.parse_workers = parse_workers
+        self._parse_pool = None
         if headers is not None:
             self.headers = headers
         else:
@@ -82,16 +159,7 @@ class AgentTools:
         Searches wikipedia page based on user query.
         """
         # search_query = search_query.replace(" ", "+")
-        url = "https://en.wikipedia.org/w/api.php"
-        params = {
-            "action": "query",
-            "format": "json",
-            "list": "search",
-            "srsearch": search_query,
-            "srlimit": 10
-        }
-
-        response = requests.get(url, params=params, headers=self.headers)
+        response = http_client.get(WIKI_API_URL, params=search_params(search_query), headers=self.headers)
         response.raise_for_status()  # Raise an error if the request failed
         data = response.json()
         
@@ -114,16 +182,7 @@ class AgentTools:
         """
         Gets wikipedia pages based on user query.
         """
-        url = f" https://en.wikipedia.org/w/index.php"
-
-        params = {
-            "action": "raw",
-            "format": "json",
-            "prop": "text",
-            "title": page_title,
-            "redirects": True
-        }
-        response = requests.get(url, params=params, headers=self.headers)
+        response = http_client.get(WIKI_INDEX_URL, params=page_params(page_title), headers=self.headers)
         response.raise_for_status()  # Raise an error if the request failed
         data = response.text
 
@@ -134,11 +193,114 @@ class AgentTools:
         # return plain_text
 
 
+    def get_pages(self, page_titles: List[str]) -> List[Dict[str, Any]]:
+        """
+        Gets the plain text of wikipedia pages, split into sections.
+        Pass all the page titles you need at once.
+        """
+        pages = {}
+        for batch in title_batches(page_titles):
+            responses, params = [], pages_params(batch)
+            while params is not None:
+                response = http_client.get(WIKI_API_URL, params=params, headers=self.headers)
+                response.raise_for_status()  # Raise an error if the request failed
+                responses.append(response.json())
+                params = continue_params(batch, responses[-1])
+            pages.update(read_pages(responses, batch))
+
+        wikitexts = {title: wikitext for title, wikitext in pages.values() if wikitext is not None}
+        if self.parse_workers <= 1 or len(wikitexts) <= 1:
+            parsed = map(wikitext_to_sections, wikitexts.values())
+        else:
+            parsed = self.parse_pool().map(wikitext_to_sections, wikitexts.values())
+
+        return page_results(page_titles, pages, dict(zip(wikitexts, parsed)))
+
+
+    def parse_pool(self) -> ProcessPoolExecutor:
+        if self._parse_pool is None:
+            # spawn: forking while the event loop and HTTP threads run can deadlock
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._parse_pool
+
+
+    def close(self):
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+
+
+
+
+class AsyncAgentTools(AgentTools):
+    """
+    AgentTools with async tools, so the Wikipedia requests of parallel
+    tool calls run concurrently on the event loop instead of holding a
+    worker thread each.
+    """
+
+    async def search(self, search_query: str):
+        """
+        Searches wikipedia page based on user query.
+        """
+        response = await http_client.aget(WIKI_API_URL, params=search_params(search_query), headers=self.headers)
+        response.raise_for_status()  # Raise an error if the request failed
+        return response.json()
+
+
+    async def get_page(self, page_title: str):
+        """
+        Gets wikipedia pages based on user query.
+        """
+        response = await http_client.aget(WIKI_INDEX_URL, params=page_params(page_title), headers=self.headers)
+        response.raise_for_status()  # Raise an error if the request failed
+        return response.text
+
+
+    async def _read_batch(self, batch: List[str]) -> Dict[str, tuple[str, Optional[str]]]:
+        # the continuations of a batch are sequential, the batches run concurrently
+        responses, params = [], pages_params(batch)
+        while params is not None:
+            response = await http_client.aget(WIKI_API_URL, params=params, headers=self.headers)
+            response.raise_for_status()  # Raise an error if the request failed
+            responses.append(response.json())
+            params = continue_params(batch, responses[-1])
+        return read_pages(responses, batch)
+
+
+    async def get_pages(self, page_titles: List[str]) -> List[Dict[str, Any]]:
+        """
+        Gets the plain text of wikipedia pages, split into sections.
+        Pass all the page titles you need at once.
+        """
+        batches = title_batches(page_titles)
+        batch_pages = await asyncio.gather(*(self._read_batch(batch) for batch in batches))
+
+        pages = {}
+        for result in batch_pages:
+            pages.update(result)
+
+        wikitexts = {title: wikitext for title, wikitext in pages.values() if wikitext is not None}
+        if self.parse_workers <= 1 or len(wikitexts) <= 1:
+            parsed = [wikitext_to_sections(wikitext) for wikitext in wikitexts.values()]
+        else:
+            loop = asyncio.get_running_loop()
+            parsed = await asyncio.gather(*(
+                loop.run_in_executor(self.parse_pool(), wikitext_to_sections, wikitext)
+                for wikitext in wikitexts.values()
+            ))
+
+        return page_results(page_titles, pages, dict(zip(wikitexts, parsed)))
+
+
 
 index = AppendableIndex(text_fields=["title", "snippet"])
 agent_class = AgentTools(index=index)
 
-r = agent_class.search("european economic crisis")
+# r = agent_class.search("european economic crisis")
 # print(r)
 
 # r = agent_class.get_page("capybara")
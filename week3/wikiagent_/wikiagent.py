@@ -9,7 +9,7 @@ from toyaikit.chat.interface import StdOutputInterface
 from toyaikit.chat.runners import PydanticAIRunner
 from typing import Any, Dict, Iterable, List
 import asyncio
-from wikiagent_.tools import AgentTools
+from wikiagent_.tools import AsyncAgentTools
 
 
 class Reference(BaseModel):
@@ -68,7 +68,7 @@ class NamedCallback:
 def create_agents():
     # Instanciating the agent_class
     index = AppendableIndex(text_fields=["title", "snippet"])
-    agent_class = AgentTools(index=index)
+    agent_class = AsyncAgentTools(index=index)
 
 
     # Main orchestrator agent
@@ -77,7 +77,8 @@ def create_agents():
     about wikipedia pages.
 
     When asked a question, you always search using the search tool. 
-    Utilize these search results to find relevant wikipedia page content from the get_page tool.
+    Utilize these search results to find relevant wikipedia page content from the get_pages tool.
+    Pass all the relevant page titles to get_pages in one call.
 
     Use all these results to respond to the user's question.
     Always provide references.
@@ -85,7 +86,7 @@ def create_agents():
     """.strip()
 
 
-    agent_tools = [agent_class.get_page, agent_class.search]
+    agent_tools = [agent_class.get_pages, agent_class.search]
 
     orchestrator = Agent(
         name='orchestrator',
@@ -0,0 +1,62 @@
+import re
+from typing import Any, Dict, List
+
+import mwparserfromhell
+
+
+# links that only show an image or put the page in a category
+HIDDEN_LINK_PREFIXES = ("file:", "image:", "category:")
+BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def is_hidden(node) -> bool:
+    """
+    References, images and category links, which are not part of the text.
+    """
+    if isinstance(node, mwparserfromhell.nodes.Tag):
+        return str(node.tag).strip().lower() == "ref"
+    return str(node.title).strip().lower().startswith(HIDDEN_LINK_PREFIXES)
+
+
+def wikitext_to_sections(wikitext: str) -> List[Dict[str, Any]]:
+    """
+    Plain text of a wikitext page, split into its sections.
+
+    Templates (infoboxes, citations), references, images and categories
+    are dropped, links are replaced by their text. The text before the
+    first heading is the section with heading None.
+
+    Kept in its own module so worker processes do not import the agent tools.
+
+    Args:
+        wikitext: Raw wikitext of the page
+
+    Returns:
+        List of {"heading": ..., "level": ..., "text": ...}, empty sections are left out
+    """
+    wikicode = mwparserfromhell.parse(wikitext)
+
+    hidden = [
+        node for node in wikicode.filter(forcetype=(mwparserfromhell.nodes.Wikilink, mwparserfromhell.nodes.Tag))
+        if is_hidden(node)
+    ]
+    for node in hidden:
+        try:
+            wikicode.remove(node)
+        except ValueError:
+            # nested in a node that was removed already
+            pass
+
+    sections = []
+    for section in wikicode.get_sections(flat=True, include_lead=True):
+        heading, level = None, 1
+        headings = section.filter_headings(recursive=False)
+        if headings:
+            heading, level = headings[0].title.strip_code().strip(), headings[0].level
+            section.remove(headings[0])
+
+        text = BLANK_LINES.sub("\n\n", section.strip_code()).strip()
+        if text:
+            sections.append({"heading": heading, "level": level, "text": text})
+
+    return sections